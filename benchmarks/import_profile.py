@@ -0,0 +1,112 @@
+"""Cloud Functions のエントリーポイントの読み込み時間（コールドスタート）の計測
+
+使い方:
+    make profile-imports
+    python benchmarks/import_profile.py --runs 5 --top 15 --output <結果のJSON>
+
+エントリーポイント（main.py）ごとに新しいプロセスで `python -X importtime` を
+実行し、読み込み時間の中央値と、累積時間の長いモジュールを表示する。
+デプロイ時と同じく、関数のディレクトリと shared を含む functions をパスに追加する。
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+FUNCTIONS_DIR = ROOT_DIR / "functions"
+ENTRY_POINTS = ("func_scraper", "func_loader")
+
+
+def import_entry_point(function_name: str) -> List[Tuple[str, int, int]]:
+    """新しいプロセスでエントリーポイントを読み込み、モジュールごとの時間を取得
+
+    Returns:
+        List[Tuple[str, int, int]]: (モジュール名, 自身の時間, 累積時間)（マイクロ秒）
+    """
+    code = (
+        "import sys; "
+        f"sys.path[:0] = [{str(FUNCTIONS_DIR / function_name)!r}, "
+        f"{str(FUNCTIONS_DIR)!r}]; import main"
+    )
+    env = {key: value for key, value in os.environ.items() if key != "PYTHONPATH"}
+    env.pop("TELEMETRY_EXPORTER", None)
+    # ログのディレクトリを作らないよう、一時ディレクトリで実行する
+    with tempfile.TemporaryDirectory() as work_dir:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=work_dir,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        timings.append((module.strip(), int(self_us), int(cumulative_us)))
+    return timings
+
+
+def main_import_ms(timings: List[Tuple[str, int, int]]) -> float:
+    """エントリーポイント（main）の累積の読み込み時間（ミリ秒）"""
+    return next(cumulative for name, _, cumulative in timings if name == "main") / 1000
+
+
+def profile(function_name: str, runs: int, top: int) -> Dict[str, Any]:
+    """runs 回読み込んで中央値と、最後の計測で累積時間の長いモジュールを集計"""
+    samples = []
+    timings: List[Tuple[str, int, int]] = []
+    for _ in range(runs):
+        timings = import_entry_point(function_name)
+        samples.append(main_import_ms(timings))
+    slowest = sorted(
+        (timing for timing in timings if timing[0] != "main"),
+        key=lambda timing: timing[2],
+        reverse=True,
+    )[:top]
+    return {
+        "entry_point": function_name,
+        "median_ms": round(statistics.median(samples), 1),
+        "min_ms": round(min(samples), 1),
+        "modules": [
+            {"module": name, "cumulative_ms": round(cumulative / 1000, 1)}
+            for name, _, cumulative in slowest
+        ],
+    }
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--runs", type=int, default=5)
+    arg_parser.add_argument("--top", type=int, default=15)
+    arg_parser.add_argument("--output", type=Path, default=None)
+    args = arg_parser.parse_args()
+
+    reports = []
+    for function_name in ENTRY_POINTS:
+        report = profile(function_name, args.runs, args.top)
+        reports.append(report)
+        print(
+            f"{function_name}: median {report['median_ms']}ms, "
+            f"min {report['min_ms']}ms ({args.runs} runs)"
+        )
+        for module in report["modules"]:
+            print(f"  {module['cumulative_ms']:>8.1f}ms  {module['module']}")
+
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(reports, indent=2))
+        print(f"\nSaved results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
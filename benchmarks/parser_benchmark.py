@@ -0,0 +1,117 @@
+"""HTMLパーサーの実装ごとのパース時間とメモリのベンチマーク
+
+使い方:
+    make bench-parser
+    python benchmarks/parser_benchmark.py --iterations 50 --html-dir <保存したHTMLのディレクトリ>
+
+--html-dir を省略した場合は、テスト用のフィクスチャにナビゲーションとスクリプトを
+付け足して実際のページ程度の大きさにしたHTMLを使う。
+ディレクトリを指定する場合、一覧ページは list_page*.html、詳細ページは
+detail_page*.html というファイル名で置く。
+
+メモリはtracemallocで計測するため、Pythonのオブジェクトとして確保された分だけが
+対象になる（lxmlがC側で構築する木は含まれないなど、実装によって計測される範囲が異なる）。
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR / "functions"))
+sys.path.insert(0, str(ROOT_DIR / "functions" / "func_scraper"))
+
+from utils.parser_backends import (  # noqa: E402
+    Bs4Backend,
+    ParserBackend,
+    available_backends,
+    get_parser_backend,
+)
+
+FIXTURES_DIR = ROOT_DIR / "tests" / "functions" / "func_scraper" / "fixtures" / "html"
+
+
+def pad_page(html: str) -> str:
+    """フィクスチャに実際のページと同程度のナビゲーション・スクリプトを付け足す"""
+    nav_links = "\n".join(
+        f'<li class="nav-Item"><a href="/category/{i}/">カテゴリ{i}</a></li>'
+        for i in range(300)
+    )
+    scripts = "\n".join(
+        f"<script>window.dataLayer.push({{'event': 'view', 'id': {i}}});</script>"
+        for i in range(50)
+    )
+    footer = "\n".join(f"<p class='footer-Text'>お知らせ{i}</p>" for i in range(200))
+    header = f"<header><nav><ul>{nav_links}</ul></nav></header>{scripts}"
+    html = html.replace("<body>", f"<body>{header}", 1)
+    return html.replace("</body>", f"<footer>{footer}</footer></body>", 1)
+
+
+def load_pages(html_dir: Path, pattern: str, padded: bool) -> List[bytes]:
+    pages = [path.read_text("utf-8") for path in sorted(html_dir.glob(pattern))]
+    if padded:
+        pages = [pad_page(page) for page in pages]
+    return [page.encode("utf-8") for page in pages]
+
+
+def measure(
+    extract: Callable[[bytes], object], pages: List[bytes], iterations: int
+) -> Tuple[float, float]:
+    """1ページあたりの平均時間（ミリ秒）と最大のメモリ使用量（KiB）を計測"""
+    started_at = time.perf_counter()
+    for _ in range(iterations):
+        for page in pages:
+            extract(page)
+    elapsed = time.perf_counter() - started_at
+    mean_ms = elapsed / (iterations * len(pages)) * 1000
+
+    peak_kib = 0.0
+    for page in pages:
+        tracemalloc.start()
+        extract(page)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_kib = max(peak_kib, peak / 1024)
+    return mean_ms, peak_kib
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--iterations", type=int, default=20)
+    arg_parser.add_argument("--html-dir", type=Path, default=None)
+    args = arg_parser.parse_args()
+
+    html_dir = args.html_dir or FIXTURES_DIR
+    padded = args.html_dir is None
+    list_pages = load_pages(html_dir, "list_page*.html", padded)
+    detail_pages = load_pages(html_dir, "detail_page*.html", padded)
+
+    backends: Dict[str, ParserBackend] = {
+        "bs4 (full)": Bs4Backend(restricted=False),
+        "bs4 (restricted)": Bs4Backend(restricted=True),
+    }
+    for name in available_backends():
+        if name != "bs4":
+            backends[name] = get_parser_backend(name)
+
+    print(
+        f"pages: {len(list_pages)} list / {len(detail_pages)} detail, "
+        f"iterations: {args.iterations}, synthetic padding: {padded}"
+    )
+    print(f"{'backend':<18} {'page':<7} {'ms/page':>9} {'peak KiB':>10}")
+    for name, backend in backends.items():
+        for page_type, extract, pages in (
+            ("list", backend.extract_list_page, list_pages),
+            ("detail", backend.extract_detail_page, detail_pages),
+        ):
+            if not pages:
+                continue
+            mean_ms, peak_kib = measure(extract, pages, args.iterations)
+            print(f"{name:<18} {page_type:<7} {mean_ms:>9.3f} {peak_kib:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
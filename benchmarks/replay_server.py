@@ -0,0 +1,263 @@
+"""スクレイピングのベンチマーク用に、一覧・詳細ページを返すローカルのスタブサーバー
+
+実際のサイトにアクセスせずにスクレイパーのスループットを計測するため、
+記録済みのページ（HTMLアーカイブ）またはテスト用のフィクスチャから作った
+ページを返す。応答の遅延とエラー率を指定できる。
+
+単体で起動する場合:
+    python benchmarks/replay_server.py --pages 20 --latency-ms 50 --error-rate 0.01
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import TracebackType
+from typing import Dict, Optional, Type
+from urllib.parse import urlparse
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR / "functions"))
+sys.path.insert(0, str(ROOT_DIR / "functions" / "func_scraper"))
+
+from parser_benchmark import FIXTURES_DIR, pad_page  # noqa: E402
+
+LIST_PAGE_PATH = "/item/page/{page_num}/?sort=new"
+
+_LIST_ITEM = """
+    <li class="job-Item">
+      <h2 class="job-Title">{title}</h2>
+      <p class="time-Stamp">掲載開始日：{listing_start_date}</p>
+      <ul>
+        <li class="detail-Btn02"><a href="{detail_link}">詳細を見る</a></li>
+      </ul>
+    </li>"""
+
+
+def _to_path(url: str) -> str:
+    """URLからパスとクエリ文字列を取り出す（サーバーが受け取るリクエストの形）"""
+    parsed = urlparse(url)
+    return f"{parsed.path}?{parsed.query}" if parsed.query else parsed.path
+
+
+def render_list_page(items: str) -> str:
+    return (
+        '<!DOCTYPE html><html lang="ja"><head><meta charset="UTF-8"></head>'
+        f'<body><ul class="job-List">{items}</ul></body></html>'
+    )
+
+
+class ReplayCorpus:
+    """リクエストのパスと返すページの本文の対応
+
+    記載のない一覧ページには求人のないページを返すため、
+    スクレイパーは最後のページの次で一覧の取得を終える。
+    """
+
+    def __init__(self, pages: Dict[str, bytes]):
+        self.pages = pages
+        self.empty_list_page = render_list_page("").encode("utf-8")
+
+    def get(self, path: str) -> Optional[bytes]:
+        page = self.pages.get(path)
+        if page is None and path.startswith("/item/page/"):
+            return self.empty_list_page
+        return page
+
+    @classmethod
+    def synthetic(
+        cls,
+        page_count: int,
+        jobs_per_page: int = 20,
+        newest_date: date = date(2024, 3, 2),
+        padded: bool = True,
+    ) -> "ReplayCorpus":
+        """テスト用のフィクスチャから一覧・詳細ページを作成
+
+        求人は新しい順に1日あたり jobs_per_page 件ずつ掲載されたものとする。
+        padded の場合は実際のページと同程度の大きさにする。
+        """
+        detail_html = (FIXTURES_DIR / "detail_page.html").read_text("utf-8")
+        pages: Dict[str, bytes] = {}
+        for page_num in range(1, page_count + 1):
+            items = []
+            for i in range(jobs_per_page):
+                job_id = (page_num - 1) * jobs_per_page + i + 1
+                listing_start_date = newest_date - timedelta(days=page_num - 1)
+                detail_link = f"/item/{job_id}/"
+                items.append(
+                    _LIST_ITEM.format(
+                        title=f"データエンジニア募集 {job_id}",
+                        listing_start_date=f"{listing_start_date.year}年"
+                        f"{listing_start_date.month}月{listing_start_date.day}日",
+                        detail_link=detail_link,
+                    )
+                )
+                pages[detail_link] = (
+                    pad_page(detail_html) if padded else detail_html
+                ).encode("utf-8")
+            list_html = render_list_page("".join(items))
+            pages[LIST_PAGE_PATH.format(page_num=page_num)] = (
+                pad_page(list_html) if padded else list_html
+            ).encode("utf-8")
+        return cls(pages)
+
+    @classmethod
+    def from_archive(cls, directory: str, fetch_date: str) -> "ReplayCorpus":
+        """ローカルのHTMLアーカイブに記録された取得日のページを使う"""
+        from utils.html_archive import HtmlArchiveReader
+        from utils.http_client import LocalCacheStorage
+
+        reader = HtmlArchiveReader(LocalCacheStorage(directory))
+        entries = reader.read_manifest(fetch_date)
+        if not entries:
+            raise ValueError(f"No archived pages for {fetch_date} in {directory}")
+        return cls(
+            {_to_path(entry.url): reader.read(entry.sha256) for entry in entries}
+        )
+
+
+class ReplayServer:
+    """ReplayCorpus のページを返すHTTPサーバー（別スレッドで動作）
+
+    各リクエストは latency_ms（± jitter_ms の一様分布）だけ待ってから応答し、
+    詳細ページには error_rate の確率で500を返す。一覧ページの失敗はスクレイピング
+    全体を中断するため、エラーは詳細ページのみに返す。乱数は seed で固定できる。
+    """
+
+    def __init__(
+        self,
+        corpus: ReplayCorpus,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        port: int = 0,
+    ):
+        self.corpus = corpus
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.request_count = 0
+        self.error_count = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def start(self) -> "ReplayServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "ReplayServer":
+        return self.start()
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.stop()
+
+    def _next_response(self, path: str) -> bool:
+        """待機時間を決めてリクエスト数を数え、エラーを返すかを決める"""
+        with self._lock:
+            self.request_count += 1
+            delay_ms = self.latency_ms + self._random.uniform(
+                -self.jitter_ms, self.jitter_ms
+            )
+            is_error = (
+                path.startswith("/item/")
+                and not path.startswith("/item/page/")
+                and self._random.random() < self.error_rate
+            )
+            if is_error:
+                self.error_count += 1
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+        return is_error
+
+    def _handler_class(self) -> Type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # keep-aliveでコネクションを再利用させる
+            protocol_version = "HTTP/1.1"
+            # ヘッダーと本文を別々に送るため、Nagleアルゴリズムによる遅延を防ぐ
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:
+                if server._next_response(self.path):
+                    self._send(500, b"Internal Server Error")
+                    return
+                body = server.corpus.get(self.path)
+                if body is None:
+                    self._send(404, b"Not Found")
+                    return
+                self._send(200, body)
+
+            def _send(self, status: int, body: bytes) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+        return Handler
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--pages", type=int, default=10)
+    arg_parser.add_argument("--jobs-per-page", type=int, default=20)
+    arg_parser.add_argument("--archive-dir", default=None)
+    arg_parser.add_argument("--fetch-date", default=None)
+    arg_parser.add_argument("--latency-ms", type=float, default=0.0)
+    arg_parser.add_argument("--jitter-ms", type=float, default=0.0)
+    arg_parser.add_argument("--error-rate", type=float, default=0.0)
+    arg_parser.add_argument("--port", type=int, default=8000)
+    args = arg_parser.parse_args()
+
+    if args.archive_dir:
+        corpus = ReplayCorpus.from_archive(args.archive_dir, args.fetch_date)
+    else:
+        corpus = ReplayCorpus.synthetic(args.pages, args.jobs_per_page)
+    server = ReplayServer(
+        corpus,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        port=args.port,
+    )
+    print(f"Serving {len(corpus.pages)} pages at {server.base_url}")
+    server.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""ローカルのスタブサーバーに対する JobScrapingService のエンドツーエンドのベンチマーク
+
+使い方:
+    make bench-scraper
+    python benchmarks/scraper_benchmark.py --pages 10 --latency-ms 50 \\
+        --output benchmarks/results/scraper.json --baseline <以前の結果のJSON>
+
+逐次・並行・パイプラインの取得方法ごとに、1秒あたりの取得ページ数、
+取得とパースの時間（p50/p99）、最大のRSSを計測する。結果はコミットの
+ハッシュとともにJSONへ保存し、--baseline に以前の結果を指定すると差分を表示する。
+
+各取得方法は別のプロセスで実行するため、最大のRSSは取得方法ごとの値になる。
+GCPへの接続は行わない（Cloud Loggingのクライアントは作成しない）。
+"""
+
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR / "functions"))
+sys.path.insert(0, str(ROOT_DIR / "functions" / "func_scraper"))
+
+from replay_server import ReplayCorpus, ReplayServer  # noqa: E402
+
+# 取得方法ごとの JobScrapingService の設定（max_workers は引数で上書きする）
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "sequential": {"max_workers": 1},
+    "concurrent": {},
+    "pipelined": {"pipelined": True},
+}
+
+
+class _Timed:
+    """指定したメソッドの所要時間を記録しながら呼び出しを委譲する"""
+
+    def __init__(self, target: Any, samples: Dict[str, List[float]]):
+        self._target = target
+        self._samples = samples
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._target, name)
+        if name not in self._samples:
+            return attr
+        samples = self._samples[name]
+
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            started_at = time.perf_counter()
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                samples.append((time.perf_counter() - started_at) * 1000)
+
+        return timed
+
+
+def percentiles(samples: List[float]) -> Dict[str, Optional[float]]:
+    """p50とp99（ミリ秒）を計算"""
+    if len(samples) < 2:
+        value = samples[0] if samples else None
+        return {"p50": value, "p99": value}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50": round(cuts[49], 3), "p99": round(cuts[98], 3)}
+
+
+def run_scenario(
+    name: str, base_url: str, service_options: Dict[str, Any]
+) -> Dict[str, Any]:
+    """1つの取得方法でスクレイピングを実行して計測（別プロセスで呼び出す）"""
+    # ベンチマークではログの出力とCloud Loggingへの送信を行わない
+    # （シナリオごとのプロセスで、ロガーを作成する前に設定する）
+    os.environ.update({"LOG_CLOUD_LOGGING": "false", "LOG_LEVEL": "CRITICAL"})
+    from scraping_service import JobScrapingService
+
+    options = {**service_options, **SCENARIOS[name]}
+    service = JobScrapingService("2000-01-01", base_url=base_url, **options)
+
+    fetch_samples: List[float] = []
+    parse_samples: List[float] = []
+    for scraper in (service.list_scraper, service.detail_scraper):
+        scraper.http_client = _Timed(scraper.http_client, {"get": fetch_samples})
+        scraper.parser = _Timed(
+            scraper.parser,
+            {"parse_list_page": parse_samples, "parse_detail_page": parse_samples},
+        )
+
+    started_at = time.perf_counter()
+    df = service.execute()
+    elapsed = time.perf_counter() - started_at
+
+    return {
+        "scenario": name,
+        "pages": len(fetch_samples),
+        "records": len(df),
+        "elapsed_s": round(elapsed, 3),
+        "pages_per_s": round(len(fetch_samples) / elapsed, 2),
+        "fetch_ms": percentiles(fetch_samples),
+        "parse_ms": percentiles(parse_samples),
+        # Linuxでは ru_maxrss の単位はKiB
+        "peak_rss_mib": round(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1
+        ),
+    }
+
+
+def current_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=ROOT_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_comparison(results: List[Dict[str, Any]], baseline: Dict[str, Any]) -> None:
+    """以前の結果との差分（変化率）を表示"""
+    baseline_results = {result["scenario"]: result for result in baseline["results"]}
+    print(f"\ncompared with {baseline.get('commit') or 'baseline'}:")
+    metrics: Dict[str, Callable[[Dict[str, Any]], Optional[float]]] = {
+        "pages/s": lambda result: result["pages_per_s"],
+        "fetch p99": lambda result: result["fetch_ms"]["p99"],
+        "parse p99": lambda result: result["parse_ms"]["p99"],
+        "peak RSS": lambda result: result["peak_rss_mib"],
+    }
+    for result in results:
+        previous = baseline_results.get(result["scenario"])
+        # 以前の結果には、取得の失敗で中断したシナリオが記録されている場合がある
+        if previous is None or "error" in previous:
+            continue
+        changes = []
+        for label, metric in metrics.items():
+            before, after = metric(previous), metric(result)
+            if before and after is not None:
+                changes.append(f"{label} {(after - before) / before * 100:+.1f}%")
+        print(f"{result['scenario']:<11} {', '.join(changes)}")
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--pages", type=int, default=5)
+    arg_parser.add_argument("--jobs-per-page", type=int, default=20)
+    arg_parser.add_argument("--archive-dir", default=None)
+    arg_parser.add_argument("--fetch-date", default=None)
+    arg_parser.add_argument("--latency-ms", type=float, default=20.0)
+    arg_parser.add_argument("--jitter-ms", type=float, default=10.0)
+    arg_parser.add_argument("--error-rate", type=float, default=0.0)
+    arg_parser.add_argument(
+        "--scenarios", default=",".join(SCENARIOS), help="カンマ区切りの取得方法"
+    )
+    arg_parser.add_argument("--max-workers", type=int, default=8)
+    arg_parser.add_argument("--requests-per-second", type=float, default=1000.0)
+    arg_parser.add_argument("--parser-backend", default="auto")
+    arg_parser.add_argument("--parse-workers", type=int, default=0)
+    arg_parser.add_argument("--output", type=Path, default=None)
+    arg_parser.add_argument("--baseline", type=Path, default=None)
+    args = arg_parser.parse_args()
+
+    if args.archive_dir:
+        corpus = ReplayCorpus.from_archive(args.archive_dir, args.fetch_date)
+    else:
+        corpus = ReplayCorpus.synthetic(args.pages, args.jobs_per_page)
+    service_options = {
+        "max_workers": args.max_workers,
+        "requests_per_second": args.requests_per_second,
+        "parser_backend": args.parser_backend,
+        "parse_workers": args.parse_workers,
+    }
+
+    results = []
+    with ReplayServer(
+        corpus,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+    ) as server:
+        print(
+            f"pages in corpus: {len(corpus.pages)}, latency: {args.latency_ms}ms "
+            f"± {args.jitter_ms}ms, error rate: {args.error_rate}"
+        )
+        print(
+            f"{'scenario':<11} {'pages':>6} {'records':>8} {'pages/s':>9} "
+            f"{'fetch p50/p99 ms':>18} {'parse p50/p99 ms':>18} {'RSS MiB':>8}"
+        )
+        for name in args.scenarios.split(","):
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                result = executor.submit(
+                    run_scenario, name, server.base_url, service_options
+                ).result()
+            results.append(result)
+            fetch, parse = result["fetch_ms"], result["parse_ms"]
+            print(
+                f"{name:<11} {result['pages']:>6} {result['records']:>8} "
+                f"{result['pages_per_s']:>9.1f} "
+                f"{fetch['p50']:>8.1f}/{fetch['p99']:<9.1f} "
+                f"{parse['p50']:>8.2f}/{parse['p99']:<9.2f} "
+                f"{result['peak_rss_mib']:>8.1f}"
+            )
+
+    report = {
+        "commit": current_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            key: value
+            for key, value in vars(args).items()
+            if key not in ("output", "baseline")
+        },
+        "results": results,
+    }
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+        print(f"\nSaved results to {args.output}")
+    if args.baseline is not None:
+        print_comparison(results, json.loads(args.baseline.read_text()))
+
+
+if __name__ == "__main__":
+    main()
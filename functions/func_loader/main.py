@@ -1,18 +1,97 @@
 import os
+import uuid
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 
 import functions_framework
 from dotenv import load_dotenv
 from flask import Request, jsonify
 from flask.wrappers import Response
-from google.cloud import bigquery, storage  # type: ignore
-from shared.bigquery_utils import ensure_dataset_exists, ensure_table_exists
 from shared.date_utils import get_yesterday_jst
-from shared.gcs_utils import get_data_bucket_name
-from shared.logger_config import setup_logger
+from shared.gcp_clients import get_bigquery_client, get_storage_client
+from shared.gcs_utils import ROW_COUNT_METADATA, get_data_bucket_name
+from shared.listing_index import KnownListingIndex
+from shared.logger_config import flush_logs, setup_logger
+from shared.metadata_cache import (
+    blob_key,
+    dataset_key,
+    fetch_blob,
+    fetch_or_none,
+    get_metadata_cache,
+    table_key,
+)
+from shared.telemetry import flush_telemetry, setup_telemetry, traced
+
+if TYPE_CHECKING:
+    # google-cloud-bigquery は読み込みに時間がかかるため、ロードする場合のみ読み込む
+    from google.cloud import bigquery
 
 load_dotenv()
+setup_telemetry("func_loader")
+
+# 一時テーブルへの取り込み方法（環境変数LOADER_INGESTION_MODEで選ぶ）
+# - load_job: GCSのファイルをロードジョブで取り込む
+# - storage_write: ファイルを読み込み、Storage Write APIで行を書き込む（ジョブの待ちがない）
+INGESTION_MODES = ("load_job", "storage_write")
+
+# 一時テーブルの有効期限（時間）。クリーンアップできずに終了した場合もBigQueryが削除する
+# （環境変数LOADER_STAGING_TTL_HOURSで変更できる）
+DEFAULT_STAGING_TTL_HOURS = 6
+
+# 並行して実行したMERGEが同じパーティションを更新して競合した場合の最大試行回数
+MERGE_MAX_ATTEMPTS = 3
+
+# ソースファイルのパス（raw/jobs/partition_date=YYYYMMDD/jobs.csv など）
+SOURCE_PREFIX = "raw/jobs/"
+_SOURCE_FILE_NAMES = ("jobs.parquet", "jobs.csv")
+# 行数が記録されていないソースファイルは、これより小さい場合に空とみなす（バイト）
+MIN_SOURCE_FILE_SIZE = 50
+
+# パーティションの絞り込み条件（掲載開始日がない行は __NULL__ パーティションのみを読む）
+_PARTITION_FILTER = (
+    "(T.listing_start_date in unnest(@listing_dates) or T.listing_start_date is null)"
+)
+
+
+def _has_rows(blob: Any) -> bool:
+    """ソースファイルに行があるか
+
+    スクレイパーが記録した行数で判定する（ヘッダーのみのCSVやスキーマのみの
+    Parquetも空とみなす）。行数のない以前のファイルはサイズで判定する。
+    """
+    row_count = (blob.metadata or {}).get(ROW_COUNT_METADATA)
+    if row_count is not None:
+        return int(row_count) > 0
+    return (blob.size or 0) >= MIN_SOURCE_FILE_SIZE
+
+
+def _job_schema() -> "List[bigquery.SchemaField]":
+    """求人テーブルのスキーマ定義"""
+    from google.cloud import bigquery
+
+    return [
+        bigquery.SchemaField("monthly_salary", "INTEGER"),
+        bigquery.SchemaField("occupation", "STRING"),
+        bigquery.SchemaField("work_type", "STRING"),
+        bigquery.SchemaField("work_location", "STRING"),
+        bigquery.SchemaField("industry", "STRING"),
+        bigquery.SchemaField("job_content", "STRING"),
+        bigquery.SchemaField("required_skills", "STRING"),
+        bigquery.SchemaField("preferred_skills", "STRING"),
+        bigquery.SchemaField("programming_language", "STRING"),
+        bigquery.SchemaField("tool", "STRING"),
+        bigquery.SchemaField("framework", "STRING"),
+        bigquery.SchemaField("rate_of_work", "STRING"),
+        bigquery.SchemaField("number_of_recruitment_interviews", "STRING"),
+        bigquery.SchemaField("number_of_days_worked", "STRING"),
+        bigquery.SchemaField("number_of_applicants", "STRING"),
+        bigquery.SchemaField("job_title", "STRING"),
+        bigquery.SchemaField("listing_start_date", "DATE"),
+        bigquery.SchemaField("detail_link", "STRING", mode="REQUIRED"),
+        # スクレイパーが計算した内容のハッシュ（以前の出力ファイルにはないためNULLを許容）
+        bigquery.SchemaField("content_hash", "STRING"),
+    ]
 
 
 class JobDataLoader:
@@ -24,16 +103,39 @@ class JobDataLoader:
         if not self.project_id:
             raise ValueError("Environment variable PROJECT_ID is not set")
 
-        self.bq_client = bigquery.Client()
-        self.storage_client = storage.Client()
+        # クライアントはプロセスで共有し、ウォームスタートした実行でも再利用する
+        self.storage_client = get_storage_client()
+
+        self.ingestion_mode = os.environ.get("LOADER_INGESTION_MODE", "load_job")
+        if self.ingestion_mode not in INGESTION_MODES:
+            raise ValueError(
+                f"Unknown ingestion mode: {self.ingestion_mode} "
+                f"(choose from {', '.join(INGESTION_MODES)})"
+            )
+
+        self.staging_ttl_hours = float(
+            os.environ.get("LOADER_STAGING_TTL_HOURS", DEFAULT_STAGING_TTL_HOURS)
+        )
+
+        # スクレイパーが取り込み済みの求人をスキップする場合のみ、その索引を更新する
+        self.update_known_listing_index = (
+            os.environ.get("SCRAPER_SKIP_KNOWN_LISTINGS", "false").lower() == "true"
+        )
 
         self.dataset_id = "bigdata_navi"
         self.table_id = "lake__joblist"
         self.table_ref = f"{self.project_id}.{self.dataset_id}.{self.table_id}"
+        # detail_link と掲載開始日の索引（MERGEで読むパーティションを求めるために使う）
+        self.listing_date_index_ref = f"{self.table_ref}__listing_dates"
 
         # SQLファイルのディレクトリパス
         self.sql_dir = Path(__file__).parent / "sql"
 
+    @property
+    def bq_client(self) -> "bigquery.Client":
+        """BigQueryのクライアント（ロードするデータがある場合のみ作成）"""
+        return get_bigquery_client()
+
     def _read_sql_file(self, filename: str) -> str:
         """SQLファイルを読み込む"""
         file_path = self.sql_dir / filename
@@ -41,57 +143,499 @@ class JobDataLoader:
             return f.read()
 
     def _check_source_file(self, bucket_name: str, blob_name: str) -> bool:
-        """ソースファイルの存在確認と内容チェック"""
+        """ソースファイルの存在確認と内容チェック
+
+        メタデータ（サイズ）は1回のリクエストで取得し、キャッシュにあれば再利用する。
+        """
         try:
-            bucket = self.storage_client.bucket(bucket_name)
-            blob = bucket.blob(blob_name)
+            with traced("gcs.check_source", blob_name=blob_name) as span:
+                bucket = self.storage_client.bucket(bucket_name)
+                blob = get_metadata_cache().get_or_fetch(
+                    blob_key(bucket_name, blob_name), fetch_blob(bucket, blob_name)
+                )
 
-            if not blob.exists():
-                self.logger.warning(f"Source file not found: {blob_name}")
-                return False
+                if blob is None:
+                    self.logger.warning(f"Source file not found: {blob_name}")
+                    return False
 
-            # フタデータを取得してサイズをチェック
-            blob.reload()
+                span.set_attribute("bytes", blob.size or 0)
 
-            # サイズが取得できない、または極端に小さい場合はエラー
-            if not blob.size or blob.size < 50:
-                self.logger.warning(f"Source file is empty or too small: {blob_name}")
-                return False
+                # 行がない（ヘッダーのみなど）、またはサイズが極端に小さい場合は読み込まない
+                if not _has_rows(blob):
+                    self.logger.warning(f"Source file has no rows: {blob_name}")
+                    return False
 
-            return True
+                return True
 
         except Exception as e:
             self.logger.error(f"Error checking source file: {str(e)}")
             return False
 
+    def _detect_source_file(self, bucket_name: str, partition_prefix: str) -> str:
+        """パーティション内のソースファイル名を取得
+
+        スクレイパーの出力形式に応じて jobs.parquet または jobs.csv が置かれる。
+        どちらも見つからない場合は jobs.csv とし、存在確認で扱う。
+        一覧に含まれるメタデータはキャッシュに入れ、存在確認で再取得しない。
+        """
+        cache = get_metadata_cache()
+        blob_names = set()
+        for blob in self.storage_client.bucket(bucket_name).list_blobs(
+            prefix=partition_prefix
+        ):
+            cache.put(blob_key(bucket_name, blob.name), blob)
+            blob_names.add(blob.name)
+        for file_name in _SOURCE_FILE_NAMES:
+            if f"{partition_prefix}{file_name}" in blob_names:
+                return f"{partition_prefix}{file_name}"
+        return f"{partition_prefix}jobs.csv"
+
+    def _list_source_files(
+        self, bucket_name: str, start_date: date, end_date: date
+    ) -> Dict[str, str]:
+        """期間内のパーティションのソースファイル名を取得（バックフィル用）
+
+        パーティションごとに jobs.parquet を優先し、空のファイルは除く。
+
+        Returns:
+            Dict[str, str]: パーティションの日付（YYYYMMDD）とファイル名（日付順）
+        """
+        start, end = start_date.strftime("%Y%m%d"), end_date.strftime("%Y%m%d")
+        # 期間の開始日と終了日に共通する部分までを指定して、一覧を取得する範囲を絞る
+        prefix = f"{SOURCE_PREFIX}partition_date={os.path.commonprefix([start, end])}"
+        candidates: Dict[str, Dict[str, str]] = {}
+        for blob in self.storage_client.bucket(bucket_name).list_blobs(prefix=prefix):
+            partition, _, file_name = blob.name[len(SOURCE_PREFIX) :].partition("/")
+            partition_date = partition.removeprefix("partition_date=")
+            if (
+                file_name in _SOURCE_FILE_NAMES
+                and start <= partition_date <= end
+                and _has_rows(blob)
+            ):
+                candidates.setdefault(partition_date, {})[file_name] = blob.name
+        return {
+            partition_date: next(
+                files[file_name]
+                for file_name in _SOURCE_FILE_NAMES
+                if file_name in files
+            )
+            for partition_date, files in sorted(candidates.items())
+        }
+
+    def _create_temp_table(self, partition_date: str, schema: list) -> str:
+        """実行ごとに一意な名前の一時テーブルを有効期限付きで作成
+
+        同時に実行したロード（再試行とスケジュール実行、バックフィルなど）が
+        互いの一時テーブルを上書き・削除しないよう、実行ごとに別のテーブルを使う。
+
+        Returns:
+            str: 作成した一時テーブル（project.dataset.table）
+        """
+        from google.cloud import bigquery
+
+        temp_table = f"{self.table_ref}_temp_{partition_date}_{uuid.uuid4().hex[:12]}"
+        table = bigquery.Table(temp_table, schema=schema)
+        table.expires = datetime.now(timezone.utc) + timedelta(
+            hours=self.staging_ttl_hours
+        )
+        self.bq_client.create_table(table)
+        self.logger.info(
+            f"Created temporary table {temp_table} (expires {table.expires})"
+        )
+        return temp_table
+
+    def _delete_temp_table(self, temp_table: str) -> None:
+        """一時テーブルの削除（失敗しても有効期限で削除されるため、例外は送出しない）"""
+        try:
+            self.logger.info("Cleaning up temporary table...")
+            self.bq_client.delete_table(temp_table, not_found_ok=True)
+            self.logger.info("Temporary table deleted")
+        except Exception as e:
+            self.logger.warning(
+                f"Failed to delete temporary table {temp_table}: {str(e)}"
+            )
+
     def _load_to_temp_table(
-        self, source_path: str, temp_table: str, schema: list
+        self,
+        source_path: Union[str, List[str]],
+        temp_table: str,
+        schema: list,
+        hive_partition_prefix: Optional[str] = None,
     ) -> int:
-        """一時テーブルへのデータロード"""
+        """一時テーブルへのデータロード（拡張子からCSVとParquetを判定）
+
+        Args:
+            source_path (Union[str, List[str]]): ソースファイルのURI（複数の場合は同じ形式）
+            temp_table (str): 一時テーブル
+            schema (list): ソースファイルの列のスキーマ
+            hive_partition_prefix (Optional[str]): 指定した場合、このURIに続くパス
+                （partition_date=YYYYMMDD）の値を partition_date 列として追加する
+        """
+        from google.cloud import bigquery
+
+        source_uris = [source_path] if isinstance(source_path, str) else source_path
         self.logger.info("Loading data to temporary table...")
-        job_config = bigquery.LoadJobConfig(
-            schema=schema,
-            source_format=bigquery.SourceFormat.CSV,
-            skip_leading_rows=1,
-            allow_quoted_newlines=True,
-            encoding="UTF-8",
-        )
-        load_job = self.bq_client.load_table_from_uri(
-            source_path, temp_table, job_config=job_config
-        )
-        load_job.result()
+        if source_uris[0].endswith(".parquet"):
+            # Parquetは列の型を持つため、区切り文字や改行の解析が不要
+            job_config = bigquery.LoadJobConfig(
+                schema=schema,
+                source_format=bigquery.SourceFormat.PARQUET,
+            )
+        else:
+            job_config = bigquery.LoadJobConfig(
+                schema=schema,
+                source_format=bigquery.SourceFormat.CSV,
+                skip_leading_rows=1,
+                allow_quoted_newlines=True,
+                # 最後の列（content_hash）がない以前のファイルも読み込めるようにする
+                allow_jagged_rows=True,
+                encoding="UTF-8",
+            )
+        if hive_partition_prefix is not None:
+            hive_partitioning = bigquery.HivePartitioningOptions()
+            hive_partitioning.mode = "STRINGS"
+            hive_partitioning.source_uri_prefix = hive_partition_prefix
+            job_config.hive_partitioning = hive_partitioning
+        with traced(
+            "bigquery.load",
+            source_path=source_uris[0],
+            source_count=len(source_uris),
+            source_format=job_config.source_format,
+        ) as span:
+            load_job = self.bq_client.load_table_from_uri(
+                source_path, temp_table, job_config=job_config
+            )
+            span.set_attribute("job_id", load_job.job_id)
+            load_job.result()
+            span.set_attribute("row_count", load_job.output_rows or 0)
         self.logger.info(f"Loaded {load_job.output_rows} rows to temporary table")
         return load_job.output_rows
 
-    def _merge_data(self, temp_table: str) -> None:
-        """データのマージ処理"""
+    def _read_source_blob(self, bucket_name: str, blob_name: str, schema: list) -> Any:
+        """ソースファイルをダウンロードし、スキーマの型のArrowテーブルとして読み込む"""
+        from shared.bigquery_write import read_source_table
+
+        data = (
+            self.storage_client.bucket(bucket_name).blob(blob_name).download_as_bytes()
+        )
+        return read_source_table(
+            data,
+            blob_name,
+            {field.name: field.field_type for field in schema},
+            required=[field.name for field in schema if field.mode == "REQUIRED"],
+        )
+
+    def _write_to_temp_table(
+        self, bucket_name: str, blob_name: str, temp_table: str, schema: list
+    ) -> int:
+        """Storage Write APIで一時テーブルへ書き込む（ロードジョブを使わない）
+
+        ファイルを読み込んでスキーマの型に変換し、作成した空の一時テーブルへ
+        保留モードのストリームで書き込んでからまとめてコミットする。
+        """
+        from shared.bigquery_write import BigQueryStorageWriter
+        from shared.gcp_clients import get_bigquery_write_client
+
+        self.logger.info("Writing data to temporary table with Storage Write API...")
+        table = self._read_source_blob(bucket_name, blob_name, schema)
+        written_rows = BigQueryStorageWriter(get_bigquery_write_client()).write(
+            temp_table, table
+        )
+        self.logger.info(f"Wrote {written_rows} rows to temporary table")
+        return written_rows
+
+    def _write_backfill_to_temp_table(
+        self, bucket_name: str, sources: Dict[str, str], temp_table: str, schema: list
+    ) -> int:
+        """複数のパーティションのファイルを partition_date 列を付けて1回で書き込む"""
+        import pyarrow as pa  # type: ignore
+        from shared.bigquery_write import BigQueryStorageWriter
+        from shared.gcp_clients import get_bigquery_write_client
+
+        self.logger.info(
+            f"Writing {len(sources)} partitions to temporary table "
+            "with Storage Write API..."
+        )
+        tables = []
+        for partition_date, blob_name in sources.items():
+            table = self._read_source_blob(bucket_name, blob_name, schema)
+            tables.append(
+                table.append_column(
+                    "partition_date",
+                    pa.array([partition_date] * table.num_rows, pa.string()),
+                )
+            )
+        written_rows = BigQueryStorageWriter(get_bigquery_write_client()).write(
+            temp_table, pa.concat_tables(tables)
+        )
+        self.logger.info(f"Wrote {written_rows} rows to temporary table")
+        return written_rows
+
+    def _dedupe_temp_table(self, temp_table: str) -> Dict[str, Dict[str, int]]:
+        """パーティションごとの行数を集計し、detail_link ごとに最新のパーティションの行のみを残す
+
+        Returns:
+            Dict[str, Dict[str, int]]: パーティションの日付ごとの、ロードした行数
+                （loaded_rows）とマージの対象として残る行数（merged_rows）
+        """
+        from google.cloud import bigquery
+
+        rows = self.bq_client.query(
+            self._read_sql_file("backfill_counts.sql").format(temp_table=temp_table)
+        ).result()
+        daily_counts = {
+            row.partition_date: {
+                "loaded_rows": row.loaded_rows,
+                "merged_rows": row.merged_rows,
+            }
+            for row in rows
+        }
+
+        # 一時テーブルを重複を除いた行で置き換える（MERGEは同じキーの行が複数あると失敗する）
+        with traced("bigquery.dedupe", table=temp_table) as span:
+            dedupe_job = self.bq_client.query(
+                self._read_sql_file("dedupe_staging.sql").format(temp_table=temp_table),
+                job_config=bigquery.QueryJobConfig(
+                    destination=temp_table,
+                    write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE,
+                ),
+            )
+            span.set_attribute("job_id", dedupe_job.job_id)
+            dedupe_job.result()
+        return daily_counts
+
+    def _summarize_staged_rows(self, temp_table: str) -> Tuple[List[date], int, int]:
+        """MERGEで読むパーティション（掲載開始日）と、一時テーブルの行数
+
+        一時テーブルの行と同じ detail_link の既存の行の掲載開始日も含める。
+
+        Returns:
+            Tuple[List[date], int, int]: 掲載開始日（昇順）、一時テーブルの行数、
+                このクエリで処理したバイト数
+        """
+        job = self.bq_client.query(
+            self._read_sql_file("merge_partitions.sql").format(
+                index_table=self.listing_date_index_ref, temp_table=temp_table
+            )
+        )
+        row = next(iter(job.result()))
+        return (
+            list(row.listing_dates or []),
+            row.staged_rows,
+            job.total_bytes_processed or 0,
+        )
+
+    def _update_listing_date_index(self, temp_table: str) -> int:
+        """MERGEで反映した行で索引を更新し、処理したバイト数を返す"""
+        job = self.bq_client.query(
+            self._read_sql_file("update_listing_date_index.sql").format(
+                index_table=self.listing_date_index_ref, temp_table=temp_table
+            )
+        )
+        job.result()
+        return job.total_bytes_processed or 0
+
+    def _merge_data(self, temp_table: str) -> Dict[str, Any]:
+        """データのマージ処理
+
+        取り込む行と、同じ detail_link の既存の行の掲載開始日のパーティションのみを
+        対象テーブルから読み、テーブル全体を走査しないようにする。既存の行の
+        掲載開始日は索引から求めるため、再掲載された求人も重複せずに更新される。
+        処理したバイト数は、パーティションを求めるクエリと索引の更新の分も含めて返す。
+        内容のハッシュが変わらない行は更新しないため、追加・更新・変更なしの行数も返す。
+        """
+        from google.cloud import bigquery
+
         self.logger.info("Executing merge operation...")
+        listing_dates, staged_rows, lookup_bytes = self._summarize_staged_rows(
+            temp_table
+        )
+        query_parameters = [
+            bigquery.ArrayQueryParameter("listing_dates", "DATE", listing_dates),
+        ]
         merge_query = self._read_sql_file("merge.sql").format(
-            table_ref=self.table_ref, temp_table=temp_table
+            table_ref=self.table_ref,
+            temp_table=temp_table,
+            partition_filter=_PARTITION_FILTER,
+        )
+        date_range = {
+            "min_date": listing_dates[0].isoformat() if listing_dates else None,
+            "max_date": listing_dates[-1].isoformat() if listing_dates else None,
+        }
+        with traced("bigquery.merge", table=self.table_ref) as span:
+            for key, value in date_range.items():
+                if value is not None:
+                    span.set_attribute(key, value)
+            span.set_attribute("partitions", len(listing_dates))
+            merge_job = self._run_merge_job(
+                merge_query,
+                bigquery.QueryJobConfig(query_parameters=query_parameters),
+            )
+            span.set_attribute("job_id", merge_job.job_id)
+            span.set_attribute("row_count", merge_job.num_dml_affected_rows or 0)
+            span.set_attribute("bytes", merge_job.total_bytes_processed or 0)
+            row_counts = self._merge_row_counts(merge_job, staged_rows)
+            for name, count in row_counts.items():
+                span.set_attribute(name, count)
+        index_bytes = self._update_listing_date_index(temp_table)
+
+        merge_bytes = merge_job.total_bytes_processed or 0
+        stats: Dict[str, Any] = {
+            **date_range,
+            "partitions": len(listing_dates),
+            **row_counts,
+            "affected_rows": merge_job.num_dml_affected_rows or 0,
+            "bytes_processed": merge_bytes,
+            "bytes_billed": merge_job.total_bytes_billed or 0,
+            "lookup_bytes_processed": lookup_bytes,
+            "index_bytes_processed": index_bytes,
+            "total_bytes_processed": merge_bytes + lookup_bytes + index_bytes,
+        }
+        self.logger.info(
+            f"Merge operation completed: inserted {row_counts['inserted_rows']}, "
+            f"updated {row_counts['updated_rows']}, "
+            f"unchanged {row_counts['unchanged_rows']} rows; "
+            f"processed {stats['total_bytes_processed']} bytes "
+            f"(merge {merge_bytes}, partition lookup {lookup_bytes}, "
+            f"index update {index_bytes}) "
+            f"for {len(listing_dates)} listing_start_date partitions "
+            f"from {stats['min_date']} to {stats['max_date']}"
+        )
+        return stats
+
+    @staticmethod
+    def _merge_row_counts(merge_job: Any, staged_rows: int) -> Dict[str, int]:
+        """MERGEのDMLの統計から追加・更新・変更なしの行数を集計
+
+        変更なしの行は、一時テーブルの行のうち追加も更新もされなかった行。
+        """
+        dml_stats = merge_job.dml_stats
+        inserted_rows = dml_stats.inserted_row_count if dml_stats else 0
+        updated_rows = dml_stats.updated_row_count if dml_stats else 0
+        return {
+            "staged_rows": staged_rows,
+            "inserted_rows": inserted_rows,
+            "updated_rows": updated_rows,
+            "unchanged_rows": max(staged_rows - inserted_rows - updated_rows, 0),
+        }
+
+    def _run_merge_job(self, merge_query: str, job_config: Any) -> Any:
+        """MERGEを実行（並行したMERGEとの競合で失敗した場合は再実行する）
+
+        同じパーティションを更新するDMLが同時に実行されると、BigQueryは一方を
+        "Could not serialize access" で失敗させる。MERGEは一時テーブルの内容で
+        上書きするだけのため、再実行しても結果は変わらない。
+        """
+        attempt = 1
+        while True:
+            merge_job = self.bq_client.query(merge_query, job_config=job_config)
+            try:
+                merge_job.result()
+                return merge_job
+            except Exception as e:
+                if (
+                    "could not serialize access" not in str(e).lower()
+                    or attempt >= MERGE_MAX_ATTEMPTS
+                ):
+                    raise
+                self.logger.warning(
+                    f"Merge conflicted with a concurrent update, retrying "
+                    f"({attempt}/{MERGE_MAX_ATTEMPTS}): {str(e)}"
+                )
+                attempt += 1
+
+    def _refresh_known_listing_index(self, bucket_name: str, temp_table: str) -> None:
+        """取り込んだ detail_link を取り込み済みの索引に追加してデータバケットへ保存
+
+        スクレイパーが索引を使う場合（SCRAPER_SKIP_KNOWN_LISTINGS=true）のみ更新する。
+        索引がない場合と、容量を超えて誤検出率が上がった場合のみ、
+        テーブル全体から作り直す。
+        """
+        if not self.update_known_listing_index:
+            return
+        try:
+            self.logger.info("Refreshing known listing index...")
+            index = KnownListingIndex.load(bucket_name)
+            if index is None or index.is_full:
+                index = self._build_known_listing_index()
+            else:
+                rows = self.bq_client.query(
+                    f"select distinct detail_link from `{temp_table}`"
+                    " where detail_link is not null"
+                ).result()
+                added = index.add_all(row.detail_link for row in rows)
+                if added == 0:
+                    return
+            index.save(bucket_name)
+        except Exception as e:
+            # 索引はスクレイピングの最適化のみに使うため、ロード処理は失敗させない
+            self.logger.warning(f"Failed to refresh known listing index: {str(e)}")
+
+    def _build_known_listing_index(self) -> KnownListingIndex:
+        """テーブルの detail_link から取り込み済みの索引を作成"""
+        rows = self.bq_client.query(
+            f"select detail_link from `{self.table_ref}`"
+        ).result()
+        # 作り直しまでの増加分を見込んで件数の2倍を容量とする
+        capacity = max((rows.total_rows or 0) * 2, 100_000)
+        return KnownListingIndex.build(
+            (row.detail_link for row in rows), capacity=capacity
         )
-        merge_job = self.bq_client.query(merge_query)
-        merge_job.result()
-        self.logger.info("Merge operation completed")
+
+    def _prefetch_target_metadata(self) -> None:
+        """ロード先のデータセットとテーブルのメタデータを並行して取得し、キャッシュに入れる"""
+        project_id, dataset_id, _ = self.table_ref.split(".")
+        dataset_ref = f"{project_id}.{dataset_id}"
+        try:
+            get_metadata_cache().fetch_all(
+                {
+                    dataset_key(dataset_ref): fetch_or_none(
+                        self.bq_client.get_dataset, dataset_ref
+                    ),
+                    table_key(self.table_ref): fetch_or_none(
+                        self.bq_client.get_table, self.table_ref
+                    ),
+                    table_key(self.listing_date_index_ref): fetch_or_none(
+                        self.bq_client.get_table, self.listing_date_index_ref
+                    ),
+                }
+            )
+        except Exception as e:
+            # 取得できなかった場合は、存在確認の際に改めて取得する
+            self.logger.warning(f"Failed to prefetch table metadata: {str(e)}")
+
+    def _ensure_target_table(self, schema: list) -> None:
+        """ロード先のデータセットとテーブルの存在確認と作成"""
+        from shared.bigquery_utils import ensure_dataset_exists, ensure_table_exists
+
+        # テーブル参照を分解
+        table_ref_parts = self.table_ref.split(".")
+        if len(table_ref_parts) != 3:
+            raise ValueError(f"Invalid table reference format: {self.table_ref}")
+
+        project_id, dataset_id, table_id = table_ref_parts
+        ensure_dataset_exists(self.bq_client, f"{project_id}.{dataset_id}")
+        ensure_table_exists(self.bq_client, self.table_ref, schema)
+        self._ensure_listing_date_index()
+
+    def _ensure_listing_date_index(self) -> None:
+        """detail_link と掲載開始日の索引がなければ対象テーブルから作成する
+
+        作成時のみ対象テーブルの2列を全期間読む。以降はMERGEのたびに更新する。
+        """
+        index_ref = self.listing_date_index_ref
+        cache = get_metadata_cache()
+        if cache.get_or_fetch(
+            table_key(index_ref), fetch_or_none(self.bq_client.get_table, index_ref)
+        ):
+            return
+        with traced("bigquery.create_listing_date_index", table=index_ref):
+            self.bq_client.query(
+                self._read_sql_file("create_listing_date_index.sql").format(
+                    table_ref=self.table_ref, index_table=index_ref
+                )
+            ).result()
+        self.logger.info(f"Created listing date index: {index_ref}")
 
     def execute(self) -> Dict[str, Any]:
         """ロード処理を実行"""
@@ -99,41 +643,13 @@ class JobDataLoader:
             self.logger.info("Starting data load process...")
             partition_date = get_yesterday_jst().strftime("%Y%m%d")
             bucket_name = get_data_bucket_name()
-            blob_name = f"raw/jobs/partition_date={partition_date}/jobs.csv"
+
+            blob_name = self._detect_source_file(
+                bucket_name, f"{SOURCE_PREFIX}partition_date={partition_date}/"
+            )
             source_path = f"gs://{bucket_name}/{blob_name}"
 
-            # テーブル参照を分解
-            table_ref_parts = self.table_ref.split(".")
-            if len(table_ref_parts) != 3:
-                raise ValueError(f"Invalid table reference format: {self.table_ref}")
-
-            project_id, dataset_id, table_id = table_ref_parts
-            dataset_ref = f"{project_id}.{dataset_id}"
-            temp_table = f"{self.table_ref}_temp"
-
-            # スキーマ定義
-            schema = [
-                bigquery.SchemaField("monthly_salary", "INTEGER"),
-                bigquery.SchemaField("occupation", "STRING"),
-                bigquery.SchemaField("work_type", "STRING"),
-                bigquery.SchemaField("work_location", "STRING"),
-                bigquery.SchemaField("industry", "STRING"),
-                bigquery.SchemaField("job_content", "STRING"),
-                bigquery.SchemaField("required_skills", "STRING"),
-                bigquery.SchemaField("preferred_skills", "STRING"),
-                bigquery.SchemaField("programming_language", "STRING"),
-                bigquery.SchemaField("tool", "STRING"),
-                bigquery.SchemaField("framework", "STRING"),
-                bigquery.SchemaField("rate_of_work", "STRING"),
-                bigquery.SchemaField("number_of_recruitment_interviews", "STRING"),
-                bigquery.SchemaField("number_of_days_worked", "STRING"),
-                bigquery.SchemaField("number_of_applicants", "STRING"),
-                bigquery.SchemaField("job_title", "STRING"),
-                bigquery.SchemaField("listing_start_date", "DATE"),
-                bigquery.SchemaField("detail_link", "STRING", mode="REQUIRED"),
-            ]
-
-            # ソースファイルのチェック
+            # ソースファイルのチェック（ない場合はBigQueryのクライアントを作成しない）
             if not self._check_source_file(bucket_name, blob_name):
                 return {
                     "status": "success",
@@ -141,22 +657,34 @@ class JobDataLoader:
                     "loaded_rows": 0,
                 }
 
-            ensure_dataset_exists(self.bq_client, dataset_ref)
-            ensure_table_exists(self.bq_client, self.table_ref, schema)
+            # ロード先のデータセットとテーブルのメタデータを並行して取得する
+            # （結果はキャッシュに入り、ensure_* の存在確認で使われる）
+            self._prefetch_target_metadata()
+            schema = _job_schema()
+            self._ensure_target_table(schema)
 
-            # データのロードとマージ
-            loaded_rows = self._load_to_temp_table(source_path, temp_table, schema)
-            self._merge_data(temp_table)
-
-            # 一時テーブルの削除
-            self.logger.info("Cleaning up temporary table...")
-            self.bq_client.delete_table(temp_table, not_found_ok=True)
-            self.logger.info("Temporary table deleted")
+            # データのロードとマージ（失敗した場合も一時テーブルは必ず削除する）
+            temp_table = self._create_temp_table(partition_date, schema)
+            try:
+                if self.ingestion_mode == "storage_write":
+                    loaded_rows = self._write_to_temp_table(
+                        bucket_name, blob_name, temp_table, schema
+                    )
+                else:
+                    loaded_rows = self._load_to_temp_table(
+                        source_path, temp_table, schema
+                    )
+                merge_stats = self._merge_data(temp_table)
+                self._refresh_known_listing_index(bucket_name, temp_table)
+            finally:
+                self._delete_temp_table(temp_table)
 
             result = {
                 "status": "success",
                 "message": f"Data loaded to {self.table_ref}",
                 "loaded_rows": loaded_rows,
+                "merge": merge_stats,
+                "metadata_cache": get_metadata_cache().get_stats(),
             }
             self.logger.info(f"Load process completed: {result}")
             return result
@@ -166,13 +694,142 @@ class JobDataLoader:
             self.logger.error(error_message)
             return {"status": "error", "message": error_message}
 
+    def backfill(self, start_date: date, end_date: date) -> Dict[str, Any]:
+        """期間内の複数のパーティションをまとめてロード（バックフィル）
+
+        期間内のソースファイルを1回のロードジョブ（形式ごと）で一時テーブルへ読み込み、
+        同じ detail_link の行は最も新しいパーティションの行を残して、1回のMERGEで反映する。
+
+        Args:
+            start_date (date): 期間の開始日（パーティションの日付）
+            end_date (date): 期間の終了日（この日を含む）
+        """
+        try:
+            if start_date > end_date:
+                raise ValueError(
+                    f"start_date {start_date} must not be after end_date {end_date}"
+                )
+            self.logger.info(f"Starting backfill from {start_date} to {end_date}...")
+            bucket_name = get_data_bucket_name()
+            sources = self._list_source_files(bucket_name, start_date, end_date)
+            if not sources:
+                return {
+                    "status": "success",
+                    "message": "No data to load",
+                    "loaded_rows": 0,
+                    "daily_counts": {},
+                }
+
+            from google.cloud import bigquery
+
+            self._prefetch_target_metadata()
+            schema = _job_schema()
+            self._ensure_target_table(schema)
+
+            # パーティションの日付を partition_date 列として持つ一時テーブル
+            temp_table = self._create_temp_table(
+                f"{start_date:%Y%m%d}_{end_date:%Y%m%d}",
+                schema + [bigquery.SchemaField("partition_date", "STRING")],
+            )
+            try:
+                if self.ingestion_mode == "storage_write":
+                    loaded_rows = self._write_backfill_to_temp_table(
+                        bucket_name, sources, temp_table, schema
+                    )
+                else:
+                    # 形式（CSVとParquet）が混在する場合のみ、形式ごとにロードする
+                    source_uris: Dict[str, List[str]] = {}
+                    for blob_name in sources.values():
+                        source_uris.setdefault(Path(blob_name).suffix, []).append(
+                            f"gs://{bucket_name}/{blob_name}"
+                        )
+                    loaded_rows = sum(
+                        self._load_to_temp_table(
+                            uris,
+                            temp_table,
+                            schema,
+                            hive_partition_prefix=f"gs://{bucket_name}/{SOURCE_PREFIX}",
+                        )
+                        for uris in source_uris.values()
+                    )
+                daily_counts = self._dedupe_temp_table(temp_table)
+                merge_stats = self._merge_data(temp_table)
+                self._refresh_known_listing_index(bucket_name, temp_table)
+            finally:
+                self._delete_temp_table(temp_table)
+
+            result = {
+                "status": "success",
+                "message": (
+                    f"Backfilled {len(sources)} partitions to {self.table_ref}"
+                ),
+                "loaded_rows": loaded_rows,
+                "daily_counts": daily_counts,
+                "missing_partitions": [
+                    partition_date
+                    for partition_date in (
+                        f"{start_date + timedelta(days=offset):%Y%m%d}"
+                        for offset in range((end_date - start_date).days + 1)
+                    )
+                    if partition_date not in sources
+                ],
+                "merge": merge_stats,
+            }
+            self.logger.info(f"Backfill completed: {result}")
+            return result
+
+        except Exception as e:
+            error_message = f"Error during backfill: {str(e)}"
+            self.logger.error(error_message)
+            return {"status": "error", "message": error_message}
+
 
 @functions_framework.http
 def load_to_bigquery(request: Request) -> Tuple[Response, int]:
     """Cloud Functions のエントリーポイント"""
     try:
-        loader = JobDataLoader()
-        result = loader.execute()
+        with traced("func_loader.load_to_bigquery"):
+            loader = JobDataLoader()
+            result = loader.execute()
+        return jsonify(result), 200
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+    finally:
+        # 応答後はCPUが割り当てられないため、応答の前に送信する
+        flush_telemetry()
+        flush_logs()
+
+
+@functions_framework.http
+def backfill_to_bigquery(request: Request) -> Tuple[Response, int]:
+    """バックフィルのエントリーポイント
+
+    リクエストのJSONで期間を指定する（例: {"start_date": "2024-01-01",
+    "end_date": "2024-03-31"}）。日付はパーティションの日付（YYYY-MM-DD）。
+    """
+    try:
+        body = request.get_json(silent=True) or {}
+        start_date = date.fromisoformat(body["start_date"])
+        end_date = date.fromisoformat(body["end_date"])
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify(
+            {
+                "status": "invalid",
+                "message": f"start_date and end_date (YYYY-MM-DD) are required: {e}",
+            }
+        ), 400
+
+    try:
+        with traced(
+            "func_loader.backfill_to_bigquery",
+            start_date=start_date.isoformat(),
+            end_date=end_date.isoformat(),
+        ):
+            loader = JobDataLoader()
+            result = loader.backfill(start_date, end_date)
         return jsonify(result), 200
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
+    finally:
+        flush_telemetry()
+        flush_logs()
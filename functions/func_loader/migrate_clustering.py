@@ -0,0 +1,40 @@
+"""求人テーブルを detail_link でクラスタ化する（1度だけ手動で実行する移行）
+
+クラスタリングの設定を更新し、既存の行を書き直してすべてのパーティションに適用する。
+書き直しはテーブル全体を走査するため、日次のロード処理では行わない。
+クラスタ化済みのテーブルに対しては何もしない。
+
+使い方:
+    make migrate-clustering
+    PYTHONPATH=functions python functions/func_loader/migrate_clustering.py \\
+        --table my-project.bigdata_navi.lake__joblist
+"""
+
+import argparse
+import os
+from typing import List, Optional
+
+from shared.bigquery_utils import ensure_table_clustering
+from shared.gcp_clients import get_bigquery_client
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument(
+        "--table",
+        default=f"{os.environ.get('PROJECT_ID')}.bigdata_navi.lake__joblist",
+    )
+    return arg_parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    client = get_bigquery_client()
+    if ensure_table_clustering(client, client.get_table(args.table)):
+        print(f"Migrated {args.table} to clustering")
+    else:
+        print(f"{args.table} is already clustered")
+
+
+if __name__ == "__main__":
+    main()
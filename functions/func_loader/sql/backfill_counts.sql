@@ -0,0 +1,16 @@
+-- バックフィルの一時テーブルの行数をパーティションごとに集計する
+-- merged_rows: 同じ detail_link の行のうち、最も新しいパーティションの行として残る行数
+select
+    partition_date,
+    count(*) as loaded_rows,
+    countif(latest_rank = 1) as merged_rows
+from (
+    select
+        partition_date,
+        row_number() over (
+            partition by detail_link order by partition_date desc
+        ) as latest_rank
+    from `{temp_table}`
+)
+group by partition_date
+order by partition_date
@@ -0,0 +1,9 @@
+-- 対象テーブルの detail_link と掲載開始日の索引を作成する（索引がない場合に1度だけ実行する）
+-- MERGEの前に、取り込む行と同じ detail_link の既存の行のパーティションを求めるために使う
+create table if not exists `{index_table}`
+cluster by detail_link
+as
+select distinct
+    detail_link,
+    listing_start_date
+from `{table_ref}`
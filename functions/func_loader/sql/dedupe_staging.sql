@@ -0,0 +1,7 @@
+-- 同じ detail_link の行は最も新しいパーティションの行のみを残す
+select *
+from `{temp_table}`
+where true
+qualify row_number() over (
+    partition by detail_link order by partition_date desc
+) = 1
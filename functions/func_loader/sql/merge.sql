@@ -1,7 +1,12 @@
 merge `{table_ref}` as T
 using `{temp_table}` as S
 on T.detail_link = S.detail_link
-when matched then
+    -- 取り込む行の掲載開始日の範囲のパーティションのみを読む（全期間を走査しない）
+    and {partition_filter}
+-- 内容のハッシュが変わった行のみを更新する（ハッシュのない以前のファイルの行は常に更新する）
+when matched and (
+    S.content_hash is null or T.content_hash is distinct from S.content_hash
+) then
     update set
         monthly_salary = S.monthly_salary,
         occupation = S.occupation,
@@ -19,7 +24,8 @@ when matched then
         number_of_days_worked = S.number_of_days_worked,
         number_of_applicants = S.number_of_applicants,
         job_title = S.job_title,
-        listing_start_date = S.listing_start_date
+        listing_start_date = S.listing_start_date,
+        content_hash = S.content_hash
 when not matched then
     insert (
         monthly_salary,
@@ -39,7 +45,8 @@ when not matched then
         number_of_applicants,
         job_title,
         listing_start_date,
-        detail_link
+        detail_link,
+        content_hash
     )
     values (
         S.monthly_salary,
@@ -59,5 +66,6 @@ when not matched then
         S.number_of_applicants,
         S.job_title,
         S.listing_start_date,
-        S.detail_link
+        S.detail_link,
+        S.content_hash
     )
\ No newline at end of file
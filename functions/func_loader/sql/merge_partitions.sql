@@ -0,0 +1,26 @@
+-- MERGEで読む対象テーブルのパーティション（掲載開始日）と、取り込む行数を求める
+-- 取り込む行の掲載開始日に加え、同じ detail_link の既存の行の掲載開始日も含める
+-- （既存の行のパーティションを読まないと一致せず、同じ detail_link の行が重複して追加されるため）
+-- 既存の行の掲載開始日は、対象テーブルではなく detail_link と掲載開始日のみを持つ索引から求める
+with staged as (
+    select
+        detail_link,
+        listing_start_date
+    from `{temp_table}`
+),
+
+listing_dates as (
+    select listing_start_date
+    from staged
+    union distinct
+    select I.listing_start_date
+    from `{index_table}` as I
+    where I.detail_link in (select detail_link from staged)
+)
+
+select
+    array_agg(
+        listing_start_date ignore nulls order by listing_start_date
+    ) as listing_dates,
+    (select count(*) from staged) as staged_rows
+from listing_dates
@@ -0,0 +1,10 @@
+-- MERGEで反映した行の掲載開始日で索引を更新する
+-- （再掲載で掲載開始日が変わった求人は、以前の掲載開始日の行を置き換える）
+delete from `{index_table}`
+where detail_link in (select detail_link from `{temp_table}`);
+
+insert into `{index_table}` (detail_link, listing_start_date)
+select distinct
+    detail_link,
+    listing_start_date
+from `{temp_table}`;
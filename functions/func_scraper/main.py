@@ -3,17 +3,14 @@ from datetime import datetime
 from typing import Tuple
 
 import functions_framework
-import pandas as pd
 from dotenv import load_dotenv
 from flask import Request, jsonify
 from flask.wrappers import Response
 from shared.date_utils import get_yesterday_jst
-from shared.gcs_utils import get_data_bucket_name, save_to_gcs
-from shared.logger_config import setup_logger
+from shared.gcs_utils import get_data_bucket_name
+from shared.logger_config import flush_logs, setup_logger
 from shared.pubsub_utils import MessageProcessor, is_valid_pubsub_message
-from utils.http_client import HttpClient
-from utils.parsers import JobDataParser
-from utils.scraper import JobDetailScraper, JobListScraper
+from shared.telemetry import flush_telemetry, setup_telemetry
 
 # 環境変数でエンコーディングを設定
 os.environ["PYTHONIOENCODING"] = "utf-8"
@@ -22,58 +19,7 @@ os.environ["LANG"] = "ja_JP.UTF-8"
 logger = setup_logger("job_scraper_main")
 
 load_dotenv()
-
-
-class JobScrapingService:
-    """スクレイピング全体の制御"""
-
-    def __init__(self, scrape_limit_date: str = "2024-12-27"):
-        self.logger = setup_logger("job_scraper")
-        http_client = HttpClient("https://www.bigdata-navi.com")
-        parser = JobDataParser()
-        self.list_scraper = JobListScraper(http_client, parser)
-        self.detail_scraper = JobDetailScraper(http_client, parser)
-        self.scrape_limit_date = pd.to_datetime(scrape_limit_date)
-        self.logger.info(
-            f"Initialized scraping service with limit date: {scrape_limit_date}"
-        )
-
-    def execute(self) -> pd.DataFrame:
-        """スクレイピングを実行"""
-        try:
-            self.logger.info("Starting job list scraping")
-            list_df = self.list_scraper.scrape_all_pages(self.scrape_limit_date)
-            self.logger.info(f"Found {len(list_df)} jobs in list pages")
-
-            # リストが空の場合は空のDataFrameを返す
-            if len(list_df) == 0:
-                self.logger.info("No new jobs found within the date range")
-                return pd.DataFrame()
-
-            detail_df_list = []
-            total = len(list_df.detail_link)
-
-            self.logger.info(f"Starting detail page scraping for {total} jobs")
-            for i, url in enumerate(list_df.detail_link, 1):
-                self.logger.info(f"Scraping detail page {i}/{total}")
-                detail_df = self.detail_scraper.scrape_detail(url)
-                detail_df = pd.concat(
-                    [detail_df, list_df.iloc[[i - 1]].reset_index(drop=True)], axis=1
-                )
-                detail_df_list.append(detail_df)
-
-            # detail_df_listが空でない場合のみconcatを実行
-            if detail_df_list:
-                final_df = pd.concat(detail_df_list)
-                self.logger.info("Scraping completed successfully")
-                return final_df
-            else:
-                self.logger.info("No detail pages were scraped")
-                return pd.DataFrame()
-
-        except Exception as e:
-            self.logger.error(f"Error during scraping: {str(e)}", exc_info=True)
-            raise
+setup_telemetry("func_scraper")
 
 
 @functions_framework.http
@@ -111,23 +57,85 @@ def scraping(request: Request) -> Tuple[Response, int]:
         # スクレイピング実行
         # ==============================================
 
+        # pandasやHTMLパーサーの読み込みに時間がかかるため、
+        # 不正・処理済みのメッセージでは読み込まないよう、ここで読み込む
+        from scraping_service import (
+            DEFAULT_REFETCH_KNOWN_WITHIN_DAYS,
+            DEFAULT_REQUESTS_PER_SECOND,
+            JobScrapingService,
+            create_html_archive,
+            create_response_cache,
+            load_known_listing_index,
+        )
+        from shared.gcs_utils import create_stream_writer
+        from utils.checkpoint import ScrapeCheckpoint
+        from utils.models import JOB_COLUMN_TYPES
+        from utils.parse_pool import resolve_parse_workers
+
         # 昨日の日付を使用
         limit_date = get_yesterday_jst().strftime("%Y-%m-%d")
 
+        # 失敗した実行の進捗があれば、同じ制限日の再実行で途中から再開する
+        checkpoint_interval = int(os.environ.get("SCRAPER_CHECKPOINT_INTERVAL", "25"))
+        checkpoint = (
+            ScrapeCheckpoint.load(bucket_name, limit_date, checkpoint_interval)
+            if checkpoint_interval > 0
+            else None
+        )
+
+        refetch_days = os.environ.get(
+            "SCRAPER_REFETCH_KNOWN_WITHIN_DAYS", str(DEFAULT_REFETCH_KNOWN_WITHIN_DAYS)
+        )
+        refetch_known_within_days = int(refetch_days) if refetch_days else None
+
         try:
-            service = JobScrapingService(limit_date)
-            final_df = service.execute()
+            service = JobScrapingService(
+                limit_date,
+                max_workers=int(os.environ.get("SCRAPER_MAX_WORKERS", "1")),
+                requests_per_second=float(
+                    os.environ.get(
+                        "SCRAPER_REQUESTS_PER_SECOND", DEFAULT_REQUESTS_PER_SECOND
+                    )
+                ),
+                pipelined=os.environ.get("SCRAPER_PIPELINED", "false").lower()
+                == "true",
+                response_cache=create_response_cache(bucket_name),
+                known_listing_index=load_known_listing_index(bucket_name),
+                refetch_known_within_days=refetch_known_within_days,
+                checkpoint=checkpoint,
+                parser_backend=os.environ.get("SCRAPER_PARSER_BACKEND", "auto"),
+                parse_workers=resolve_parse_workers(
+                    os.environ.get("SCRAPER_PARSE_WORKERS")
+                ),
+                html_archive=create_html_archive(bucket_name),
+            )
+            # 取得した求人を順にアップロードし、成功した場合のみ当日のファイルと置き換える
+            # 出力形式（csv または parquet）。parquet の場合は列の型を付けて書き込む
+            writer = create_stream_writer(
+                bucket_name,
+                output_format=os.environ.get("SCRAPER_OUTPUT_FORMAT", "csv"),
+                compression=os.environ.get("SCRAPER_PARQUET_COMPRESSION", "zstd"),
+                column_types=JOB_COLUMN_TYPES,
+            )
+            with writer:
+                record_count = service.execute_to(writer)
+                saved_path = writer.commit()
 
-            bucket_name = get_data_bucket_name()
-            saved_path = save_to_gcs(final_df, bucket_name)
+            if checkpoint is not None:
+                checkpoint.clear()
 
             # 処理成功時にメッセージを処理済みとしてマーク
             processor.mark_message_as_processed(
                 message_id,
                 {
                     "limit_date": limit_date,
-                    "record_count": len(final_df),
+                    "record_count": record_count,
                     "saved_path": saved_path,
+                    "rate_limiter": service.rate_limiter.get_metrics(),
+                    "response_cache": service.response_cache.get_stats()
+                    if service.response_cache
+                    else None,
+                    "skipped_known_count": service.skipped_known_count,
                     "processed_at": datetime.utcnow().isoformat(),
                 },
             )
@@ -136,7 +144,7 @@ def scraping(request: Request) -> Tuple[Response, int]:
                 {
                     "status": "success",
                     "message": f"Data saved to gs://{bucket_name}/{saved_path}",
-                    "record_count": len(final_df),
+                    "record_count": record_count,
                     "limit_date": limit_date,
                 }
             ), 200
@@ -151,3 +159,8 @@ def scraping(request: Request) -> Tuple[Response, int]:
         return jsonify(
             {"status": "critical_error", "message": str(e)}
         ), 200  # すべてのケースで200を返す
+
+    finally:
+        # 応答後はCPUが割り当てられないため、応答の前に送信する
+        flush_telemetry()
+        flush_logs()
@@ -0,0 +1,241 @@
+"""アーカイブ済みのHTMLを再パースし、取得日ごとのデータセットを作り直す
+
+パーサーを変更した後に、サイトへアクセスせずに過去の取得結果から
+raw/jobs/partition_date=YYYYMMDD/ のファイルを作り直す。
+ページのパースはすべてのCPUコアのプロセスで並列に行う。
+
+使い方:
+    make reparse ARGS="--from 20240301 --to 20240310"
+    PYTHONPATH=functions python functions/func_scraper/reparse.py \\
+        --from 20240301 --to 20240310 --archive gcs --output gcs
+
+--archive と --output には "gcs"（データバケット）またはローカルディレクトリを指定する。
+ローカルディレクトリへ出力した場合は <output>/raw/jobs/partition_date=YYYYMMDD/
+以下に保存する。
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Union
+
+import pandas as pd
+from shared.gcs_utils import (
+    OUTPUT_FORMATS,
+    create_stream_writer,
+    get_data_bucket_name,
+    to_arrow_schema,
+    to_arrow_table,
+)
+from shared.logger_config import setup_logger
+from utils.html_archive import ARCHIVE_PREFIX, ArchiveEntry, HtmlArchiveReader
+from utils.http_client import CacheStorage, GcsCacheStorage, LocalCacheStorage
+from utils.models import (
+    JOB_COLUMN_TYPES,
+    JobDetailData,
+    JobListData,
+    JobRecord,
+    build_job_dataframe,
+)
+from utils.parse_pool import RawResponse, available_cpu_count, process_pool_context
+from utils.parsers import JobDataParser
+
+logger = setup_logger("job_reparse")
+
+ParsedPage = Union[List[JobListData], JobDetailData]
+
+# ワーカープロセスごとのアーカイブとパーサー（_init_worker で作成）
+_worker_archive: Optional[HtmlArchiveReader] = None
+_worker_parser: Optional[JobDataParser] = None
+
+
+def create_archive_storage(location: str) -> CacheStorage:
+    """アーカイブの保存先を作成（"gcs" の場合はデータバケット）"""
+    if location == "gcs":
+        return GcsCacheStorage(get_data_bucket_name(), prefix=ARCHIVE_PREFIX)
+    return LocalCacheStorage(location)
+
+
+def _init_worker(archive_location: str, backend: str) -> None:
+    global _worker_archive, _worker_parser
+    # 保存先のクライアントはプロセス間で共有できないため、ワーカーごとに作成する
+    _worker_archive = HtmlArchiveReader(create_archive_storage(archive_location))
+    _worker_parser = JobDataParser(backend)
+
+
+def _parse_entry(entry: ArchiveEntry) -> Optional[ParsedPage]:
+    """アーカイブから本文を読み込んでパース（失敗した場合はNone）"""
+    assert _worker_archive is not None and _worker_parser is not None
+    try:
+        response = RawResponse(_worker_archive.read(entry.sha256))
+        if entry.page_type == "list":
+            return _worker_parser.parse_list_page(response)
+        return _worker_parser.parse_detail_page(response)
+    except Exception as e:
+        logger.warning(f"Failed to reparse {entry.url}: {str(e)}")
+        return None
+
+
+def scrape_limit_date(fetch_date: str) -> pd.Timestamp:
+    """取得日（YYYYMMDD）のスクレイピングで使われた制限日（取得日の前日）"""
+    return pd.Timestamp(datetime.strptime(fetch_date, "%Y%m%d")) - pd.Timedelta(days=1)
+
+
+def build_records(
+    entries: List[ArchiveEntry],
+    parsed: List[Optional[ParsedPage]],
+    limit_date: Optional[pd.Timestamp] = None,
+) -> List[JobRecord]:
+    """パース結果を一覧ページの順に詳細ページと結合
+
+    スクレイピング時と同じく、掲載開始日が limit_date 以降で、
+    詳細ページを取得した求人だけがレコードになる。
+    """
+    list_jobs: List[JobListData] = []
+    details: Dict[str, JobDetailData] = {}
+    for entry, page in zip(entries, parsed):
+        if page is None:
+            continue
+        if entry.page_type == "list":
+            assert isinstance(page, list)
+            list_jobs.extend(page)
+        else:
+            assert isinstance(page, JobDetailData)
+            details[entry.url] = page
+
+    records = []
+    seen = set()
+    for job in list_jobs:
+        if limit_date is not None and job.listing_start_date < limit_date:
+            continue
+        # 再実行で同じ求人が複数のページに現れた場合は最初の1件を使う
+        if job.detail_link in details and job.detail_link not in seen:
+            seen.add(job.detail_link)
+            records.append(JobRecord(detail=details[job.detail_link], listing=job))
+    return records
+
+
+def iter_fetch_dates(date_from: str, date_to: str) -> Iterator[str]:
+    """開始日から終了日までの日付（YYYYMMDD）を順に返す"""
+    current = datetime.strptime(date_from, "%Y%m%d")
+    end = datetime.strptime(date_to, "%Y%m%d")
+    while current <= end:
+        yield current.strftime("%Y%m%d")
+        current += timedelta(days=1)
+
+
+def write_dataset(
+    df: pd.DataFrame,
+    output: str,
+    fetch_date: str,
+    output_format: str,
+    compression: str,
+) -> str:
+    """取得日のパーティションへデータセットを保存し、保存先のパスを返す"""
+    if output == "gcs":
+        writer = create_stream_writer(
+            get_data_bucket_name(),
+            output_format=output_format,
+            compression=compression,
+            column_types=JOB_COLUMN_TYPES,
+            partition_date=fetch_date,
+        )
+        with writer:
+            writer.write_frame(df)
+            return writer.commit()
+
+    directory = os.path.join(output, "raw", "jobs", f"partition_date={fetch_date}")
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"jobs.{output_format}")
+    if output_format == "parquet":
+        # GCSへの出力（GcsParquetStreamWriter）と同じ型で書き込む
+        import pyarrow.parquet as pq  # type: ignore
+
+        table = to_arrow_table(df, to_arrow_schema(JOB_COLUMN_TYPES))
+        pq.write_table(table, path, compression=compression, use_dictionary=True)
+    else:
+        df.to_csv(path, index=False, encoding="utf-8")
+    return path
+
+
+def reparse(
+    archive_location: str,
+    output: str,
+    fetch_dates: List[str],
+    workers: int,
+    backend: str = "auto",
+    output_format: str = "csv",
+    compression: str = "zstd",
+) -> Dict[str, int]:
+    """取得日ごとにアーカイブを再パースしてデータセットを作り直す
+
+    Returns:
+        Dict[str, int]: 取得日ごとのレコード数
+    """
+    archive = HtmlArchiveReader(create_archive_storage(archive_location))
+    record_counts = {}
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=process_pool_context(),
+        initializer=_init_worker,
+        initargs=(archive_location, backend),
+    ) as executor:
+        for fetch_date in fetch_dates:
+            entries = archive.read_manifest(fetch_date)
+            if not entries:
+                logger.info(f"No archived pages for {fetch_date}")
+                continue
+            # 本文の読み込みとパースをワーカーで行い、マニフェストの順に結果を受け取る
+            parsed = list(
+                executor.map(
+                    _parse_entry, entries, chunksize=max(1, len(entries) // workers)
+                )
+            )
+            records = build_records(entries, parsed, scrape_limit_date(fetch_date))
+            saved_path = write_dataset(
+                build_job_dataframe(records),
+                output,
+                fetch_date,
+                output_format,
+                compression,
+            )
+            record_counts[fetch_date] = len(records)
+            logger.info(
+                f"Reparsed {len(entries)} pages into {len(records)} records "
+                f"for {fetch_date}: {saved_path}"
+            )
+    return record_counts
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--from", dest="date_from", required=True)
+    arg_parser.add_argument("--to", dest="date_to", default=None)
+    arg_parser.add_argument("--archive", default="gcs")
+    arg_parser.add_argument("--output", default="gcs")
+    arg_parser.add_argument("--workers", type=int, default=available_cpu_count())
+    arg_parser.add_argument("--backend", default="auto")
+    arg_parser.add_argument("--format", choices=OUTPUT_FORMATS, default="csv")
+    arg_parser.add_argument("--compression", default="zstd")
+    return arg_parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    fetch_dates = list(iter_fetch_dates(args.date_from, args.date_to or args.date_from))
+    record_counts = reparse(
+        args.archive,
+        args.output,
+        fetch_dates,
+        args.workers,
+        args.backend,
+        args.format,
+        args.compression,
+    )
+    for fetch_date, record_count in record_counts.items():
+        print(f"{fetch_date}: {record_count} records")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,495 @@
+import itertools
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Deque, Iterator, List, Optional, Tuple
+
+import pandas as pd
+from shared.date_utils import get_jst_now
+from shared.gcs_utils import GcsStreamWriter
+from shared.listing_index import KnownListingIndex
+from shared.logger_config import SAMPLED, setup_logger
+from shared.telemetry import traced
+from utils.checkpoint import ScrapeCheckpoint
+from utils.html_archive import ARCHIVE_PREFIX, HtmlArchive
+from utils.http_client import (
+    GcsCacheStorage,
+    HttpClient,
+    LocalCacheStorage,
+    ResponseCache,
+)
+from utils.models import JobDetailData, JobListData, JobRecord
+from utils.parse_pool import ParsePool, uses_parse_pool
+from utils.parsers import JobDataParser
+from utils.rate_limiter import RateLimiter
+from utils.record_batcher import OrderedRecordBatcher
+from utils.scraper import JobDetailScraper, JobListScraper
+
+# スクレイピング対象のサイト
+BASE_URL = "https://www.bigdata-navi.com"
+
+# 全ワーカー合計のリクエスト頻度の上限（回/秒）
+# 固定のスリープ（詳細ページ後に3秒、一覧ページ後に5秒）と同じ頻度に合わせる。
+# RateLimiterはこの値を上限に下げる方向にのみ調整するため、上げる場合は
+# 環境変数SCRAPER_REQUESTS_PER_SECONDで明示的に指定する
+DEFAULT_REQUESTS_PER_SECOND = 1 / 3
+
+# 取り込み済みの索引に含まれていても再取得する、掲載開始日の日数
+# 索引（Bloomフィルタ）の誤検出で新着の求人がスキップされないよう、直近の求人は常に取得する
+# （環境変数SCRAPER_REFETCH_KNOWN_WITHIN_DAYSで変更でき、空にすると再取得しない）
+DEFAULT_REFETCH_KNOWN_WITHIN_DAYS = 3
+
+# パイプラインの待ち行列で、停止を確認する間隔（秒）
+_QUEUE_POLL_SECONDS = 0.1
+
+
+class JobScrapingService:
+    """スクレイピング全体の制御"""
+
+    def __init__(
+        self,
+        scrape_limit_date: str = "2024-12-27",
+        max_workers: int = 1,
+        requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+        pipelined: bool = False,
+        queue_size: int = 100,
+        response_cache: Optional[ResponseCache] = None,
+        known_listing_index: Optional[KnownListingIndex] = None,
+        refetch_known_within_days: Optional[int] = None,
+        checkpoint: Optional[ScrapeCheckpoint] = None,
+        parser_backend: str = "auto",
+        parse_workers: int = 0,
+        html_archive: Optional[HtmlArchive] = None,
+        base_url: str = BASE_URL,
+    ):
+        """
+        Args:
+            scrape_limit_date (str): この日付以降に掲載された求人を取得する
+            max_workers (int): 詳細ページを並行取得するワーカー数（1の場合は逐次取得）
+            requests_per_second (float): 全ワーカー合計のリクエスト頻度の上限
+            pipelined (bool): 一覧ページの取得と並行して詳細ページを取得するか
+            queue_size (int): パイプライン時に一覧から詳細へ渡す待ち行列の上限
+            response_cache (Optional[ResponseCache]): 条件付きGETのレスポンスキャッシュ
+            known_listing_index (Optional[KnownListingIndex]): 取り込み済みの求人の索引
+            refetch_known_within_days (Optional[int]): 取り込み済みでも、掲載開始日が
+                この日数以内の求人は再取得する（Noneの場合は常にスキップ）
+            checkpoint (Optional[ScrapeCheckpoint]): 進捗の保存と再開に使うチェックポイント
+            parser_backend (str): HTMLの解析に使う実装（auto, selectolax, lxml, bs4）
+            parse_workers (int): パースを取得と並行して行うワーカープロセス数
+                （0の場合やGILを解放するlxml・selectolaxでは取得したスレッドでパースする）
+            html_archive (Optional[HtmlArchive]): 取得したHTMLを再パース用に保存するアーカイブ
+            base_url (str): 取得先のサイト（ベンチマークではローカルのスタブサーバー）
+        """
+        self.logger = setup_logger("job_scraper")
+        if max_workers < 1:
+            raise ValueError("max_workers must be 1 or greater")
+        self.max_workers = max_workers
+        self.pipelined = pipelined
+        self.queue_size = queue_size
+
+        # 固定のスリープの代わりに、一覧・詳細で共有するRateLimiterで負荷を抑える
+        self.rate_limiter = RateLimiter(requests_per_second)
+        self.response_cache = response_cache
+        self.known_listing_index = known_listing_index
+        self.refetch_known_within_days = refetch_known_within_days
+        self.skipped_known_count = 0
+        self.checkpoint = checkpoint
+        self.html_archive = html_archive
+        http_client = HttpClient(
+            base_url,
+            self.rate_limiter,
+            pool_size=max(10, max_workers),
+            cache=response_cache,
+        )
+        # ワーカープロセスはログのスレッドを複製しないよう forkserver で起動する（ParsePool）
+        self.parse_pool = (
+            ParsePool(parse_workers, parser_backend)
+            if uses_parse_pool(parser_backend, parse_workers)
+            else None
+        )
+        parser = self.parse_pool or JobDataParser(parser_backend)
+        self.list_scraper = JobListScraper(http_client, parser, html_archive)
+        self.detail_scraper = JobDetailScraper(http_client, parser, html_archive)
+        self.scrape_limit_date = pd.to_datetime(scrape_limit_date)
+        self.logger.info(
+            f"Initialized scraping service with limit date: {scrape_limit_date}, "
+            f"max workers: {max_workers}, pipelined: {pipelined}, "
+            f"parse workers: {parse_workers}"
+        )
+
+    def execute(self) -> pd.DataFrame:
+        """スクレイピングを実行し、すべての求人を1つのDataFrameとして返す"""
+        frames: List[pd.DataFrame] = []
+        self._run(OrderedRecordBatcher(frames.append))
+        return frames[0]
+
+    def execute_to(self, writer: GcsStreamWriter, batch_size: int = 500) -> int:
+        """スクレイピングを実行し、batch_size 件ごとに writer へ書き出す
+
+        Returns:
+            int: 書き出した求人の件数
+        """
+        batcher = OrderedRecordBatcher(writer.write_frame, batch_size)
+        self._run(batcher)
+        return batcher.row_count
+
+    def _run(self, batcher: OrderedRecordBatcher) -> None:
+        """スクレイピングを実行し、取得したレコードを一覧ページの順に batcher へ渡す"""
+        try:
+            with traced(
+                "scraper.run",
+                limit_date=self.scrape_limit_date.strftime("%Y-%m-%d"),
+                pipelined=self.pipelined,
+            ) as span:
+                if self.pipelined:
+                    self._scrape_pipelined(batcher)
+                else:
+                    self._scrape_in_phases(batcher)
+                batcher.close()
+                span.set_attribute("row_count", batcher.row_count)
+
+            self.logger.info(f"Rate limiter metrics: {self.rate_limiter.get_metrics()}")
+
+            if batcher.row_count:
+                self.logger.info("Scraping completed successfully")
+            else:
+                self.logger.info("No detail pages were scraped")
+
+        except Exception as e:
+            self.logger.error(f"Error during scraping: {str(e)}", exc_info=True)
+            # 再実行時に途中から再開できるよう、失敗時点までの進捗を保存する
+            if self.checkpoint is not None:
+                self.checkpoint.save()
+            raise
+
+        finally:
+            # 失敗した場合も取得済みのレスポンスは次回の実行で再利用する
+            if self.response_cache is not None:
+                self.response_cache.flush()
+            if self.html_archive is not None:
+                self.html_archive.flush()
+            if self.parse_pool is not None:
+                self.parse_pool.close()
+
+    def _scrape_in_phases(self, batcher: OrderedRecordBatcher) -> None:
+        """一覧ページをすべて取得した後に詳細ページを取得"""
+        if self.checkpoint is not None and self.checkpoint.list_complete:
+            self.logger.info("Using list pages from checkpoint")
+            jobs = self.checkpoint.get_list_jobs()
+        else:
+            self.logger.info("Starting job list scraping")
+            jobs = self.list_scraper.scrape_all_pages(self.scrape_limit_date)
+            if self.checkpoint is not None:
+                self.checkpoint.record_list(jobs)
+        self.logger.info(f"Found {len(jobs)} jobs in list pages")
+        jobs = self._exclude_known_listings(jobs)
+
+        # リストが空の場合は詳細ページを取得しない
+        if len(jobs) == 0:
+            self.logger.info("No new jobs found within the date range")
+            return
+
+        self.logger.info(f"Starting detail page scraping for {len(jobs)} jobs")
+        if self.max_workers > 1:
+            self._scrape_details_concurrently(jobs, batcher)
+        else:
+            self._scrape_details_sequentially(jobs, batcher)
+
+    def _scrape_pipelined(self, batcher: OrderedRecordBatcher) -> None:
+        """一覧ページの取得と並行して詳細ページを取得（生産者・消費者パイプライン）
+
+        一覧ページをパースするたびに求人を待ち行列へ投入し、詳細ページのワーカーが
+        後続の一覧ページの取得中にも消費する。待ち行列が満杯の間は一覧ページの
+        取得が待機するため、メモリ使用量は queue_size で抑えられる。
+        """
+        pending: "queue.Queue[Optional[Tuple[int, JobListData]]]" = queue.Queue(
+            maxsize=self.queue_size
+        )
+        # 複数のワーカーから数えるため、nonlocalの加算ではなくカウンタから採番する
+        scraped_counter = itertools.count(1)
+        failed_urls: List[str] = []
+        consumer_errors: List[Exception] = []
+        stop_event = threading.Event()
+
+        def consume() -> None:
+            try:
+                while True:
+                    try:
+                        item = pending.get(timeout=_QUEUE_POLL_SECONDS)
+                    except queue.Empty:
+                        if stop_event.is_set():
+                            return
+                        continue
+                    # 一覧ページの取得や他のワーカーが失敗した場合は残りの求人を破棄する
+                    if item is None or stop_event.is_set():
+                        return
+                    index, job = item
+                    url = job.detail_link
+                    try:
+                        detail = self._scrape_detail(url)
+                    except Exception as e:
+                        failed_urls.append(url)
+                        self.logger.warning(
+                            f"Failed to scrape detail page {url}: {str(e)}"
+                        )
+                        batcher.add(index, None)
+                        continue
+                    batcher.add(index, JobRecord(detail=detail, listing=job))
+                    scraped_count = next(scraped_counter)
+                    self.logger.info(
+                        f"Scraped detail page {scraped_count}", extra=SAMPLED
+                    )
+            except Exception as e:
+                # 書き込み（batcher.add）などの失敗は求人単位では回復できないため、
+                # 一覧ページの取得と他のワーカーを止めて、呼び出し元で送出する
+                consumer_errors.append(e)
+                stop_event.set()
+
+        def put(item: Optional[Tuple[int, JobListData]]) -> bool:
+            # ワーカーが止まった後に満杯の待ち行列で待ち続けないよう、停止を確認しながら待つ
+            while not stop_event.is_set():
+                try:
+                    pending.put(item, timeout=_QUEUE_POLL_SECONDS)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        self.logger.info("Starting pipelined job scraping")
+        total = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            workers = [executor.submit(consume) for _ in range(self.max_workers)]
+            try:
+                # 制限日より古い求人が現れた時点でiter_pagesが終了し、一覧の取得も止まる
+                for jobs in self._iter_list_pages():
+                    for job in self._exclude_known_listings(jobs):
+                        if not put((total, job)):
+                            break
+                        total += 1
+                    if stop_event.is_set():
+                        break
+            except Exception:
+                stop_event.set()
+                raise
+            finally:
+                for _ in workers:
+                    put(None)
+            for worker in workers:
+                worker.result()
+
+        if consumer_errors:
+            raise consumer_errors[0]
+        if total == 0:
+            self.logger.info("No new jobs found within the date range")
+        if failed_urls:
+            self.logger.warning(f"Skipped {len(failed_urls)}/{total} detail pages")
+
+    def _iter_list_pages(self) -> Iterator[List[JobListData]]:
+        """一覧ページの求人を順に返す（チェックポイントがあれば取得済みの分から再開）"""
+        checkpoint = self.checkpoint
+        if checkpoint is None:
+            yield from self.list_scraper.iter_pages(self.scrape_limit_date)
+            return
+
+        if checkpoint.list_jobs:
+            self.logger.info(
+                f"Resuming after list page {checkpoint.completed_pages} from checkpoint"
+            )
+            yield checkpoint.get_list_jobs()
+        if checkpoint.list_complete:
+            return
+
+        page_num = checkpoint.completed_pages
+        for jobs in self.list_scraper.iter_pages(
+            self.scrape_limit_date, start_page=page_num + 1
+        ):
+            page_num += 1
+            yield jobs
+            checkpoint.record_list_page(page_num, jobs)
+        checkpoint.mark_list_complete()
+
+    def _scrape_detail(self, url: str) -> JobDetailData:
+        """詳細ページを取得（チェックポイントに結果があれば再利用）"""
+        if self.checkpoint is not None:
+            detail = self.checkpoint.get_detail(url)
+            if detail is not None:
+                return detail
+
+        detail = self.detail_scraper.scrape_detail(url)
+        if self.checkpoint is not None:
+            self.checkpoint.record_detail(url, detail)
+        return detail
+
+    def _submit_detail(self, url: str) -> "Tuple[Future[JobDetailData], bool]":
+        """詳細ページを取得し、パースの完了を待たずに返す
+
+        Returns:
+            Tuple[Future[JobDetailData], bool]: パース結果と、チェックポイントの結果か
+        """
+        if self.checkpoint is not None:
+            detail = self.checkpoint.get_detail(url)
+            if detail is not None:
+                future: "Future[JobDetailData]" = Future()
+                future.set_result(detail)
+                return future, True
+        return self.detail_scraper.submit_detail(url), False
+
+    def _exclude_known_listings(self, jobs: List[JobListData]) -> List[JobListData]:
+        """取り込み済みの求人を除外"""
+        if self.known_listing_index is None or len(jobs) == 0:
+            return jobs
+
+        index = self.known_listing_index
+        refetch_since = None
+        if self.refetch_known_within_days is not None:
+            refetch_since = pd.Timestamp(get_jst_now().date()) - pd.Timedelta(
+                days=self.refetch_known_within_days
+            )
+
+        new_jobs = [
+            job
+            for job in jobs
+            if job.detail_link not in index
+            or (refetch_since is not None and job.listing_start_date >= refetch_since)
+        ]
+        skipped = len(jobs) - len(new_jobs)
+        if skipped:
+            self.skipped_known_count += skipped
+            self.logger.info(f"Skipped {skipped} already loaded jobs")
+        return new_jobs
+
+    def _scrape_details_sequentially(
+        self, jobs: List[JobListData], batcher: OrderedRecordBatcher
+    ) -> None:
+        """詳細ページを1件ずつ取得（失敗したURLはスキップ）"""
+        if self.parse_pool is not None:
+            self._scrape_details_overlapped(jobs, batcher)
+            return
+        total = len(jobs)
+        failed_count = 0
+        for i, job in enumerate(jobs):
+            self.logger.info(f"Scraping detail page {i + 1}/{total}", extra=SAMPLED)
+            try:
+                detail = self._scrape_detail(job.detail_link)
+            except Exception as e:
+                failed_count += 1
+                self.logger.warning(
+                    f"Failed to scrape detail page {job.detail_link}: {str(e)}"
+                )
+                batcher.add(i, None)
+                continue
+            batcher.add(i, JobRecord(detail=detail, listing=job))
+
+        if failed_count:
+            self.logger.warning(f"Skipped {failed_count}/{total} detail pages")
+
+    def _scrape_details_overlapped(
+        self, jobs: List[JobListData], batcher: OrderedRecordBatcher
+    ) -> None:
+        """詳細ページを1件ずつ取得し、パースはワーカープロセスで次の取得と並行して行う
+
+        パースの完了を待たずに次のページを取得し、完了したものから一覧の順に
+        batcher へ渡す。パース待ちの件数は ParsePool の max_pending で抑えられる。
+        """
+        total = len(jobs)
+        failed_count = 0
+        parsing: Deque[Tuple[int, "Future[JobDetailData]", bool]] = deque()
+
+        def skip(i: int, e: Exception) -> None:
+            nonlocal failed_count
+            failed_count += 1
+            self.logger.warning(
+                f"Failed to scrape detail page {jobs[i].detail_link}: {str(e)}"
+            )
+            batcher.add(i, None)
+
+        def add_parsed(block: bool) -> None:
+            while parsing and (block or parsing[0][1].done()):
+                i, future, from_checkpoint = parsing.popleft()
+                try:
+                    detail = future.result()
+                except Exception as e:
+                    skip(i, e)
+                    continue
+                if self.checkpoint is not None and not from_checkpoint:
+                    self.checkpoint.record_detail(jobs[i].detail_link, detail)
+                batcher.add(i, JobRecord(detail=detail, listing=jobs[i]))
+
+        for i, job in enumerate(jobs):
+            self.logger.info(f"Scraping detail page {i + 1}/{total}", extra=SAMPLED)
+            try:
+                parsing.append((i, *self._submit_detail(job.detail_link)))
+            except Exception as e:
+                skip(i, e)
+            add_parsed(block=False)
+        add_parsed(block=True)
+
+        if failed_count:
+            self.logger.warning(f"Skipped {failed_count}/{total} detail pages")
+
+    def _scrape_details_concurrently(
+        self, jobs: List[JobListData], batcher: OrderedRecordBatcher
+    ) -> None:
+        """詳細ページを並行取得（一覧の順序を維持し、失敗したURLはスキップ）"""
+        total = len(jobs)
+        failed_count = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self._scrape_detail, job.detail_link): i
+                for i, job in enumerate(jobs)
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                i = futures[future]
+                try:
+                    detail = future.result()
+                except Exception as e:
+                    failed_count += 1
+                    self.logger.warning(
+                        f"Failed to scrape detail page {jobs[i].detail_link}: {str(e)}"
+                    )
+                    batcher.add(i, None)
+                    continue
+                batcher.add(i, JobRecord(detail=detail, listing=jobs[i]))
+                self.logger.info(f"Scraped detail page {done}/{total}", extra=SAMPLED)
+
+        if failed_count:
+            self.logger.warning(f"Skipped {failed_count}/{total} detail pages")
+
+
+def create_response_cache(bucket_name: str) -> Optional[ResponseCache]:
+    """環境変数SCRAPER_HTTP_CACHEからレスポンスキャッシュを作成
+
+    "gcs" の場合はデータバケット、それ以外の値はローカルディレクトリに保存する。
+    未設定の場合はキャッシュを使用しない。
+    """
+    cache_location = os.environ.get("SCRAPER_HTTP_CACHE")
+    if not cache_location:
+        return None
+    max_bytes = int(os.environ.get("SCRAPER_HTTP_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+    if cache_location == "gcs":
+        return ResponseCache(GcsCacheStorage(bucket_name), max_bytes=max_bytes)
+    return ResponseCache(LocalCacheStorage(cache_location), max_bytes=max_bytes)
+
+
+def create_html_archive(bucket_name: str) -> Optional[HtmlArchive]:
+    """環境変数SCRAPER_HTML_ARCHIVEから取得したHTMLのアーカイブを作成
+
+    "gcs" の場合はデータバケット、それ以外の値はローカルディレクトリに保存する。
+    未設定の場合は保存しない。
+    """
+    archive_location = os.environ.get("SCRAPER_HTML_ARCHIVE")
+    if not archive_location:
+        return None
+    if archive_location == "gcs":
+        return HtmlArchive(GcsCacheStorage(bucket_name, prefix=ARCHIVE_PREFIX))
+    return HtmlArchive(LocalCacheStorage(archive_location))
+
+
+def load_known_listing_index(bucket_name: str) -> Optional[KnownListingIndex]:
+    """環境変数SCRAPER_SKIP_KNOWN_LISTINGSがtrueの場合に取り込み済みの索引を読み込む"""
+    if os.environ.get("SCRAPER_SKIP_KNOWN_LISTINGS", "false").lower() != "true":
+        return None
+    return KnownListingIndex.load(bucket_name)
@@ -0,0 +1,221 @@
+import json
+import threading
+from dataclasses import asdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+
+from google.api_core.exceptions import NotFound
+from shared.gcp_clients import get_storage_client
+from shared.logger_config import setup_logger
+from utils.models import JobBasicData, JobDetailData, JobListData, JobTableData
+
+
+def _to_json_value(value: Any) -> Any:
+    """JSONに変換できない値（掲載開始日）を変換"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _to_job_list_data(row: Dict[str, Any]) -> JobListData:
+    return JobListData(
+        job_title=row["job_title"],
+        listing_start_date=datetime.fromisoformat(row["listing_start_date"]),
+        detail_link=row["detail_link"],
+    )
+
+
+def _to_job_detail_data(record: Dict[str, Any]) -> JobDetailData:
+    return JobDetailData(
+        basic=JobBasicData(**record["basic"]), table=JobTableData(**record["table"])
+    )
+
+
+# チェックポイントを保存するプレフィックス（制限日ごとに limit_date=YYYY-MM-DD/ 以下に置く）
+CHECKPOINT_PREFIX = "checkpoints/scraper/"
+
+
+class ScrapeCheckpoint:
+    """スクレイピングの進捗をデータバケットに保存し、再実行時に再開する
+
+    一覧ページは1ページごと、詳細ページは interval 件ごとに、その間に取得した分だけを
+    連番の別のオブジェクト（list/000001.json, details/000001.json など）として追記する。
+    保存のたびに全体を書き直さず、既存のオブジェクトも上書きしない（if_generation_match=0）ため、
+    並行して保存しても新しい進捗が古い内容で置き換わることはない。
+
+    保存済みの詳細ページの結果はメモリに残さず、取得済みのURLのみを保持する。
+    再開時に読み込んだ結果は get_detail で1度取り出すと破棄する。
+    """
+
+    def __init__(self, bucket_name: str, limit_date: str, interval: int = 25):
+        """
+        Args:
+            bucket_name (str): チェックポイントを保存するバケット名
+            limit_date (str): 実行の対象とする制限日（チェックポイントのキー）
+            interval (int): 詳細ページを何件取得するごとに保存するか
+        """
+        self.logger = setup_logger("scrape_checkpoint")
+        self.bucket = get_storage_client().bucket(bucket_name)
+        self.limit_date = limit_date
+        self.prefix = f"{CHECKPOINT_PREFIX}limit_date={limit_date}/"
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._sequence = 0
+        # 取得済みで、まだ保存していない詳細ページの結果
+        self._unsaved: Dict[str, JobDetailData] = {}
+
+        self.completed_pages = 0
+        self.list_complete = False
+        self.list_jobs: List[JobListData] = []
+        self.done_links: Set[str] = set()
+        # 再開時に読み込んだ詳細ページの結果（get_detail で取り出すまで保持する）
+        self.records: Dict[str, JobDetailData] = {}
+
+    @classmethod
+    def load(
+        cls, bucket_name: str, limit_date: str, interval: int = 25
+    ) -> "ScrapeCheckpoint":
+        """保存済みのチェックポイントを読み込む（存在しない場合は空の状態）"""
+        checkpoint = cls(bucket_name, limit_date, interval)
+        blobs = sorted(
+            checkpoint.bucket.list_blobs(prefix=checkpoint.prefix),
+            key=lambda blob: blob.name,
+        )
+        if not blobs:
+            return checkpoint
+
+        completed_pages = 0
+        list_complete = False
+        list_jobs: List[JobListData] = []
+        records: Dict[str, JobDetailData] = {}
+        sequence = 0
+        try:
+            for blob in blobs:
+                kind, _, file_name = blob.name[len(checkpoint.prefix) :].partition("/")
+                sequence = max(sequence, int(file_name.removesuffix(".json")))
+                state = json.loads(blob.download_as_bytes())
+                if kind == "list":
+                    # 一覧ページをまとめて記録した場合（record_list）はそれまでの分と置き換える
+                    if state["all"]:
+                        list_jobs = []
+                    list_jobs.extend(_to_job_list_data(row) for row in state["jobs"])
+                    completed_pages = max(completed_pages, state["page"])
+                    list_complete = list_complete or state["complete"]
+                elif kind == "details":
+                    records.update(
+                        (detail_link, _to_job_detail_data(record))
+                        for detail_link, record in state.items()
+                    )
+        except (KeyError, TypeError, ValueError) as e:
+            # 形式の異なる古いチェックポイントは使わずに最初から取得する
+            checkpoint.logger.warning(f"Ignoring incompatible checkpoint: {str(e)}")
+            checkpoint.clear()
+            return checkpoint
+
+        checkpoint._sequence = sequence
+        checkpoint.completed_pages = completed_pages
+        checkpoint.list_complete = list_complete
+        checkpoint.list_jobs = list_jobs
+        checkpoint.records = records
+        checkpoint.done_links = set(records)
+        checkpoint.logger.info(
+            f"Resuming from checkpoint: {checkpoint.completed_pages} list pages, "
+            f"{len(checkpoint.records)} detail pages"
+        )
+        return checkpoint
+
+    def get_list_jobs(self) -> List[JobListData]:
+        """取得済みの一覧ページの求人を取得"""
+        with self._lock:
+            return list(self.list_jobs)
+
+    def record_list_page(self, page_num: int, jobs: List[JobListData]) -> None:
+        """1ページ分の一覧ページの求人を記録して保存"""
+        with self._lock:
+            self.list_jobs.extend(jobs)
+            self.completed_pages = page_num
+        self._save_list(page_num, jobs, complete=False, all_pages=False)
+
+    def record_list(self, jobs: List[JobListData]) -> None:
+        """すべての一覧ページの求人を記録して保存"""
+        with self._lock:
+            self.list_jobs = list(jobs)
+            self.list_complete = True
+        self._save_list(0, jobs, complete=True, all_pages=True)
+
+    def mark_list_complete(self) -> None:
+        """すべての一覧ページを取得済みとして保存"""
+        with self._lock:
+            self.list_complete = True
+            page_num = self.completed_pages
+        self._save_list(page_num, [], complete=True, all_pages=False)
+
+    def get_detail(self, detail_link: str) -> Optional[JobDetailData]:
+        """再開時に読み込んだ詳細ページの結果を取り出す（取り出した結果は破棄する）"""
+        with self._lock:
+            return self.records.pop(detail_link, None)
+
+    def record_detail(self, detail_link: str, detail: JobDetailData) -> None:
+        """詳細ページの結果を記録し、interval 件ごとに保存"""
+        with self._lock:
+            self._unsaved[detail_link] = detail
+            self.done_links.add(detail_link)
+            should_save = len(self._unsaved) >= self.interval
+        if should_save:
+            self.save()
+
+    def save(self) -> None:
+        """まだ保存していない詳細ページの結果を保存"""
+        with self._lock:
+            if not self._unsaved:
+                return
+            state = {
+                detail_link: asdict(detail)
+                for detail_link, detail in self._unsaved.items()
+            }
+            self._unsaved = {}
+            done_count = len(self.done_links)
+        self._append("details", state)
+        self.logger.info(
+            f"Saved checkpoint: {self.completed_pages} list pages, "
+            f"{done_count} detail pages"
+        )
+
+    def clear(self) -> None:
+        """処理の完了後に、この制限日と過去の制限日のチェックポイントを削除
+
+        成功しなかった制限日のチェックポイントは再実行されないため、ここでまとめて削除する。
+        """
+        for blob in self.bucket.list_blobs(prefix=CHECKPOINT_PREFIX):
+            limit_date = blob.name[len(CHECKPOINT_PREFIX) :].removeprefix(
+                "limit_date="
+            )[:10]
+            if limit_date <= self.limit_date:
+                try:
+                    blob.delete()
+                except NotFound:
+                    pass
+
+    def _save_list(
+        self, page_num: int, jobs: List[JobListData], complete: bool, all_pages: bool
+    ) -> None:
+        self._append(
+            "list",
+            {
+                "page": page_num,
+                "complete": complete,
+                "all": all_pages,
+                "jobs": [asdict(job) for job in jobs],
+            },
+        )
+
+    def _append(self, kind: str, state: Dict[str, Any]) -> None:
+        """連番の新しいオブジェクトとして保存（既存のオブジェクトは上書きしない）"""
+        with self._lock:
+            self._sequence += 1
+            blob_name = f"{self.prefix}{kind}/{self._sequence:06d}.json"
+        self.bucket.blob(blob_name).upload_from_string(
+            json.dumps(state, ensure_ascii=False, default=_to_json_value),
+            content_type="application/json",
+            if_generation_match=0,
+        )
@@ -0,0 +1,145 @@
+import gzip
+import hashlib
+import json
+import threading
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Set
+
+from shared.date_utils import get_jst_now
+from shared.logger_config import setup_logger
+from utils.http_client import CacheStorage
+
+# データバケットに保存する場合のプレフィックス
+ARCHIVE_PREFIX = "archive/html"
+# ページの種類（再パース時に使うパーサーのメソッドを決める）
+PAGE_TYPES = ("list", "detail")
+
+
+@dataclass
+class ArchiveEntry:
+    """マニフェストの1行（取得したURLと本文のハッシュ）"""
+
+    url: str
+    page_type: str
+    sha256: str
+    fetched_at: str
+
+
+class HtmlArchiveReader:
+    """アーカイブ済みのHTMLとマニフェストの読み込み
+
+    本文は objects/<sha256の先頭2文字>/<sha256>.html.gz に保存されるため、
+    同じ内容のページは1つのオブジェクトになる。取得日ごとのマニフェスト
+    （manifests/fetch_date=YYYYMMDD.jsonl）にURL・ページの種類・ハッシュが記録される。
+    """
+
+    def __init__(self, storage: CacheStorage):
+        """
+        Args:
+            storage (CacheStorage): 保存先（GcsCacheStorage または LocalCacheStorage）
+        """
+        self.storage = storage
+
+    def read(self, sha256: str) -> bytes:
+        """保存済みの本文を展開して取得"""
+        data = self.storage.read(self._object_key(sha256))
+        if data is None:
+            raise KeyError(f"Archived page not found: {sha256}")
+        return gzip.decompress(data)
+
+    def read_manifest(self, fetch_date: str) -> List[ArchiveEntry]:
+        """取得日のマニフェストを取得した順に読み込む（存在しない場合は空）"""
+        data = self.storage.read(self._manifest_key(fetch_date))
+        if data is None:
+            return []
+        return [
+            ArchiveEntry(**json.loads(line))
+            for line in data.decode("utf-8").splitlines()
+            if line
+        ]
+
+    @staticmethod
+    def _object_key(sha256: str) -> str:
+        return f"objects/{sha256[:2]}/{sha256}.html.gz"
+
+    @staticmethod
+    def _manifest_key(fetch_date: str) -> str:
+        return f"manifests/fetch_date={fetch_date}.jsonl"
+
+
+class HtmlArchive(HtmlArchiveReader):
+    """取得したHTMLを内容のハッシュをキーに圧縮して保存するアーカイブ
+
+    パーサーを変更した後に、サイトへアクセスせずに過去の取得結果を
+    再パースできるようにする（reparse.py）。
+
+    取得日は当日（JST）で、スクレイパーの出力のパーティション日付と一致する。
+    同じ日に再実行した場合は既存のマニフェストに追記し、同じURLは新しい取得で置き換える。
+    """
+
+    def __init__(self, storage: CacheStorage, fetch_date: Optional[str] = None):
+        """
+        Args:
+            storage (CacheStorage): 保存先（GcsCacheStorage または LocalCacheStorage）
+            fetch_date (Optional[str]): 取得日（YYYYMMDD、省略時は当日のJST）
+        """
+        super().__init__(storage)
+        self.fetch_date = fetch_date or get_jst_now().strftime("%Y%m%d")
+        self.logger = setup_logger("html_archive")
+        self._lock = threading.Lock()
+        self._entries: Dict[str, ArchiveEntry] = {
+            entry.url: entry for entry in self.read_manifest(self.fetch_date)
+        }
+        self._stored_hashes: Set[str] = {
+            entry.sha256 for entry in self._entries.values()
+        }
+        self.stored_count = 0
+        self.deduplicated_count = 0
+
+    def store(self, url: str, page_type: str, content: bytes) -> str:
+        """取得したページの本文を保存し、マニフェストに記録
+
+        Returns:
+            str: 本文のsha256
+        """
+        if page_type not in PAGE_TYPES:
+            raise ValueError(f"Unknown page type: {page_type}")
+        sha256 = hashlib.sha256(content).hexdigest()
+        with self._lock:
+            is_new = sha256 not in self._stored_hashes
+            self._stored_hashes.add(sha256)
+        if is_new:
+            # mtimeを固定し、同じ本文からは同じバイト列を作る
+            self.storage.write(
+                self._object_key(sha256), gzip.compress(content, mtime=0)
+            )
+        with self._lock:
+            self._entries[url] = ArchiveEntry(
+                url, page_type, sha256, get_jst_now().isoformat()
+            )
+            if is_new:
+                self.stored_count += 1
+            else:
+                self.deduplicated_count += 1
+        return sha256
+
+    def flush(self) -> None:
+        """当日のマニフェストを保存先へ書き出す"""
+        with self._lock:
+            lines = [
+                json.dumps(asdict(entry), ensure_ascii=False)
+                for entry in self._entries.values()
+            ]
+        self.storage.write(
+            self._manifest_key(self.fetch_date), "\n".join(lines).encode("utf-8")
+        )
+        self.logger.info(f"Flushed HTML archive manifest: {self.get_stats()}")
+
+    def get_stats(self) -> Dict[str, int]:
+        """保存・重複した件数とマニフェストの件数を取得"""
+        with self._lock:
+            return {
+                "stored": self.stored_count,
+                "deduplicated": self.deduplicated_count,
+                "entries": len(self._entries),
+            }
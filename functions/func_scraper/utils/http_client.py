@@ -1,26 +1,459 @@
-from urllib.parse import urljoin
+import hashlib
+import importlib.util
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from types import TracebackType
+from typing import Any, Dict, List, Optional, Protocol, Set, Tuple, Type
+from urllib.parse import urljoin, urlparse
+from urllib.robotparser import RobotFileParser
 
 import requests
+from google.api_core.exceptions import NotFound
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
-from shared.logger_config import setup_logger
+from requests.structures import CaseInsensitiveDict
+from shared.gcp_clients import get_storage_client
+from shared.logger_config import SAMPLED, setup_logger
+from shared.telemetry import record_value, traced
+from utils.rate_limiter import BACKOFF_STATUS_CODES, RateLimiter
+
+# brotliがインストールされている場合のみbrを受け付ける（urllib3が自動で展開する）
+ACCEPT_ENCODING = (
+    "gzip, deflate, br"
+    if importlib.util.find_spec("brotli") or importlib.util.find_spec("brotlicffi")
+    else "gzip, deflate"
+)
+DEFAULT_HEADERS = {"Accept-Encoding": ACCEPT_ENCODING, "Connection": "keep-alive"}
+
+
+class CacheStorage(Protocol):
+    """レスポンスキャッシュの保存先"""
+
+    def read(self, key: str) -> Optional[bytes]: ...
+
+    def write(self, key: str, data: bytes) -> None: ...
+
+    def delete(self, key: str) -> None: ...
+
+
+class LocalCacheStorage:
+    """ローカルディレクトリへの保存"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def read(self, key: str) -> Optional[bytes]:
+        try:
+            with open(os.path.join(self.directory, key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def write(self, key: str, data: bytes) -> None:
+        # 書き込み途中のファイルを読まないよう、一時ファイルから置き換える
+        path = os.path.join(self.directory, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(os.path.join(self.directory, key))
+        except FileNotFoundError:
+            pass
+
+
+class GcsCacheStorage:
+    """GCSバケットへの保存"""
+
+    def __init__(self, bucket_name: str, prefix: str = "cache/http"):
+        self.bucket = get_storage_client().bucket(bucket_name)
+        self.prefix = prefix
+
+    def read(self, key: str) -> Optional[bytes]:
+        try:
+            return self.bucket.blob(f"{self.prefix}/{key}").download_as_bytes()
+        except NotFound:
+            return None
+
+    def write(self, key: str, data: bytes) -> None:
+        self.bucket.blob(f"{self.prefix}/{key}").upload_from_string(data)
+
+    def delete(self, key: str) -> None:
+        try:
+            self.bucket.blob(f"{self.prefix}/{key}").delete()
+        except NotFound:
+            pass
+
+
+@dataclass
+class CacheEntry:
+    """キャッシュ済みレスポンスのバリデータ"""
+
+    url: str
+    size: int
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class ResponseCache:
+    """ETag/Last-Modifiedによる条件付きGETのためのレスポンスキャッシュ
+
+    URLごとにバリデータと本文を保存し、合計サイズが max_bytes を超えたら
+    最も長く使われていないエントリから削除する（LRU）。
+    エントリの一覧は flush() で保存先へ書き出し、次回の実行で読み込む。
+    """
+
+    INDEX_KEY = "index.json"
+
+    def __init__(self, storage: CacheStorage, max_bytes: int = 256 * 1024 * 1024):
+        self.storage = storage
+        self.max_bytes = max_bytes
+        self.logger = setup_logger("response_cache")
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._load_index()
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """キャッシュ済みのURLであれば条件付きGETのヘッダーを返す"""
+        with self._lock:
+            entry = self._entries.get(self._key(url))
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def load(self, url: str) -> Optional[bytes]:
+        """304を受けた際にキャッシュ済みの本文を返す"""
+        key = self._key(url)
+        body = self.storage.read(key)
+        with self._lock:
+            if body is None:
+                # 本文が失われている場合はエントリを破棄して再取得させる
+                self._remove(key)
+                return None
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self.hits += 1
+        return body
+
+    def store(self, url: str, response: requests.Response) -> None:
+        """バリデータを持つレスポンスを保存"""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        with self._lock:
+            self.misses += 1
+        if not etag and not last_modified:
+            return
+
+        key = self._key(url)
+        body = response.content
+        self.storage.write(key, body)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = CacheEntry(url, len(body), etag, last_modified)
+            self._size += len(body)
+            evicted = self._evict()
+        for evicted_key in evicted:
+            self.storage.delete(evicted_key)
+
+    def flush(self) -> None:
+        """エントリの一覧を保存先へ書き出す"""
+        with self._lock:
+            index = [
+                {"key": key, **asdict(entry)} for key, entry in self._entries.items()
+            ]
+        self.storage.write(self.INDEX_KEY, json.dumps(index).encode("utf-8"))
+        self.logger.info(f"Flushed response cache index: {self.get_stats()}")
+
+    def get_stats(self) -> Dict[str, int]:
+        """ヒット・ミスの件数とキャッシュのサイズを取得"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "size_bytes": self._size,
+            }
+
+    def _load_index(self) -> None:
+        data = self.storage.read(self.INDEX_KEY)
+        if data is None:
+            return
+        try:
+            for item in json.loads(data):
+                key = item.pop("key")
+                entry = CacheEntry(**item)
+                self._entries[key] = entry
+                self._size += entry.size
+        except (ValueError, TypeError, KeyError) as e:
+            self.logger.warning(f"Ignoring broken response cache index: {str(e)}")
+            self._entries.clear()
+            self._size = 0
+
+    def _evict(self) -> List[str]:
+        evicted = []
+        while self._size > self.max_bytes and self._entries:
+            key, entry = self._entries.popitem(last=False)
+            self._size -= entry.size
+            self.evictions += 1
+            evicted.append(key)
+        return evicted
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.size
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
 
 
 class HttpClient:
-    """HTTPリクエスト"""
+    """HTTPリクエスト（コネクションプールを共有してkeep-aliveで再利用）"""
 
-    def __init__(self, base_url: str):
+    def __init__(
+        self,
+        base_url: str,
+        rate_limiter: Optional[RateLimiter] = None,
+        pool_size: int = 10,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
+        max_retries: int = 2,
+        respect_robots_txt: bool = True,
+        cache: Optional[ResponseCache] = None,
+    ):
+        """
+        Args:
+            base_url (str): 相対パスを解決する基準URL
+            rate_limiter (Optional[RateLimiter]): ホストごとのリクエスト頻度の制御
+            pool_size (int): ホストごとに保持するコネクション数（並行数以上を指定）
+            connect_timeout (float): 接続タイムアウト（秒）
+            read_timeout (float): 読み込みタイムアウト（秒）
+            max_retries (int): 429/503を受けた際の再試行回数（rate_limiter指定時のみ）
+            respect_robots_txt (bool): robots.txtのCrawl-delayをrate_limiterに反映するか
+            cache (Optional[ResponseCache]): 条件付きGETに使うレスポンスキャッシュ
+        """
         self.base_url = base_url
+        self.rate_limiter = rate_limiter
+        self.timeout: Tuple[float, float] = (connect_timeout, read_timeout)
+        self.max_retries = max_retries if rate_limiter is not None else 0
+        self.respect_robots_txt = respect_robots_txt
+        self.cache = cache
+        self._robots_checked_hosts: Set[str] = set()
+        self._robots_lock = threading.Lock()
         self.logger = setup_logger("http_client")
 
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
     def get(self, path: str) -> requests.Response:
+        """GETリクエストを実行"""
+        url = path if path.startswith("http") else urljoin(self.base_url, path)
+        try:
+            with traced("http.get", url=url) as span:
+                headers = self.cache.conditional_headers(url) if self.cache else {}
+                response = self._send_with_retry(url, headers)
+                span.set_attribute("http.status_code", response.status_code)
+
+                if response.status_code == 304 and self.cache is not None:
+                    cached_response = self._from_cache(url, response)
+                    if cached_response is not None:
+                        span.set_attribute("cache_hit", True)
+                        return cached_response
+                    # キャッシュの本文が失われている場合は条件なしで再取得
+                    response = self._send_with_retry(url, {})
+                    span.set_attribute("http.status_code", response.status_code)
+
+                response.raise_for_status()
+                if self.cache is not None:
+                    self.cache.store(url, response)
+                response.encoding = "utf-8"
+                size = len(response.content)
+                span.set_attribute("bytes", size)
+                record_value("http.response.size", size, unit="By")
+                return response
+        except RequestException as e:
+            self.logger.error(f"Request failed: {str(e)}")
+            raise
+
+    def _send_with_retry(self, url: str, headers: Dict[str, str]) -> requests.Response:
+        """429/503を受けた場合はRateLimiterの待機を挟んで再試行"""
+        for attempt in range(self.max_retries + 1):
+            response = self._send(url, headers)
+            if (
+                response.status_code not in BACKOFF_STATUS_CODES
+                or attempt == self.max_retries
+            ):
+                break
+            # 次のacquireでRetry-Afterとバックオフ後のレートに従って待機する
+            self.logger.warning(
+                f"Received {response.status_code} from {url}, retrying..."
+            )
+        return response
+
+    def _send(self, url: str, headers: Dict[str, str]) -> requests.Response:
+        """レート制御を適用して1回のリクエストを送信"""
+        if self.rate_limiter is None:
+            self.logger.info(f"Sending GET request to: {url}", extra=SAMPLED)
+            return self.session.get(url, timeout=self.timeout, headers=headers)
+
+        self._apply_robots_txt(url)
+        self.rate_limiter.acquire(url)
+        self.logger.info(f"Sending GET request to: {url}", extra=SAMPLED)
+        started_at = time.monotonic()
+        response = self.session.get(url, timeout=self.timeout, headers=headers)
+        self.rate_limiter.record_response(
+            url,
+            response.status_code,
+            time.monotonic() - started_at,
+            response.headers.get("Retry-After"),
+        )
+        return response
+
+    def _from_cache(
+        self, url: str, not_modified: requests.Response
+    ) -> Optional[requests.Response]:
+        """304レスポンスをキャッシュ済みの本文で200レスポンスに置き換える"""
+        assert self.cache is not None
+        body = self.cache.load(url)
+        if body is None:
+            return None
+        self.logger.info(f"Not modified, served from cache: {url}")
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.headers = CaseInsensitiveDict(not_modified.headers)
+        response._content = body
+        response.encoding = "utf-8"
+        return response
+
+    def _apply_robots_txt(self, url: str) -> None:
+        """ホストごとに一度だけrobots.txtを取得し、Crawl-delayを反映"""
+        if not self.respect_robots_txt or self.rate_limiter is None:
+            return
+        parsed = urlparse(url)
+        # 並行するリクエストはCrawl-delayの反映が終わるまで待たせ、取得も一度に限る
+        with self._robots_lock:
+            if parsed.netloc in self._robots_checked_hosts:
+                return
+            self._robots_checked_hosts.add(parsed.netloc)
+
+            robots_url = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
+            try:
+                response = self.session.get(robots_url, timeout=self.timeout)
+                if response.status_code != 200:
+                    return
+                robots = RobotFileParser()
+                robots.parse(response.text.splitlines())
+                user_agent = str(self.session.headers.get("User-Agent", "*"))
+                crawl_delay = robots.crawl_delay(user_agent)
+                if crawl_delay:
+                    self.rate_limiter.set_crawl_delay(url, float(crawl_delay))
+                    self.logger.info(
+                        f"Applied Crawl-delay {crawl_delay}s from robots.txt"
+                    )
+            except RequestException as e:
+                self.logger.warning(f"Failed to fetch robots.txt: {str(e)}")
+
+    def close(self) -> None:
+        """プール中のコネクションを閉じ、キャッシュの一覧を書き出す"""
+        self.session.close()
+        if self.cache is not None:
+            self.cache.flush()
+
+    def __enter__(self) -> "HttpClient":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+class AsyncHttpClient:
+    """asyncio向けHTTPクライアント（httpxによるHTTP/2対応）
+
+    HttpClientと同じくget()でレスポンスを返すが、コルーチンとして呼び出す。
+    httpx[http2]が必要（未インストールの場合はImportErrorを送出）。
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        http2: bool = True,
+        pool_size: int = 10,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
+    ):
+        try:
+            import httpx
+        except ImportError as e:
+            raise ImportError(
+                "AsyncHttpClient requires httpx. Install it with "
+                "`pip install 'httpx[http2]'`"
+            ) from e
+
+        self.base_url = base_url
+        self.logger = setup_logger("async_http_client")
+        self._request_error = httpx.HTTPError
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            http2=http2,
+            headers=DEFAULT_HEADERS,
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(
+                max_connections=pool_size, max_keepalive_connections=pool_size
+            ),
+            follow_redirects=True,
+        )
+
+    async def get(self, path: str) -> Any:
         """GETリクエストを実行"""
         try:
             url = path if path.startswith("http") else urljoin(self.base_url, path)
-            self.logger.info(f"Sending GET request to: {url}")
-            response = requests.get(url)
+            self.logger.info(f"Sending GET request to: {url}", extra=SAMPLED)
+            response = await self.client.get(url)
             response.raise_for_status()
             response.encoding = "utf-8"
             return response
-        except RequestException as e:
+        except self._request_error as e:
             self.logger.error(f"Request failed: {str(e)}")
             raise
+
+    async def aclose(self) -> None:
+        """プール中のコネクションを閉じる"""
+        await self.client.aclose()
+
+    async def __aenter__(self) -> "AsyncHttpClient":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        await self.aclose()
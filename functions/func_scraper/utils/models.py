@@ -1,17 +1,22 @@
-from dataclasses import dataclass
-from typing import Optional
+import hashlib
+import json
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
 
+import pandas as pd
 
-@dataclass
+
+@dataclass(slots=True)
 class JobListData:
     """求人一覧ページのデータを格納するデータクラス"""
 
     job_title: str
-    listing_start_date: str
+    listing_start_date: datetime
     detail_link: str
 
 
-@dataclass
+@dataclass(slots=True)
 class JobBasicData:
     """求人詳細ページの基本情報を格納するデータクラス"""
 
@@ -22,7 +27,7 @@ class JobBasicData:
     industry: str
 
 
-@dataclass
+@dataclass(slots=True)
 class JobTableData:
     """求人詳細ページのテーブルデータを格納するデータクラス"""
 
@@ -36,3 +41,77 @@ class JobTableData:
     number_of_recruitment_interviews: Optional[str] = None
     number_of_days_worked: Optional[str] = None
     number_of_applicants: Optional[str] = None
+
+
+@dataclass(slots=True)
+class JobDetailData:
+    """求人詳細ページのデータ（基本情報とテーブルデータ）を格納するデータクラス"""
+
+    basic: JobBasicData
+    table: JobTableData
+
+
+@dataclass(slots=True)
+class JobRecord:
+    """詳細ページと一覧ページのデータを結合した求人1件分のレコード"""
+
+    detail: JobDetailData
+    listing: JobListData
+
+
+# 出力するDataFrameの列（基本情報, テーブルデータ, 一覧ページのデータ, 内容のハッシュの順）
+_BASIC_COLUMNS = [field.name for field in fields(JobBasicData)]
+_TABLE_COLUMNS = [field.name for field in fields(JobTableData)]
+_LIST_COLUMNS = [field.name for field in fields(JobListData)]
+# 求人の内容のハッシュ（ローダーのMERGEで、内容が変わった求人のみを更新するために使う）
+# 以前の出力ファイルにはない列のため、CSVで不足しても読み込めるよう最後の列とする
+CONTENT_HASH_COLUMN = "content_hash"
+JOB_COLUMNS = _BASIC_COLUMNS + _TABLE_COLUMNS + _LIST_COLUMNS + [CONTENT_HASH_COLUMN]
+# 列ごとのBigQueryの型（Parquetで出力する場合に使う。その他の列はSTRING）
+JOB_COLUMN_TYPES = {
+    column: {"monthly_salary": "INTEGER", "listing_start_date": "DATE"}.get(
+        column, "STRING"
+    )
+    for column in JOB_COLUMNS
+}
+
+
+def _hash_value(value: Any) -> Any:
+    # 掲載開始日は日付のみを使う（時刻や出力形式の違いでハッシュが変わらないように）
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    return value
+
+
+def compute_content_hash(record: JobRecord) -> str:
+    """求人の内容（detail_link 以外の列）のハッシュ（SHA-256の16進数）
+
+    列の順序と値のみから計算するため、同じ内容であれば実行や出力形式によらず同じ値になる。
+    """
+    values = [
+        _hash_value(getattr(part, name))
+        for part, names in (
+            (record.detail.basic, _BASIC_COLUMNS),
+            (record.detail.table, _TABLE_COLUMNS),
+            (record.listing, _LIST_COLUMNS),
+        )
+        for name in names
+        if name != "detail_link"
+    ]
+    payload = json.dumps(values, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def build_job_dataframe(records: Sequence[JobRecord]) -> pd.DataFrame:
+    """レコードの列ごとにリストへ詰めてから、DataFrameを1度だけ作成"""
+    columns: Dict[str, List[Any]] = {column: [] for column in JOB_COLUMNS}
+    for record in records:
+        for part, names in (
+            (record.detail.basic, _BASIC_COLUMNS),
+            (record.detail.table, _TABLE_COLUMNS),
+            (record.listing, _LIST_COLUMNS),
+        ):
+            for name in names:
+                columns[name].append(getattr(part, name))
+        columns[CONTENT_HASH_COLUMN].append(compute_content_hash(record))
+    return pd.DataFrame(columns)
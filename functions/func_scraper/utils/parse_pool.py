@@ -0,0 +1,164 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing.context import BaseContext
+from typing import Any, Callable, List, Optional, TypeVar
+
+import requests
+from shared.logger_config import setup_logger
+from utils.models import JobDetailData, JobListData
+from utils.parser_backends import get_parser_backend
+from utils.parsers import JobDataParser
+
+T = TypeVar("T")
+
+# パースがC側で行われ、GILを解放する実装
+# 取得したスレッドでそのままパースしても他のスレッドの取得を妨げないため、ワーカーは使わない
+NATIVE_BACKENDS = ("lxml", "selectolax")
+
+# ワーカープロセスごとのパーサー（_init_worker で作成）
+_worker_parser: Optional[JobDataParser] = None
+
+
+def available_cpu_count() -> int:
+    """このインスタンスで使えるvCPU数を取得"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def resolve_parse_workers(value: Optional[str]) -> int:
+    """パースのワーカー数の設定値を解釈（"auto" はvCPU数、未設定は0）"""
+    if not value:
+        return 0
+    if value == "auto":
+        return available_cpu_count()
+    return int(value)
+
+
+def uses_parse_pool(backend: str, workers: int) -> bool:
+    """パースをワーカープロセスで行うか（bs4などGILを解放しない実装の場合のみ）"""
+    return workers > 0 and get_parser_backend(backend).name not in NATIVE_BACKENDS
+
+
+def process_pool_context() -> BaseContext:
+    """ワーカープロセスの起動方法
+
+    ログのキューのリスナーなどのスレッドが動いているプロセスを fork すると、
+    ロックを保持したままの状態が子プロセスへ複製されて停止することがあるため、
+    forkserver（使えない環境では spawn）で起動する。
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context(
+        "forkserver" if "forkserver" in methods else "spawn"
+    )
+
+
+def _init_worker(backend: str) -> None:
+    global _worker_parser
+    _worker_parser = JobDataParser(backend)
+
+
+def _parse_list_page(content: bytes) -> List[JobListData]:
+    assert _worker_parser is not None
+    return _worker_parser.parse_list_page(RawResponse(content))
+
+
+def _parse_detail_page(content: bytes) -> JobDetailData:
+    assert _worker_parser is not None
+    return _worker_parser.parse_detail_page(RawResponse(content))
+
+
+def _warm_up() -> None:
+    pass
+
+
+class RawResponse:
+    """取得済みの本文をパーサーへ渡すための入れ物（ワーカーや再パースで使う）"""
+
+    def __init__(self, content: bytes):
+        self.content = content
+
+
+class ParsePool:
+    """取得したHTMLのパースをワーカープロセスで行うパーサー
+
+    JobDataParser と同じメソッドを持ち、スクレイパーのパーサーとして置き換えられる。
+    GILを解放しないbs4のパースを取得と並行して行うために使う（uses_parse_pool）。
+    submit_* はパースの完了を待たずに Future を返すため、呼び出し側は
+    パースの間に次のページを取得できる。
+
+    ワーカーへ渡す前の本文は max_pending 件までに制限し、
+    超えた場合は取得側を待たせることでメモリ使用量を抑える。
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        backend: str = "auto",
+        max_pending: Optional[int] = None,
+    ):
+        """
+        Args:
+            workers (int): パースのワーカー数
+            backend (str): HTMLの解析に使う実装（auto, selectolax, lxml, bs4）
+            max_pending (Optional[int]): パース待ちにできる本文の上限（省略時はワーカー数の2倍）
+        """
+        if workers < 1:
+            raise ValueError("workers must be 1 or greater")
+        self.logger = setup_logger("parse_pool")
+        self.backend = get_parser_backend(backend).name
+        self.workers = workers
+        self.max_pending = max_pending or workers * 2
+        self._pending = threading.BoundedSemaphore(self.max_pending)
+
+        self._parse_list: Callable[[bytes], List[JobListData]] = _parse_list_page
+        self._parse_detail: Callable[[bytes], JobDetailData] = _parse_detail_page
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=process_pool_context(),
+            initializer=_init_worker,
+            initargs=(self.backend,),
+        )
+        # 取得を始める前にワーカープロセスを起動しておく
+        self._executor.submit(_warm_up).result()
+        self.logger.info(
+            f"Started parse pool: {workers} processes, "
+            f"backend: {self.backend}, max pending: {self.max_pending}"
+        )
+
+    def parse_list_page(self, html_content: requests.Response) -> List[JobListData]:
+        """一覧ページのパース（完了を待つ）"""
+        return self._submit(self._parse_list, html_content.content).result()
+
+    def parse_detail_page(self, html_content: requests.Response) -> JobDetailData:
+        """詳細ページのパース（完了を待つ）"""
+        return self._submit(self._parse_detail, html_content.content).result()
+
+    def submit_detail_page(
+        self, html_content: requests.Response
+    ) -> "Future[JobDetailData]":
+        """詳細ページのパースをワーカーへ渡す（完了を待たない）"""
+        return self._submit(self._parse_detail, html_content.content)
+
+    def close(self) -> None:
+        # 途中で失敗した場合に、結果を受け取らないパースを待たずに終了する
+        self._executor.shutdown(cancel_futures=True)
+
+    def __enter__(self) -> "ParsePool":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def _submit(self, parse: Callable[[bytes], T], content: bytes) -> "Future[T]":
+        # 上限に達している場合は、ワーカーの空きが出るまで取得側を待たせる
+        self._pending.acquire()
+        try:
+            future = self._executor.submit(parse, content)
+        except Exception:
+            self._pending.release()
+            raise
+        future.add_done_callback(lambda _: self._pending.release())
+        return future
@@ -0,0 +1,271 @@
+import importlib.util
+from typing import Any, Callable, Dict, Iterable, List, Protocol, Tuple, Union
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+HtmlContent = Union[str, bytes]
+
+# 一覧ページの要素（求人タイトル, 掲載開始日, 詳細ページのURL）
+ListPageElements = Tuple[List[str], List[str], List[str]]
+# 詳細ページの要素（基本情報のリスト, テーブルの(見出し, 値)のリスト）
+DetailPageElements = Tuple[List[str], List[Tuple[str, str]]]
+
+# "auto" の場合に優先する順序（高速なものから）
+AUTO_BACKEND_ORDER = ("selectolax", "lxml", "bs4")
+
+
+class ParserBackend(Protocol):
+    """HTMLから求人の要素のテキストを抽出するパーサーの実装
+
+    どの実装も前後の空白を除いた同じテキストを返し、
+    データクラスへの変換は JobDataParser が共通で行う。
+    """
+
+    name: str
+
+    def extract_list_page(self, content: HtmlContent) -> ListPageElements: ...
+
+    def extract_detail_page(self, content: HtmlContent) -> DetailPageElements: ...
+
+
+# BeautifulSoup が空白とみなす文字
+_ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+
+
+def _to_text(content: HtmlContent) -> str:
+    if isinstance(content, bytes):
+        return content.decode("utf-8", errors="replace")
+    return content
+
+
+def _join_strings(strings: Iterable[str]) -> str:
+    """テキストノードを連結して前後の空白を除く
+
+    BeautifulSoup と同じ結果にするため、空白だけのテキストノードは
+    改行を含めば改行1文字、含まなければ空白1文字にまとめる。
+    """
+    return "".join(
+        string if string.strip(_ASCII_SPACES) else ("\n" if "\n" in string else " ")
+        for string in strings
+        if string
+    ).strip()
+
+
+def _has_any_class(attrs: Dict[str, Any], class_names: Tuple[str, ...]) -> bool:
+    # パース中の属性値は空白区切りの文字列のため、分割してから比較する
+    classes = attrs.get("class") or ""
+    if isinstance(classes, str):
+        classes = classes.split()
+    return any(class_name in classes for class_name in class_names)
+
+
+# 一覧ページで必要な要素（この要素と子孫だけを木に残す）
+LIST_PAGE_STRAINER = SoupStrainer(
+    lambda name, attrs: _has_any_class(
+        attrs, ("job-Title", "time-Stamp", "detail-Btn02")
+    )
+)
+# 詳細ページで必要な要素（基本情報のボックスとテーブル）
+DETAIL_PAGE_STRAINER = SoupStrainer(
+    lambda name, attrs: name == "table" or _has_any_class(attrs, ("job-Box",))
+)
+
+
+class Bs4Backend:
+    """BeautifulSoup（html.parser）による実装。追加の依存がないためフォールバックに使う
+
+    restricted の場合は SoupStrainer で必要な要素の部分木だけを構築する。
+    ナビゲーションやスクリプトのTagオブジェクトを作らないため、
+    ページあたりのパース時間とメモリが減る。抽出結果は変わらない。
+    """
+
+    name = "bs4"
+
+    def __init__(self, restricted: bool = True) -> None:
+        """
+        Args:
+            restricted (bool): 必要な要素の部分木だけを構築するか
+        """
+        self.restricted = restricted
+
+    def _soup(self, content: HtmlContent, strainer: SoupStrainer) -> BeautifulSoup:
+        # from_encoding は bytes の場合のみ有効（str に指定すると警告が出る）
+        return BeautifulSoup(
+            content,
+            "html.parser",
+            from_encoding="utf-8" if isinstance(content, bytes) else None,
+            parse_only=strainer if self.restricted else None,
+        )
+
+    def extract_list_page(self, content: HtmlContent) -> ListPageElements:
+        soup = self._soup(content, LIST_PAGE_STRAINER)
+        return (
+            [element.text.strip() for element in soup.find_all(class_="job-Title")],
+            [element.text.strip() for element in soup.find_all(class_="time-Stamp")],
+            [
+                li_element.find("a")["href"]
+                for li_element in soup.find_all(class_="detail-Btn02")
+            ],
+        )
+
+    def extract_detail_page(self, content: HtmlContent) -> DetailPageElements:
+        soup = self._soup(content, DETAIL_PAGE_STRAINER)
+        basic_elements = [
+            li_element.text.strip()
+            for li_element in soup.find(class_="job-Box").find("ul").find_all("li")
+        ]
+        table_rows = [
+            (row.find("th").text.strip(), row.find("td").text.strip())
+            for row in soup.find("table").find_all("tr")
+        ]
+        return basic_elements, table_rows
+
+
+class LxmlBackend:
+    """lxml（libxml2）による実装
+
+    木はC側で構築され、Pythonのオブジェクトになるのは検索で見つけた要素だけの
+    ため、bs4のような部分木への制限は行わない。
+    """
+
+    name = "lxml"
+
+    def __init__(self) -> None:
+        import lxml.html  # type: ignore
+
+        self._html = lxml.html
+
+    def extract_list_page(self, content: HtmlContent) -> ListPageElements:
+        root = self._parse(content)
+        return (
+            [self._text(element) for element in self._by_class(root, "job-Title")],
+            [self._text(element) for element in self._by_class(root, "time-Stamp")],
+            [
+                self._require(li_element.find(".//a"), "a").attrib["href"]
+                for li_element in self._by_class(root, "detail-Btn02")
+            ],
+        )
+
+    def extract_detail_page(self, content: HtmlContent) -> DetailPageElements:
+        root = self._parse(content)
+        job_box = self._require(
+            next(iter(self._by_class(root, "job-Box")), None), "job-Box"
+        )
+        ul = self._require(job_box.find(".//ul"), "ul")
+        basic_elements = [self._text(li) for li in ul.iterfind(".//li")]
+        table = self._require(root.find(".//table"), "table")
+        table_rows = [
+            (
+                self._text(self._require(row.find(".//th"), "th")),
+                self._text(self._require(row.find(".//td"), "td")),
+            )
+            for row in table.iterfind(".//tr")
+        ]
+        return basic_elements, table_rows
+
+    def _parse(self, content: HtmlContent) -> Any:
+        text = _to_text(content)
+        # 空のドキュメントはlxmlではエラーになるため、要素のないHTMLとして扱う
+        return self._html.document_fromstring(text if text.strip() else "<html/>")
+
+    @staticmethod
+    def _text(element: Any) -> str:
+        return _join_strings(element.itertext())
+
+    @staticmethod
+    def _by_class(root: Any, class_name: str) -> List[Any]:
+        return root.xpath(
+            "//*[contains(concat(' ', normalize-space(@class), ' '), $name)]",
+            name=f" {class_name} ",
+        )
+
+    @staticmethod
+    def _require(element: Any, label: str) -> Any:
+        if element is None:
+            raise ValueError(f"Element not found: {label}")
+        return element
+
+
+class SelectolaxBackend:
+    """selectolax（Lexbor）による実装。最も高速
+
+    lxmlと同様に木はC側で構築されるため、部分木への制限は行わない。
+    """
+
+    name = "selectolax"
+
+    def __init__(self) -> None:
+        from selectolax.lexbor import LexborHTMLParser  # type: ignore
+
+        self._parser_class = LexborHTMLParser
+
+    def extract_list_page(self, content: HtmlContent) -> ListPageElements:
+        tree = self._parser_class(_to_text(content))
+        return (
+            [self._text(node) for node in tree.css(".job-Title")],
+            [self._text(node) for node in tree.css(".time-Stamp")],
+            [
+                self._require(li_node.css_first("a"), "a").attributes["href"]
+                for li_node in tree.css(".detail-Btn02")
+            ],
+        )
+
+    def extract_detail_page(self, content: HtmlContent) -> DetailPageElements:
+        tree = self._parser_class(_to_text(content))
+        job_box = self._require(tree.css_first(".job-Box"), "job-Box")
+        ul = self._require(job_box.css_first("ul"), "ul")
+        basic_elements = [self._text(li) for li in ul.css("li")]
+        table = self._require(tree.css_first("table"), "table")
+        table_rows = [
+            (
+                self._text(self._require(row.css_first("th"), "th")),
+                self._text(self._require(row.css_first("td"), "td")),
+            )
+            for row in table.css("tr")
+        ]
+        return basic_elements, table_rows
+
+    @staticmethod
+    def _text(node: Any) -> str:
+        return _join_strings(
+            child.text_content
+            for child in node.traverse(include_text=True)
+            if child.tag == "-text"
+        )
+
+    @staticmethod
+    def _require(node: Any, label: str) -> Any:
+        if node is None:
+            raise ValueError(f"Element not found: {label}")
+        return node
+
+
+# 実装の名前はそれぞれが依存するモジュール名と同じ
+_BACKENDS: Dict[str, Callable[[], ParserBackend]] = {
+    "bs4": Bs4Backend,
+    "lxml": LxmlBackend,
+    "selectolax": SelectolaxBackend,
+}
+
+
+def available_backends() -> List[str]:
+    """インストール済みのパーサーの名前を優先順に取得"""
+    return [
+        name
+        for name in AUTO_BACKEND_ORDER
+        if importlib.util.find_spec(name) is not None
+    ]
+
+
+def get_parser_backend(name: str = "auto") -> ParserBackend:
+    """名前からパーサーの実装を取得
+
+    "auto" の場合はインストール済みの最も高速な実装を使う。
+    """
+    if name == "auto":
+        name = available_backends()[0]
+    if name not in _BACKENDS:
+        raise ValueError(
+            f"Unknown parser backend: {name} (choose from auto, {', '.join(_BACKENDS)})"
+        )
+    return _BACKENDS[name]()
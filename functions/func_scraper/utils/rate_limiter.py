@@ -0,0 +1,201 @@
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Deque, Dict, List, Optional
+from urllib.parse import urlparse
+
+# レート制限・過負荷を示すステータスコード
+BACKOFF_STATUS_CODES = (429, 503)
+
+
+@dataclass
+class HostState:
+    """ホストごとのトークンバケットの状態"""
+
+    rate: float
+    # 次のトークンが補充される理論上の時刻（GCRAによるトークンバケットの表現）
+    theoretical_arrival: float = 0.0
+    last_request_at: float = float("-inf")
+    blocked_until: float = 0.0
+    crawl_delay: float = 0.0
+    latency_ewma: Optional[float] = None
+    last_backoff_at: float = float("-inf")
+    backoff_count: int = 0
+    request_count: int = 0
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-Afterヘッダー（秒数またはHTTP日付）を待機秒数に変換"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RateLimiter:
+    """ホストごとのトークンバケットによるリクエスト頻度の制御
+
+    AIMDでレートを調整する。高速な2xxが続く間は加算的にレートを上げ、
+    429/503やレイテンシの悪化を検知したら乗算的に下げる。
+    Retry-Afterとrobots.txtのCrawl-delayも尊重する。
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float,
+        initial_rate: Optional[float] = None,
+        min_rate: float = 0.05,
+        burst: int = 1,
+        increase_step: Optional[float] = None,
+        decrease_factor: float = 0.5,
+        latency_factor: float = 2.0,
+        backoff_cooldown: float = 5.0,
+    ):
+        """
+        Args:
+            requests_per_second (float): ホストごとのリクエスト頻度の上限
+            initial_rate (Optional[float]): 開始時のリクエスト頻度（省略時は上限）
+            min_rate (float): バックオフ時の下限
+            burst (int): バケットの容量（連続して送信できるリクエスト数）
+            increase_step (Optional[float]): 成功時に加算するレート（省略時は上限の10%）
+            decrease_factor (float): バックオフ時にレートへ乗じる係数
+            latency_factor (float): 平均の何倍のレイテンシを悪化とみなすか
+            backoff_cooldown (float): レイテンシ悪化による連続バックオフを抑える秒数
+        """
+        if requests_per_second <= 0:
+            raise ValueError("requests_per_second must be greater than 0")
+        if burst < 1:
+            raise ValueError("burst must be 1 or greater")
+        self.max_rate = requests_per_second
+        self.initial_rate = min(initial_rate or requests_per_second, self.max_rate)
+        self.min_rate = min(min_rate, self.max_rate)
+        self.burst = burst
+        self.increase_step = increase_step or requests_per_second * 0.1
+        self.decrease_factor = decrease_factor
+        self.latency_factor = latency_factor
+        self.backoff_cooldown = backoff_cooldown
+
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, HostState] = {}
+        self._backoff_events: Deque[Dict[str, Any]] = deque(maxlen=100)
+
+    def acquire(self, url: str = "") -> None:
+        """対象ホストへの次のリクエストが許可されるまで待機"""
+        host = self._get_host(url)
+        with self._lock:
+            state = self._get_state(host)
+            now = time.monotonic()
+            interval = 1.0 / state.rate
+            tolerance = (self.burst - 1) * interval
+            allowed_at = max(
+                now,
+                state.theoretical_arrival - tolerance,
+                state.blocked_until,
+                state.last_request_at + state.crawl_delay,
+            )
+            state.theoretical_arrival = (
+                max(state.theoretical_arrival, allowed_at) + interval
+            )
+            state.last_request_at = allowed_at
+            state.request_count += 1
+            wait_time = allowed_at - now
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+    def record_response(
+        self,
+        url: str,
+        status_code: int,
+        latency: float,
+        retry_after: Optional[str] = None,
+    ) -> None:
+        """レスポンスの結果からレートを調整"""
+        host = self._get_host(url)
+        with self._lock:
+            state = self._get_state(host)
+            now = time.monotonic()
+            if status_code in BACKOFF_STATUS_CODES:
+                self._back_off(host, state, now, f"status {status_code}")
+                delay = parse_retry_after(retry_after)
+                if delay is not None:
+                    state.blocked_until = max(state.blocked_until, now + delay)
+            elif 200 <= status_code < 300 or status_code == 304:
+                if (
+                    state.latency_ewma is not None
+                    and latency > state.latency_ewma * self.latency_factor
+                ):
+                    if now - state.last_backoff_at >= self.backoff_cooldown:
+                        self._back_off(host, state, now, "latency")
+                else:
+                    state.rate = min(
+                        self._max_rate_for(state), state.rate + self.increase_step
+                    )
+                state.latency_ewma = (
+                    latency
+                    if state.latency_ewma is None
+                    else 0.8 * state.latency_ewma + 0.2 * latency
+                )
+
+    def set_crawl_delay(self, url: str, crawl_delay: float) -> None:
+        """robots.txtのCrawl-delayを設定"""
+        host = self._get_host(url)
+        with self._lock:
+            state = self._get_state(host)
+            state.crawl_delay = crawl_delay
+            state.rate = min(state.rate, self._max_rate_for(state))
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """現在のレートとバックオフ履歴を取得"""
+        with self._lock:
+            hosts = {
+                host: {
+                    "rate": round(state.rate, 4),
+                    "crawl_delay": state.crawl_delay,
+                    "latency_ewma": state.latency_ewma,
+                    "request_count": state.request_count,
+                    "backoff_count": state.backoff_count,
+                }
+                for host, state in self._hosts.items()
+            }
+            events: List[Dict[str, Any]] = list(self._backoff_events)
+        return {"hosts": hosts, "backoff_events": events}
+
+    def _back_off(self, host: str, state: HostState, now: float, reason: str) -> None:
+        """レートを乗算的に下げてイベントを記録"""
+        state.rate = max(self.min_rate, state.rate * self.decrease_factor)
+        state.last_backoff_at = now
+        state.backoff_count += 1
+        self._backoff_events.append(
+            {
+                "host": host,
+                "reason": reason,
+                "rate": round(state.rate, 4),
+                "at": datetime.now(timezone.utc).isoformat(),
+            }
+        )
+
+    def _max_rate_for(self, state: HostState) -> float:
+        """Crawl-delayを考慮したレートの上限"""
+        if state.crawl_delay > 0:
+            return min(self.max_rate, 1.0 / state.crawl_delay)
+        return self.max_rate
+
+    def _get_state(self, host: str) -> HostState:
+        if host not in self._hosts:
+            self._hosts[host] = HostState(rate=self.initial_rate)
+        return self._hosts[host]
+
+    @staticmethod
+    def _get_host(url: str) -> str:
+        return urlparse(url).netloc
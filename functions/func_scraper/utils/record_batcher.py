@@ -0,0 +1,58 @@
+import threading
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+from utils.models import JobRecord, build_job_dataframe
+
+
+class OrderedRecordBatcher:
+    """求人のレコードを一覧ページの順に並べ、batch_size 件ごとに書き出す
+
+    並行取得では詳細ページの取得が終わった順にレコードが届くため、
+    インデックスが連続する分だけを書き出して一覧ページの順序を保つ。
+    取得に失敗した求人は None を渡して読み飛ばす。
+    batch_size が None の場合は close 時にすべてのレコードを1度に書き出す。
+    """
+
+    def __init__(
+        self, write: Callable[[pd.DataFrame], None], batch_size: Optional[int] = None
+    ):
+        """
+        Args:
+            write (Callable[[pd.DataFrame], None]): レコードから作成したDataFrameの書き出し先
+            batch_size (Optional[int]): 1度に書き出すレコード数
+        """
+        self.write = write
+        self.batch_size = batch_size
+        self.row_count = 0
+        self._lock = threading.Lock()
+        self._waiting: Dict[int, Optional[JobRecord]] = {}
+        self._next_index = 0
+        self._batch: List[JobRecord] = []
+        self._written = False
+
+    def add(self, index: int, record: Optional[JobRecord]) -> None:
+        """index 番目の求人のレコードを追加（取得に失敗した場合は None）"""
+        with self._lock:
+            self._waiting[index] = record
+            while self._next_index in self._waiting:
+                ready = self._waiting.pop(self._next_index)
+                self._next_index += 1
+                if ready is not None:
+                    self._batch.append(ready)
+            # 順序待ちの分がまとめて揃った場合も batch_size 件ずつ書き出す
+            while self.batch_size is not None and len(self._batch) >= self.batch_size:
+                self._flush(self._batch[: self.batch_size])
+                self._batch = self._batch[self.batch_size :]
+
+    def close(self) -> None:
+        """残りのレコードを書き出す（1件もない場合もヘッダーのみのDataFrameを書き出す）"""
+        with self._lock:
+            if self._batch or not self._written:
+                self._flush(self._batch)
+                self._batch = []
+
+    def _flush(self, records: List[JobRecord]) -> None:
+        self.write(build_job_dataframe(records))
+        self.row_count += len(records)
+        self._written = True
@@ -1,62 +1,132 @@
 import time
+from concurrent.futures import Future
+from typing import Iterator, List, Optional, Union
 
 import pandas as pd
 from shared.logger_config import setup_logger
+from utils.html_archive import HtmlArchive
 from utils.http_client import HttpClient
+from utils.models import JobDetailData, JobListData
+from utils.parse_pool import ParsePool
 from utils.parsers import JobDataParser
 
 
+def wait_politely(
+    http_client: HttpClient, sleep_time: Optional[float], default: float
+) -> None:
+    """リクエスト間の待機
+
+    sleep_timeが未指定でHttpClientにRateLimiterが設定されている場合は、
+    RateLimiterが送信間隔を制御するため固定のスリープは行わない。
+    """
+    if sleep_time is None:
+        if getattr(http_client, "rate_limiter", None) is not None:
+            return
+        sleep_time = default
+    if sleep_time > 0:
+        time.sleep(sleep_time)
+
+
 class JobListScraper:
     """求人一覧ページのスクレイピング"""
 
-    def __init__(self, http_client: HttpClient, parser: JobDataParser):
+    def __init__(
+        self,
+        http_client: HttpClient,
+        parser: Union[JobDataParser, ParsePool],
+        archive: Optional[HtmlArchive] = None,
+    ):
         self.http_client = http_client
         self.parser = parser
+        self.archive = archive
         self.logger = setup_logger("job_list_scraper")
 
     def scrape_all_pages(
-        self, scrape_limit_date: pd.Timestamp, sleep_time: int = 5
-    ) -> pd.DataFrame:
+        self, scrape_limit_date: pd.Timestamp, sleep_time: Optional[float] = None
+    ) -> List[JobListData]:
         """すべての一覧ページをスクレイピング"""
-        job_df_list = []
-        for page_num in range(1, 100):
-            list_df = self.scrape_page(page_num)
+        return [
+            job
+            for jobs in self.iter_pages(scrape_limit_date, sleep_time)
+            for job in jobs
+        ]
+
+    def iter_pages(
+        self,
+        scrape_limit_date: pd.Timestamp,
+        sleep_time: Optional[float] = None,
+        start_page: int = 1,
+    ) -> Iterator[List[JobListData]]:
+        """一覧ページを1ページずつ取得し、制限日以降の求人を順に返す
+
+        最も古い求人が制限日より古いページを返した時点で終了するため、
+        呼び出し側が反復をやめれば以降のページは取得されない。
+        """
+        for page_num in range(start_page, 100):
+            jobs = self.scrape_page(page_num)
 
             # 求人が見つからない場合は終了
-            if len(list_df) == 0:
-                break
+            if len(jobs) == 0:
+                return
 
-            job_df_list.append(list_df)
             self.logger.info(f"Added data from page {page_num}")
+            yield [job for job in jobs if job.listing_start_date >= scrape_limit_date]
 
             # 最も古い求人が制限日より古い場合は終了
-            if list_df.listing_start_date.min() < scrape_limit_date:
+            if min(job.listing_start_date for job in jobs) < scrape_limit_date:
                 self.logger.info(f"Found old data on page {page_num}, stopping...")
-                break
-
-            time.sleep(sleep_time)
+                return
 
-        if not job_df_list:
-            return pd.DataFrame()
+            wait_politely(self.http_client, sleep_time, default=5)
 
-        return pd.concat(job_df_list).query("listing_start_date >= @scrape_limit_date")
-
-    def scrape_page(self, page_num: int) -> pd.DataFrame:
+    def scrape_page(self, page_num: int) -> List[JobListData]:
         """1ページ分の求人一覧を取得"""
-        response = self.http_client.get(f"/item/page/{page_num}/?sort=new")
+        path = f"/item/page/{page_num}/?sort=new"
+        response = self.http_client.get(path)
+        if self.archive is not None:
+            self.archive.store(path, "list", response.content)
         return self.parser.parse_list_page(response)
 
 
 class JobDetailScraper:
     """求人詳細ページのスクレイピング"""
 
-    def __init__(self, http_client: HttpClient, parser: JobDataParser):
+    def __init__(
+        self,
+        http_client: HttpClient,
+        parser: Union[JobDataParser, ParsePool],
+        archive: Optional[HtmlArchive] = None,
+    ):
         self.http_client = http_client
         self.parser = parser
+        self.archive = archive
 
-    def scrape_detail(self, url: str, sleep_time: int = 3) -> pd.DataFrame:
+    def scrape_detail(
+        self, url: str, sleep_time: Optional[float] = None
+    ) -> JobDetailData:
         """詳細ページの情報を取得"""
         response = self.http_client.get(url)
+        if self.archive is not None:
+            self.archive.store(url, "detail", response.content)
         result = self.parser.parse_detail_page(response)
-        time.sleep(sleep_time)  # 詳細ページ取得後のスリープ
+        wait_politely(self.http_client, sleep_time, default=3)  # 詳細ページ取得後の待機
         return result
+
+    def submit_detail(
+        self, url: str, sleep_time: Optional[float] = None
+    ) -> "Future[JobDetailData]":
+        """詳細ページを取得し、パースの完了を待たずに結果の Future を返す
+
+        JobDataParser ではその場でパースし、完了済みの Future を返す。
+        """
+        response = self.http_client.get(url)
+        if self.archive is not None:
+            self.archive.store(url, "detail", response.content)
+        future: "Future[JobDetailData]"
+        if isinstance(self.parser, JobDataParser):
+            future = Future()
+            future.set_result(self.parser.parse_detail_page(response))
+        else:
+            future = self.parser.submit_detail_page(response)
+        wait_politely(self.http_client, sleep_time, default=3)  # 詳細ページ取得後の待機
+        return future
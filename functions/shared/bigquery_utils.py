@@ -1,38 +1,58 @@
+from typing import Optional
+
 from google.cloud import bigquery
 
 from shared.logger_config import setup_logger
+from shared.metadata_cache import (
+    dataset_key,
+    fetch_or_none,
+    get_metadata_cache,
+    table_key,
+)
 
 logger = setup_logger("shared.bigquery_utils")
 
+# detail_link で結合するMERGEで読むブロックを減らすためのクラスタリング列
+CLUSTERING_FIELDS = ["detail_link"]
+
 
 def ensure_dataset_exists(client: bigquery.Client, dataset_ref: str) -> None:
-    """データセットの存在確認と作成"""
-    try:
-        client.get_dataset(dataset_ref)
+    """データセットの存在確認と作成（存在を確認した結果はメタデータのキャッシュに保持）"""
+    cache = get_metadata_cache()
+    key = dataset_key(dataset_ref)
+    if (
+        cache.get_or_fetch(key, fetch_or_none(client.get_dataset, dataset_ref))
+        is not None
+    ):
         logger.info(f"Dataset {dataset_ref} already exists")
-    except Exception:
-        dataset = bigquery.Dataset(dataset_ref)
-        dataset.location = "asia-northeast1"
-        dataset = client.create_dataset(dataset, exists_ok=True)
-        logger.info(f"Created dataset: {dataset_ref}")
+        return
+
+    dataset = bigquery.Dataset(dataset_ref)
+    dataset.location = "asia-northeast1"
+    dataset = client.create_dataset(dataset, exists_ok=True)
+    cache.put(key, dataset)
+    logger.info(f"Created dataset: {dataset_ref}")
 
 
 def ensure_table_exists(client: bigquery.Client, table_ref: str, schema: list) -> None:
-    """テーブルの存在確認と作成"""
-    try:
-        client.get_table(table_ref)
-        logger.info(f"Table {table_ref} already exists")
-    except Exception:
+    """テーブルの存在確認と作成（存在を確認した結果はメタデータのキャッシュに保持）"""
+    cache = get_metadata_cache()
+    key = table_key(table_ref)
+    existing_table = cache.get_or_fetch(key, fetch_or_none(client.get_table, table_ref))
+    if existing_table is None:
         table = bigquery.Table(table_ref, schema=schema)
 
         # パーティション設定
         table.time_partitioning = bigquery.TimePartitioning(
             type_=bigquery.TimePartitioningType.DAY, field="listing_start_date"
         )
+        # クラスタリング設定
+        table.clustering_fields = CLUSTERING_FIELDS
 
         # テーブルを作成
         table = client.create_table(table, exists_ok=True)
-        logger.info(f"Created partitioned table: {table_ref}")
+        cache.put(key, table)
+        logger.info(f"Created partitioned and clustered table: {table_ref}")
 
         # Primary Key制約を追加
         ddl_statement = f"""
@@ -44,3 +64,77 @@ def ensure_table_exists(client: bigquery.Client, table_ref: str, schema: list) -
             logger.info("Primary key constraint added on: detail_link")
         except Exception as e:
             logger.warning(f"Failed to add primary key constraint: {str(e)}")
+        return
+
+    logger.info(f"Table {table_ref} already exists")
+    try:
+        updated_table = ensure_table_columns(client, existing_table, schema)
+    except Exception as e:
+        cache.invalidate(key)
+        raise RuntimeError(f"Failed to add columns to {table_ref}: {str(e)}") from e
+    if updated_table is not None:
+        # 以降の更新で古いetagを送らないよう、更新後のテーブルの情報に置き換える
+        existing_table = updated_table
+        cache.put(key, updated_table)
+
+    # テーブル全体を書き直す移行はロード処理では行わない（migrate_clustering.py で行う）
+    if list(existing_table.clustering_fields or []) != CLUSTERING_FIELDS:
+        logger.warning(
+            f"Table {table_ref} is not clustered on {CLUSTERING_FIELDS}; "
+            "run `make migrate-clustering` to migrate it"
+        )
+
+
+def ensure_table_columns(
+    client: bigquery.Client, table: bigquery.Table, schema: list
+) -> Optional[bigquery.Table]:
+    """既存のテーブルにない列（スキーマに追加した列）を追加する
+
+    BigQueryで既存のテーブルに追加できるのはNULLを許容する列のみのため、
+    追加する列はNULLABLEで定義する。既存の行の値はNULLとなる。
+
+    Returns:
+        Optional[bigquery.Table]: 列を追加した場合は更新後のテーブル（追加しなかった場合はNone）
+    """
+    existing_names = {field.name for field in table.schema}
+    missing_fields = [field for field in schema if field.name not in existing_names]
+    if not missing_fields:
+        return None
+
+    table_ref = f"{table.project}.{table.dataset_id}.{table.table_id}"
+    table.schema = list(table.schema) + missing_fields
+    updated_table = client.update_table(table, ["schema"])
+    logger.info(
+        f"Added columns to {table_ref}: {[field.name for field in missing_fields]}"
+    )
+    return updated_table
+
+
+def ensure_table_clustering(client: bigquery.Client, table: bigquery.Table) -> bool:
+    """既存のテーブルを detail_link でクラスタ化する（クラスタ化済みの場合は何もしない）
+
+    クラスタリングの設定を更新した後に書き込まれたデータのみがクラスタ化されるため、
+    既存の行を同じ値で更新して書き直し、すべてのパーティションに適用する。
+    書き直しはテーブル全体を走査するため、ロード処理ではなく1度だけ手動で実行する
+    （func_loader/migrate_clustering.py）。
+
+    Returns:
+        bool: 移行した場合はTrue
+    """
+    if list(table.clustering_fields or []) == CLUSTERING_FIELDS:
+        return False
+
+    table_ref = f"{table.project}.{table.dataset_id}.{table.table_id}"
+    logger.info(f"Migrating {table_ref} to clustering on {CLUSTERING_FIELDS}")
+    table.clustering_fields = CLUSTERING_FIELDS
+    client.update_table(table, ["clustering_fields"])
+
+    rewrite_job = client.query(
+        f"update `{table_ref}` set detail_link = detail_link where true"
+    )
+    rewrite_job.result()
+    logger.info(
+        f"Reclustered {rewrite_job.num_dml_affected_rows} rows in {table_ref} "
+        f"({rewrite_job.total_bytes_processed} bytes processed)"
+    )
+    return True
@@ -0,0 +1,154 @@
+import io
+from typing import Any, Dict, Iterator, List, Sequence
+
+from .gcs_utils import to_arrow_schema
+from .logger_config import setup_logger
+from .telemetry import traced
+
+logger = setup_logger("shared.bigquery_write")
+
+# 1回の追加リクエストで送る行数（リクエストの上限10MBに収まるようにする）
+APPEND_BATCH_ROWS = 1000
+
+
+def read_source_table(
+    data: bytes,
+    file_name: str,
+    column_types: Dict[str, str],
+    required: Sequence[str] = (),
+) -> Any:
+    """スクレイパーの出力ファイル（ParquetまたはCSV）を型付きのArrowテーブルとして読み込む
+
+    Args:
+        data (bytes): ファイルの内容
+        file_name (str): ファイル名（拡張子から形式を判定）
+        column_types (Dict[str, str]): 列名とBigQueryの型名（列の順序もこれに合わせる）
+        required (Sequence[str]): NULLを許容しない（REQUIREDの）列名
+
+    後から追加した列（NULLを許容する列）がない以前のファイルは、その列をNULLとして読み込む。
+    """
+    import pyarrow as pa  # type: ignore
+
+    schema = to_arrow_schema(column_types, required)
+    if file_name.endswith(".parquet"):
+        import pyarrow.parquet as pq  # type: ignore
+
+        table = pq.read_table(pa.BufferReader(data))
+    else:
+        import pyarrow.csv as pa_csv  # type: ignore
+
+        # ロードジョブのCSVの設定（改行を含む値、空の値はNULL）に合わせる
+        table = pa_csv.read_csv(
+            io.BytesIO(data),
+            parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+            convert_options=pa_csv.ConvertOptions(
+                column_types=schema, strings_can_be_null=True
+            ),
+        )
+
+    for field in schema:
+        if field.name not in table.column_names and field.nullable:
+            table = table.append_column(field, pa.nulls(table.num_rows, field.type))
+    return table.select(schema.names).cast(schema)
+
+
+class BigQueryStorageWriter:
+    """Storage Write APIの保留（PENDING）モードのストリームでテーブルへ行を書き込む
+
+    すべての行を追加してからストリームを確定してコミットするため、
+    途中で失敗した場合はテーブルに1行も書き込まれない（コミットされない
+    ストリームはBigQuery側で破棄される）。
+    """
+
+    def __init__(self, write_client: Any, batch_rows: int = APPEND_BATCH_ROWS):
+        """
+        Args:
+            write_client (Any): BigQueryWriteClient（テストではフェイク）
+            batch_rows (int): 1回の追加リクエストで送る行数
+        """
+        if batch_rows < 1:
+            raise ValueError("batch_rows must be 1 or greater")
+        self.write_client = write_client
+        self.batch_rows = batch_rows
+
+    def write(self, table_ref: str, table: Any) -> int:
+        """Arrowテーブルの行を書き込んでコミットし、書き込んだ行数を返す
+
+        Args:
+            table_ref (str): 書き込み先のテーブル（project.dataset.table）
+            table (pyarrow.Table): 書き込む行（テーブルのスキーマに合わせた型）
+        """
+        from google.cloud.bigquery_storage_v1 import types  # type: ignore
+
+        project_id, dataset_id, table_id = table_ref.split(".")
+        parent = f"projects/{project_id}/datasets/{dataset_id}/tables/{table_id}"
+
+        with traced(
+            "bigquery.storage_write", table=table_ref, row_count=table.num_rows
+        ) as span:
+            stream = self.write_client.create_write_stream(
+                parent=parent,
+                write_stream=types.WriteStream(type_=types.WriteStream.Type.PENDING),
+            )
+            span.set_attribute("write_stream", stream.name)
+
+            if table.num_rows:
+                responses = self.write_client.append_rows(
+                    self._append_requests(types, stream.name, table),
+                    # ストリームごとのルーティングに必要なヘッダー
+                    metadata=(
+                        ("x-goog-request-params", f"write_stream={stream.name}"),
+                    ),
+                )
+                for response in responses:
+                    self._raise_for_append_error(response)
+
+            finalized = self.write_client.finalize_write_stream(name=stream.name)
+            commit = self.write_client.batch_commit_write_streams(
+                types.BatchCommitWriteStreamsRequest(
+                    parent=parent, write_streams=[stream.name]
+                )
+            )
+            if commit.stream_errors:
+                raise RuntimeError(
+                    f"Failed to commit write stream {stream.name}: "
+                    f"{[error.error_message for error in commit.stream_errors]}"
+                )
+            span.set_attribute("committed_rows", finalized.row_count)
+
+        logger.info(f"Committed {finalized.row_count} rows to {table_ref}")
+        return finalized.row_count
+
+    def _append_requests(
+        self, types: Any, stream_name: str, table: Any
+    ) -> Iterator[Any]:
+        """batch_rows 行ごとの追加リクエスト（最初のリクエストのみストリーム名とスキーマを含む）"""
+        offset = 0
+        for batch in table.to_batches(max_chunksize=self.batch_rows):
+            request = types.AppendRowsRequest(
+                # 再送された場合に同じ行が重複して書き込まれないよう、行の位置を指定する
+                offset=offset,
+                arrow_rows=types.AppendRowsRequest.ArrowData(
+                    rows=types.ArrowRecordBatch(
+                        serialized_record_batch=batch.serialize().to_pybytes(),
+                        row_count=batch.num_rows,
+                    )
+                ),
+            )
+            if offset == 0:
+                request.write_stream = stream_name
+                request.arrow_rows.writer_schema = types.ArrowSchema(
+                    serialized_schema=table.schema.serialize().to_pybytes()
+                )
+            offset += batch.num_rows
+            yield request
+
+    @staticmethod
+    def _raise_for_append_error(response: Any) -> None:
+        if response.error.code:
+            raise RuntimeError(f"Failed to append rows: {response.error.message}")
+        if response.row_errors:
+            errors: List[str] = [
+                f"row {error.index}: {error.message}" for error in response.row_errors
+            ]
+            raise RuntimeError(f"Rows were rejected: {errors}")
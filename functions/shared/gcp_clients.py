@@ -0,0 +1,132 @@
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from google.cloud import bigquery, storage  # type: ignore
+
+# クライアントの種類（set_client で差し替える際の名前）
+STORAGE = "storage"
+BIGQUERY = "bigquery"
+BIGQUERY_WRITE = "bigquery_write"
+
+# HTTPコネクションプールの大きさ（環境変数GCP_HTTP_POOL_SIZEで変更できる）
+DEFAULT_POOL_SIZE = 10
+_SCOPES = ("https://www.googleapis.com/auth/cloud-platform",)
+
+# プロセスで共有するクライアント（ウォームスタートした実行でも再利用する）
+_lock = threading.Lock()
+_clients: Dict[str, Any] = {}
+_pool_size: Optional[int] = None
+
+
+def get_pool_size() -> int:
+    """クライアントのHTTPコネクションプールの大きさを取得"""
+    if _pool_size is not None:
+        return _pool_size
+    return int(os.environ.get("GCP_HTTP_POOL_SIZE", DEFAULT_POOL_SIZE))
+
+
+def set_pool_size(pool_size: int) -> None:
+    """HTTPコネクションプールの大きさを設定（以降に作成するクライアントに適用）
+
+    並行してアップロード・ダウンロードするスレッド数より小さいと、
+    コネクションが破棄されて作り直されるため、スレッド数以上にする。
+    """
+    global _pool_size
+    if pool_size < 1:
+        raise ValueError("pool_size must be 1 or greater")
+    _pool_size = pool_size
+
+
+def _authorized_session() -> Tuple[Any, Any, Optional[str]]:
+    """認証情報とコネクションプールの大きさを設定したHTTPセッションを作成
+
+    Returns:
+        Tuple[Any, Any, Optional[str]]: セッション、認証情報、プロジェクトID
+    """
+    import google.auth
+    from google.auth.transport.requests import AuthorizedSession
+    from requests.adapters import HTTPAdapter
+
+    credentials, project = google.auth.default(scopes=_SCOPES)
+    session = AuthorizedSession(credentials)
+    pool_size = get_pool_size()
+    session.mount(
+        "https://", HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    )
+    return session, credentials, project
+
+
+def _create_storage_client() -> "storage.Client":
+    from google.cloud import storage  # type: ignore
+
+    session, credentials, project = _authorized_session()
+    return storage.Client(project=project, credentials=credentials, _http=session)
+
+
+def _create_bigquery_client() -> "bigquery.Client":
+    # google-cloud-bigquery は読み込みに時間がかかるため、必要になった時点で読み込む
+    from google.cloud import bigquery
+
+    session, credentials, project = _authorized_session()
+    return bigquery.Client(project=project, credentials=credentials, _http=session)
+
+
+def _create_bigquery_write_client() -> Any:
+    # Storage Write APIはローダーの設定で有効にした場合のみ使うため、ここで読み込む
+    from google.cloud import bigquery_storage_v1  # type: ignore
+
+    return bigquery_storage_v1.BigQueryWriteClient()
+
+
+_FACTORIES: Dict[str, Callable[[], Any]] = {
+    STORAGE: _create_storage_client,
+    BIGQUERY: _create_bigquery_client,
+    BIGQUERY_WRITE: _create_bigquery_write_client,
+}
+
+
+def _get_client(name: str) -> Any:
+    client = _clients.get(name)
+    if client is not None:
+        return client
+    with _lock:
+        # 複数のスレッドから同時に呼び出された場合も1つだけ作成する
+        client = _clients.get(name)
+        if client is None:
+            client = _FACTORIES[name]()
+            _clients[name] = client
+        return client
+
+
+def get_storage_client() -> "storage.Client":
+    """プロセスで共有するCloud Storageのクライアントを取得（初回の呼び出しで作成）"""
+    return _get_client(STORAGE)
+
+
+def get_bigquery_client() -> "bigquery.Client":
+    """プロセスで共有するBigQueryのクライアントを取得（初回の呼び出しで作成）"""
+    return _get_client(BIGQUERY)
+
+
+def get_bigquery_write_client() -> Any:
+    """プロセスで共有するBigQuery Storage Write APIのクライアントを取得
+
+    gRPCで通信するため、HTTPコネクションプールの設定は適用されない。
+    """
+    return _get_client(BIGQUERY_WRITE)
+
+
+def set_client(name: str, client: Any) -> None:
+    """クライアントを差し替える（テストでフェイクのクライアントを使う場合など）"""
+    if name not in _FACTORIES:
+        raise ValueError(f"Unknown client: {name}")
+    with _lock:
+        _clients[name] = client
+
+
+def reset_clients() -> None:
+    """作成・差し替えたクライアントを破棄（次の取得時に作り直す）"""
+    with _lock:
+        _clients.clear()
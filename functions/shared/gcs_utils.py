@@ -1,13 +1,32 @@
+import base64
 import os
+import uuid
 from datetime import datetime, timedelta, timezone
+from typing import IO, TYPE_CHECKING, Any, Dict, Optional, Sequence
 
-import pandas as pd
-from google.cloud import storage  # type: ignore
+import google_crc32c  # type: ignore
+from google.api_core.exceptions import NotFound
 
+from .gcp_clients import get_storage_client
 from .logger_config import setup_logger
+from .telemetry import traced
+
+if TYPE_CHECKING:
+    # 型注釈のみに使う（処理済みメッセージの確認だけで読み込まないようにする）
+    import pandas as pd
 
 logger = setup_logger("shared.gcs")
 
+# 書き込み中のオブジェクトを置くプレフィックス（ローダーのトリガー対象の raw/ の外）
+STAGING_PREFIX = "staging"
+# 再開可能なアップロードで1度に送信するサイズ（256KiBの倍数）
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+# 出力できるファイル形式
+OUTPUT_FORMATS = ("csv", "parquet")
+# 書き込んだ行数を記録するオブジェクトのメタデータのキー
+# （行のないファイルもヘッダーやスキーマを持つため、ローダーはサイズではなく行数で空と判定する）
+ROW_COUNT_METADATA = "row_count"
+
 
 def get_data_bucket_name() -> str:
     """スクレイピングデータ保存用のバケット名を生成"""
@@ -17,26 +36,284 @@ def get_data_bucket_name() -> str:
     return f"{project_id}-scraping-data"
 
 
-def save_to_gcs(df: pd.DataFrame, bucket_name: str, prefix: str = "raw/jobs") -> str:
-    """DataFrameをGCSにCSV形式で保存し、同じ日の古いファイルを削除"""
-    client = storage.Client()
-    bucket = client.bucket(bucket_name)
+def _get_partition_prefix(prefix: str, partition_date: Optional[str] = None) -> str:
+    """パーティションフォルダのパスを取得（日付の省略時は当日のJST）"""
+    if partition_date is None:
+        partition_date = datetime.now(tz=timezone(timedelta(hours=9))).strftime(
+            "%Y%m%d"
+        )
+    return f"{prefix}/partition_date={partition_date}/"
+
+
+class _ChecksumFile:
+    """書き込んだバイト列のcrc32cを計算しながらアップロード先へ渡すファイル"""
+
+    def __init__(self, file: IO[bytes]):
+        self._file = file
+        self.checksum = google_crc32c.Checksum()
+        self.size = 0
+        self.closed = False
+
+    def write(self, data: bytes) -> int:
+        self._file.write(data)
+        self.checksum.update(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.size
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        if not self.closed:
+            self._file.close()
+            self.closed = True
+
+
+class GcsStreamWriter:
+    """DataFrameの行をGCSへストリーミングで書き込む
+
+    行は再開可能なアップロードへ chunk_size ごとに送信されるため、
+    スクレイピング結果の全体をメモリに持たずに保存できる。
+    書き込み中は staging/ 以下の一時オブジェクトへアップロードし、commit で
+    crc32c を検証してから当日のパーティションのファイルと置き換える。
+    失敗した場合は既存のファイルは変更されない。
+    書き込んだ行数はオブジェクトのメタデータ（ROW_COUNT_METADATA）に記録する。
+
+    ファイル形式ごとの書き込みはサブクラスで実装する。
+    """
+
+    extension = ""
+    content_type = "application/octet-stream"
+
+    def __init__(
+        self,
+        bucket_name: str,
+        prefix: str = "raw/jobs",
+        chunk_size: int = UPLOAD_CHUNK_SIZE,
+        partition_date: Optional[str] = None,
+    ):
+        """
+        Args:
+            bucket_name (str): 保存先のバケット名
+            prefix (str): パーティションフォルダの親のパス
+            chunk_size (int): 1度に送信するサイズ（256KiBの倍数）
+            partition_date (Optional[str]): パーティションの日付（YYYYMMDD、省略時は当日）
+        """
+        self.bucket = get_storage_client().bucket(bucket_name)
+        self.partition_prefix = _get_partition_prefix(prefix, partition_date)
+        self.blob_name = f"{self.partition_prefix}jobs.{self.extension}"
+        self.staging_blob = self.bucket.blob(
+            f"{STAGING_PREFIX}/{self.blob_name}.{uuid.uuid4().hex}"
+        )
+        self.chunk_size = chunk_size
+        self.row_count = 0
+        self._file: Optional[_ChecksumFile] = None
+
+    def write_frame(self, df: "pd.DataFrame") -> None:
+        """DataFrameの行を追記"""
+        if self._file is None:
+            self._file = _ChecksumFile(
+                self.staging_blob.open(
+                    "wb", chunk_size=self.chunk_size, content_type=self.content_type
+                )
+            )
+        self._write(self._file, df)
+        self.row_count += len(df)
+
+    def commit(self) -> str:
+        """アップロードを完了し、検証後に当日のファイルと置き換える"""
+        if self._file is None:
+            raise ValueError("No data has been written")
+        with traced(
+            "gcs.commit", blob_name=self.blob_name, row_count=self.row_count
+        ) as span:
+            self._finish(self._file)
+            self._file.close()
+            span.set_attribute("bytes", self._file.size)
+            checksum = self._file.checksum
+            self._file = None
+
+            # 行数をメタデータに記録し（コピー先へ引き継がれる）、
+            # 応答で得た保存済みのデータのcrc32cを送信したデータと比較する
+            self.staging_blob.metadata = {ROW_COUNT_METADATA: str(self.row_count)}
+            self.staging_blob.patch()
+            expected = base64.b64encode(checksum.digest()).decode("utf-8")
+            if self.staging_blob.crc32c != expected:
+                self._delete_staging()
+                raise ValueError(
+                    f"crc32c mismatch for {self.staging_blob.name}: "
+                    f"expected {expected}, got {self.staging_blob.crc32c}"
+                )
+
+            # 同名のオブジェクトへのコピーは1回の操作で置き換わる
+            self.bucket.copy_blob(self.staging_blob, self.bucket, self.blob_name)
+            for blob in self.bucket.list_blobs(prefix=self.partition_prefix):
+                if blob.name != self.blob_name:
+                    blob.delete()
+                    logger.info(f"Deleted existing blob: {blob.name}")
+            self._delete_staging()
+
+            logger.info(
+                f"Saved {self.row_count} rows to: gs://{self.bucket.name}/{self.blob_name}"
+            )
+        return self.blob_name
+
+    def abort(self) -> None:
+        """書き込みを中止（当日のファイルは変更しない）"""
+        # 完了していない再開可能なアップロードはオブジェクトにならないため破棄するだけでよい
+        self._file = None
+        self._delete_staging()
+
+    def __enter__(self) -> "GcsStreamWriter":
+        return self
+
+    def __exit__(self, exc_type: Any, *args: Any) -> None:
+        if exc_type is not None:
+            self.abort()
+
+    def _write(self, file: _ChecksumFile, df: "pd.DataFrame") -> None:
+        raise NotImplementedError
+
+    def _finish(self, file: _ChecksumFile) -> None:
+        """アップロードを閉じる前にファイルの末尾を書き込む"""
+
+    def _delete_staging(self) -> None:
+        try:
+            self.staging_blob.delete()
+        except NotFound:
+            pass
+
+
+class GcsCsvStreamWriter(GcsStreamWriter):
+    """DataFrameの行をCSVとしてGCSへストリーミングで書き込む"""
+
+    extension = "csv"
+    content_type = "text/csv"
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._header_written = False
+
+    def _write(self, file: _ChecksumFile, df: "pd.DataFrame") -> None:
+        # 最初の書き込みのみヘッダーを含める
+        file.write(
+            df.to_csv(index=False, header=not self._header_written).encode("utf-8")
+        )
+        self._header_written = True
+
+
+class GcsParquetStreamWriter(GcsStreamWriter):
+    """DataFrameの行をParquetとしてGCSへストリーミングで書き込む
+
+    write_frame ごとに1つの行グループを書き込む。column_types を指定すると、
+    その型（BigQueryの型名: INTEGER, DATE, STRING など）で列を書き込むため、
+    ロード時に型の変換が不要になる。
+    """
+
+    extension = "parquet"
+    content_type = "application/vnd.apache.parquet"
+
+    def __init__(
+        self,
+        bucket_name: str,
+        prefix: str = "raw/jobs",
+        chunk_size: int = UPLOAD_CHUNK_SIZE,
+        partition_date: Optional[str] = None,
+        compression: str = "zstd",
+        column_types: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Args:
+            bucket_name (str): 保存先のバケット名
+            prefix (str): パーティションフォルダの親のパス
+            chunk_size (int): 1度に送信するサイズ（256KiBの倍数）
+            partition_date (Optional[str]): パーティションの日付（YYYYMMDD、省略時は当日）
+            compression (str): 圧縮方式（zstd, snappy など）
+            column_types (Optional[Dict[str, str]]): 列名とBigQueryの型名
+        """
+        # pyarrowはParquetで出力する場合のみ必要なため、ここで読み込む
+        import pyarrow.parquet as pq  # type: ignore
+
+        super().__init__(bucket_name, prefix, chunk_size, partition_date)
+        self._pq = pq
+        self.compression = compression
+        self.schema = to_arrow_schema(column_types) if column_types else None
+        self._writer: Any = None
+
+    def _write(self, file: _ChecksumFile, df: "pd.DataFrame") -> None:
+        table = to_arrow_table(df, self.schema)
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(
+                file,
+                table.schema,
+                compression=self.compression,
+                use_dictionary=True,
+            )
+        self._writer.write_table(table)
+
+    def _finish(self, file: _ChecksumFile) -> None:
+        # フッター（メタデータ）を書き込む
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def to_arrow_schema(column_types: Dict[str, str], required: Sequence[str] = ()) -> Any:
+    """BigQueryの型名からArrow（Parquet）のスキーマを作成
+
+    Args:
+        column_types (Dict[str, str]): 列名とBigQueryの型名
+        required (Sequence[str]): NULLを許容しない（REQUIREDの）列名
+    """
+    import pyarrow as pa  # type: ignore
+
+    arrow_types = {
+        "INTEGER": pa.int64(),
+        "FLOAT": pa.float64(),
+        "BOOLEAN": pa.bool_(),
+        "DATE": pa.date32(),
+        "TIMESTAMP": pa.timestamp("us"),
+        "STRING": pa.string(),
+    }
+    return pa.schema(
+        [
+            pa.field(name, arrow_types[bq_type], nullable=name not in required)
+            for name, bq_type in column_types.items()
+        ]
+    )
+
 
-    # 日付のみのパーティションフォルダを使用
-    partition_date = datetime.now(tz=timezone(timedelta(hours=9))).strftime("%Y%m%d")
-    blob_name = f"{prefix}/partition_date={partition_date}/jobs.csv"
+def to_arrow_table(df: "pd.DataFrame", schema: Any = None) -> Any:
+    """DataFrameをスキーマ（to_arrow_schema）の型のArrowのテーブルに変換"""
+    import pyarrow as pa  # type: ignore
 
-    # 保存前に同じ日の古いファイルを削除
-    prefix_path = f"{prefix}/partition_date={partition_date}/"
-    blobs = bucket.list_blobs(prefix=prefix_path)
-    for blob in blobs:
-        blob.delete()
-        logger.info(f"Deleted existing blob: {blob.name}")
+    if df.empty and schema is not None:
+        # 行のない列はpandasの型が定まらないため、スキーマから空のテーブルを作る
+        return schema.empty_table()
+    return pa.Table.from_pandas(df, schema=schema, preserve_index=False)
 
-    # データフレームを保存
-    blob = bucket.blob(blob_name)
-    with blob.open("w", encoding="utf-8") as f:
-        df.to_csv(f, index=False, encoding="utf-8")
-    logger.info(f"Saved DataFrame to: gs://{bucket_name}/{blob_name}")
 
-    return blob_name
+def create_stream_writer(
+    bucket_name: str,
+    output_format: str = "csv",
+    compression: str = "zstd",
+    column_types: Optional[Dict[str, str]] = None,
+    partition_date: Optional[str] = None,
+) -> GcsStreamWriter:
+    """出力形式に応じたストリーミングの書き込みを作成"""
+    if output_format == "csv":
+        return GcsCsvStreamWriter(bucket_name, partition_date=partition_date)
+    if output_format == "parquet":
+        return GcsParquetStreamWriter(
+            bucket_name,
+            partition_date=partition_date,
+            compression=compression,
+            column_types=column_types,
+        )
+    raise ValueError(
+        f"Unsupported output format: {output_format} "
+        f"(choose from {', '.join(OUTPUT_FORMATS)})"
+    )
@@ -0,0 +1,153 @@
+import hashlib
+import math
+import struct
+from typing import Iterable, Optional
+
+from google.api_core.exceptions import NotFound
+
+from .gcp_clients import get_storage_client
+from .logger_config import setup_logger
+
+logger = setup_logger("shared.listing_index")
+
+KNOWN_LISTINGS_BLOB = "index/known_listings.bloom"
+
+# マジックナンバー, ハッシュ関数の数, 登録件数, ビット数
+_HEADER = struct.Struct(">4sBQQ")
+_MAGIC = b"BLM1"
+
+
+class BloomFilter:
+    """固定サイズのビット配列によるBloomフィルタ
+
+    登録済みの要素は必ず含まれると判定され、未登録の要素は error_rate の確率で
+    誤って含まれると判定される。100万件・誤検出率0.1%で約1.8MB。
+    """
+
+    def __init__(
+        self, num_bits: int, num_hashes: int, bits: Optional[bytearray] = None
+    ):
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bits if bits is not None else bytearray((num_bits + 7) // 8)
+        self.count = 0
+
+    @classmethod
+    def with_capacity(cls, capacity: int, error_rate: float = 0.001) -> "BloomFilter":
+        """想定件数と誤検出率から最適なサイズで作成"""
+        capacity = max(capacity, 1)
+        num_bits = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        return cls(num_bits, num_hashes)
+
+    @property
+    def capacity(self) -> int:
+        """作成時の誤検出率を保てる件数（これを超えると誤検出率が上がる）"""
+        return int(self.num_bits * math.log(2) / self.num_hashes)
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: object) -> bool:
+        if not isinstance(item, str):
+            return False
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    def to_bytes(self) -> bytes:
+        header = _HEADER.pack(_MAGIC, self.num_hashes, self.count, self.num_bits)
+        return header + bytes(self.bits)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BloomFilter":
+        magic, num_hashes, count, num_bits = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("Invalid bloom filter data")
+        bloom = cls(num_bits, num_hashes, bytearray(data[_HEADER.size :]))
+        bloom.count = count
+        return bloom
+
+    def _positions(self, item: str) -> Iterable[int]:
+        # 1回のハッシュ計算から k 個の位置を求める（ダブルハッシュ法）
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+
+class KnownListingIndex:
+    """BigQueryへ取り込み済みの detail_link の索引
+
+    ローダーがマージ後に取り込んだ detail_link を追加してデータバケットへ保存し、
+    スクレイパーが起動時に読み込んで取得済みの詳細ページを判定する。
+
+    Bloomフィルタのため、未取り込みの求人も誤検出率（既定0.1%）で取り込み済みと
+    判定され、その詳細ページは取得されない。スクレイパーは掲載開始日が
+    SCRAPER_REFETCH_KNOWN_WITHIN_DAYS 日以内の求人を索引に関わらず取得するため、
+    新着の求人はこの誤検出で失われない。
+    """
+
+    def __init__(self, bloom: BloomFilter):
+        self.bloom = bloom
+
+    def __contains__(self, detail_link: object) -> bool:
+        return detail_link in self.bloom
+
+    def __len__(self) -> int:
+        return self.bloom.count
+
+    @property
+    def is_full(self) -> bool:
+        """登録件数が容量を超え、作り直しが必要か"""
+        return self.bloom.count > self.bloom.capacity
+
+    def add_all(self, detail_links: Iterable[str]) -> int:
+        """未登録の detail_link を追加し、追加した件数を返す"""
+        added = 0
+        for detail_link in detail_links:
+            if detail_link not in self.bloom:
+                self.bloom.add(detail_link)
+                added += 1
+        return added
+
+    @classmethod
+    def build(
+        cls, detail_links: Iterable[str], capacity: int, error_rate: float = 0.001
+    ) -> "KnownListingIndex":
+        """detail_link の一覧から索引を作成"""
+        bloom = BloomFilter.with_capacity(capacity, error_rate)
+        for detail_link in detail_links:
+            bloom.add(detail_link)
+        return cls(bloom)
+
+    @classmethod
+    def load(
+        cls, bucket_name: str, blob_name: str = KNOWN_LISTINGS_BLOB
+    ) -> Optional["KnownListingIndex"]:
+        """データバケットから索引を読み込む（存在しない場合はNone）"""
+        blob = get_storage_client().bucket(bucket_name).blob(blob_name)
+        try:
+            data = blob.download_as_bytes()
+        except NotFound:
+            logger.info(
+                f"Known listing index not found: gs://{bucket_name}/{blob_name}"
+            )
+            return None
+        index = cls(BloomFilter.from_bytes(data))
+        logger.info(f"Loaded known listing index with {len(index)} links")
+        return index
+
+    def save(self, bucket_name: str, blob_name: str = KNOWN_LISTINGS_BLOB) -> None:
+        """データバケットへ索引を保存"""
+        blob = get_storage_client().bucket(bucket_name).blob(blob_name)
+        blob.upload_from_string(
+            self.bloom.to_bytes(), content_type="application/octet-stream"
+        )
+        logger.info(
+            f"Saved known listing index with {len(self)} links to: "
+            f"gs://{bucket_name}/{blob_name}"
+        )
@@ -1,48 +1,207 @@
+import atexit
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, List, Optional, Tuple
 
-import google.cloud.logging
+# 出力するログレベル（環境変数LOG_LEVELで変更できる）
+DEFAULT_LOG_LEVEL = "INFO"
+# SAMPLED を付けたログを呼び出し箇所ごとに何件に1件出力するか（環境変数LOG_SAMPLE_EVERY）
+DEFAULT_SAMPLE_EVERY = 10
+# ページごとの進捗など、件数の多いINFOログに付ける extra
+SAMPLED = {"sampled": True}
 
+_FORMAT = (
+    "%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s"
+)
+_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
-def setup_logger(name: str, log_dir: str = "logs") -> logging.Logger:
-    """ロガーの設定を行う"""
+# プロセスで1度だけ作成するキューとハンドラー（_initialize で作成）
+_lock = threading.Lock()
+_loggers: Dict[str, logging.Logger] = {}
+_log_queue: "Optional[queue.Queue[logging.LogRecord]]" = None
+_queue_handler: Optional[QueueHandler] = None
+_listener: Optional[QueueListener] = None
+_file_handler: Optional["_PerLoggerFileHandler"] = None
+
+
+class _PerLoggerFileHandler(logging.Handler):
+    """ロガー名ごとのファイル（<log_dir>/<name>.log）へ振り分けるハンドラー"""
+
+    def __init__(self, formatter: logging.Formatter):
+        super().__init__()
+        self.formatter = formatter
+        self._log_dirs: Dict[str, str] = {}
+        self._handlers: Dict[str, RotatingFileHandler] = {}
+
+    def register(self, name: str, log_dir: str) -> None:
+        os.makedirs(log_dir, exist_ok=True)
+        self._log_dirs[name] = log_dir
+
+    def emit(self, record: logging.LogRecord) -> None:
+        handler = self._handlers.get(record.name)
+        if handler is None:
+            log_dir = self._log_dirs.get(record.name)
+            if log_dir is None:
+                return
+            handler = RotatingFileHandler(
+                os.path.join(log_dir, f"{record.name}.log"),
+                maxBytes=1024 * 1024,
+                backupCount=3,
+                encoding="utf-8",
+            )
+            handler.setFormatter(self.formatter)
+            self._handlers[record.name] = handler
+        handler.handle(record)
+
+    def close(self) -> None:
+        for handler in self._handlers.values():
+            handler.close()
+        super().close()
+
+
+class _CloudLoggingHandler(logging.Handler):
+    """Cloud Loggingへ送信するハンドラー（最初のログの出力時に作成）
+
+    google-cloud-logging の読み込みとクライアントの作成に時間がかかるため、
+    インポート時ではなくリスナーのスレッドで最初のログを出力する際に作成する。
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._handler: Optional[logging.Handler] = None
+        self._disabled = False
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self._disabled:
+            return
+        if self._handler is None:
+            try:
+                import google.cloud.logging
+
+                # 実行環境に応じたハンドラーを使う
+                client = google.cloud.logging.Client()
+                self._handler = client.get_default_handler()
+            except Exception as e:
+                # 認証情報がないローカル環境などでは標準出力とファイルのみに出力する
+                self._disabled = True
+                sys.stderr.write(f"Cloud Logging is disabled: {str(e)}\n")
+                return
+        self._handler.handle(record)
+
+    def close(self) -> None:
+        if self._handler is not None:
+            self._handler.close()
+        super().close()
+
+
+class SamplingFilter(logging.Filter):
+    """extra=SAMPLED を付けたログを呼び出し箇所ごとに every 件に1件だけ通す
+
+    各呼び出し箇所の最初の1件は必ず出力する。every が0の場合はすべて捨てる。
+    """
+
+    def __init__(self, every: int):
+        super().__init__()
+        self.every = every
+        self._counts: Dict[Tuple[str, int], int] = {}
+        self._lock = threading.Lock()
 
-    # Google Cloud Loggingの設定
-    client = google.cloud.logging.Client()
-    client.setup_logging()
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "sampled", False):
+            return True
+        if self.every <= 0:
+            return False
+        key = (record.pathname, record.lineno)
+        with self._lock:
+            count = self._counts.get(key, 0)
+            self._counts[key] = count + 1
+        return count % self.every == 0
 
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
 
-    # 標準出力用のハンドラー
+def _create_handlers(formatter: logging.Formatter) -> List[logging.Handler]:
+    """キューから取り出したログを出力するハンドラー（標準出力・ファイル・Cloud Logging）
+
+    環境変数LOG_CLOUD_LOGGINGがfalseの場合はCloud Loggingへ送信しない（ベンチマークなど）。
+    """
+    global _file_handler
+
     stream_handler = logging.StreamHandler()
-    stream_handler.setLevel(logging.INFO)
-
-    # ファイル出力用のハンドラー
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
-    file_handler = RotatingFileHandler(
-        os.path.join(log_dir, f"{name}.log"),
-        maxBytes=1024 * 1024,
-        backupCount=3,
-        encoding="utf-8",
-    )
-    file_handler.setLevel(logging.INFO)
+    stream_handler.setFormatter(formatter)
+    _file_handler = _PerLoggerFileHandler(formatter)
+    handlers: List[logging.Handler] = [stream_handler, _file_handler]
+    if os.environ.get("LOG_CLOUD_LOGGING", "true").lower() == "true":
+        handlers.append(_CloudLoggingHandler())
+    return handlers
+
 
-    # フォーマッターの設定
-    formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
+def _initialize() -> QueueHandler:
+    """キューとリスナーを作成（プロセスで1度だけ呼び出す）"""
+    global _log_queue, _queue_handler, _listener
+
+    formatter = logging.Formatter(_FORMAT, datefmt=_DATE_FORMAT)
+    handlers = _create_handlers(formatter)
+
+    # ログの出力はリスナーのスレッドで行い、呼び出し元はキューへ入れるだけにする
+    _log_queue = queue.Queue()
+    _queue_handler = QueueHandler(_log_queue)
+    _queue_handler.addFilter(
+        SamplingFilter(int(os.environ.get("LOG_SAMPLE_EVERY", DEFAULT_SAMPLE_EVERY)))
     )
+    _listener = QueueListener(_log_queue, *handlers)
+    _listener.start()
+    atexit.register(_listener.stop)
+    return _queue_handler
+
+
+def _restart_listener_in_child() -> None:
+    # fork したプロセスにはリスナーのスレッドが引き継がれないため、新しいキューで起動し直す
+    global _log_queue, _listener
+    if _queue_handler is None or _listener is None:
+        return
+    _log_queue = queue.Queue()
+    _queue_handler.queue = _log_queue
+    _listener = QueueListener(_log_queue, *_listener.handlers)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+
+os.register_at_fork(after_in_child=_restart_listener_in_child)
+
+
+def setup_logger(name: str, log_dir: str = "logs") -> logging.Logger:
+    """ロガーを取得（同じ名前の2回目以降の呼び出しでは作成済みのロガーを返す）
+
+    ログはキューを経由して別スレッドで出力するため、ログの出力で呼び出し元が待たされない。
+    ログレベルは環境変数LOG_LEVEL（既定はINFO）で変更できる。
+    """
+    with _lock:
+        logger = _loggers.get(name)
+        if logger is not None:
+            return logger
+
+        queue_handler = _queue_handler or _initialize()
+        assert _file_handler is not None
+        _file_handler.register(name, log_dir)
+
+        logger = logging.getLogger(name)
+        logger.setLevel(os.environ.get("LOG_LEVEL", DEFAULT_LOG_LEVEL).upper())
+        logger.handlers.clear()
+        logger.addHandler(queue_handler)
+        # 出力はリスナーのハンドラーで行うため、ルートロガーへは伝播させない
+        logger.propagate = False
+        _loggers[name] = logger
+        return logger
 
-    # 各ハンドラーにフォーマッターを設定
-    stream_handler.setFormatter(formatter)
-    file_handler.setFormatter(formatter)
 
-    # ハンドラーの追加（既存のハンドラーがある場合は削除）
-    logger.handlers.clear()
-    logger.addHandler(stream_handler)
-    logger.addHandler(file_handler)
+def flush_logs() -> None:
+    """キューに残っているログをすべて出力する（リクエストの処理後に呼び出す）
 
-    return logger
+    Cloud Functionsではリクエストの処理後にCPUが割り当てられなくなるため、
+    応答の前にリスナーのスレッドがキューを処理し終えるのを待つ。
+    """
+    if _log_queue is not None:
+        _log_queue.join()
@@ -0,0 +1,158 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from .telemetry import traced
+
+# 存在を確認したメタデータを保持する秒数（環境変数METADATA_CACHE_TTL_SECONDSで変更できる）
+DEFAULT_TTL_SECONDS = 600.0
+
+
+class MetadataCache:
+    """GCSのオブジェクトやBigQueryのデータセット・テーブルのメタデータのキャッシュ
+
+    存在したという結果のみを ttl_seconds 秒だけ保持し、ウォームスタートした
+    実行でも再利用する。存在しなかった結果は保持しない（作成・アップロードされた
+    直後の確認で古い結果を返さないため）。
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            ttl_seconds (float): メタデータを保持する秒数
+            clock (Callable[[], float]): 現在時刻（秒）を返す関数（テスト用）
+        """
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """保持しているメタデータを取得（ない場合や期限切れの場合はNone）"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self._clock():
+                self.hits += 1
+                return entry[1]
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """存在を確認したメタデータを保持する"""
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, value)
+
+    def invalidate(self, key: Hashable) -> None:
+        """メタデータを破棄する（削除・更新した場合など）"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def get_or_fetch(
+        self, key: Hashable, fetch: Callable[[], Optional[Any]]
+    ) -> Optional[Any]:
+        """保持していればそれを返し、なければ fetch で取得する（存在しない場合はNone）"""
+        value = self.get(key)
+        if value is not None:
+            return value
+        with traced("metadata_cache.fetch", key=str(key)):
+            value = fetch()
+        if value is not None:
+            self.put(key, value)
+        return value
+
+    def fetch_all(
+        self, fetches: Dict[Hashable, Callable[[], Optional[Any]]]
+    ) -> Dict[Hashable, Optional[Any]]:
+        """互いに依存しない複数のメタデータを並行して取得する"""
+        if len(fetches) <= 1:
+            return {
+                key: self.get_or_fetch(key, fetch) for key, fetch in fetches.items()
+            }
+        with ThreadPoolExecutor(max_workers=len(fetches)) as executor:
+            futures = {
+                key: executor.submit(self.get_or_fetch, key, fetch)
+                for key, fetch in fetches.items()
+            }
+            return {key: future.result() for key, future in futures.items()}
+
+    def clear(self) -> None:
+        """保持しているメタデータと件数をすべて破棄する"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """ヒット・ミスの件数と保持しているメタデータの数を取得"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+            }
+
+
+def blob_key(bucket_name: str, blob_name: str) -> Tuple[str, str, str]:
+    """GCSのオブジェクトのキー"""
+    return ("gcs", bucket_name, blob_name)
+
+
+def dataset_key(dataset_ref: str) -> Tuple[str, str]:
+    """BigQueryのデータセットのキー"""
+    return ("bigquery.dataset", dataset_ref)
+
+
+def table_key(table_ref: str) -> Tuple[str, str]:
+    """BigQueryのテーブルのキー"""
+    return ("bigquery.table", table_ref)
+
+
+def fetch_blob(bucket: Any, blob_name: str) -> Callable[[], Optional[Any]]:
+    """オブジェクトのメタデータを1回のリクエストで取得する関数（存在しない場合はNone）
+
+    exists() と reload() を続けて呼び出すと2回のリクエストになるため、get_blob を使う。
+    """
+    return lambda: bucket.get_blob(blob_name)
+
+
+def fetch_or_none(get: Callable[[str], Any], ref: str) -> Callable[[], Optional[Any]]:
+    """BigQueryのリソースを取得する関数（取得できない場合はNone）"""
+
+    def fetch() -> Optional[Any]:
+        try:
+            return get(ref)
+        except Exception:
+            return None
+
+    return fetch
+
+
+_cache: Optional[MetadataCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_metadata_cache() -> MetadataCache:
+    """プロセスで共有するメタデータのキャッシュを取得（初回の呼び出しで作成）"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = MetadataCache(
+                float(os.environ.get("METADATA_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+            )
+        return _cache
+
+
+def reset_metadata_cache() -> None:
+    """共有しているキャッシュを破棄（次の取得時に作り直す）"""
+    global _cache
+    with _cache_lock:
+        _cache = None
@@ -5,7 +5,10 @@ from datetime import datetime
 from typing import Any, Dict, Optional
 
 from flask import Request
-from google.cloud import storage  # type: ignore
+
+from .gcp_clients import get_storage_client
+from .metadata_cache import blob_key, fetch_blob, get_metadata_cache
+from .telemetry import traced
 
 logger = logging.getLogger(__name__)
 
@@ -41,7 +44,8 @@ class MessageProcessor:
         Args:
             bucket_name (str): 処理済みメッセージを保存するバケット名
         """
-        self.client = storage.Client()
+        self.client = get_storage_client()
+        self.bucket_name = bucket_name
         self.bucket = self.client.bucket(bucket_name)
         self.processed_prefix = (
             "processed_messages"  # 処理済みメッセージを保存するプレフィックス
@@ -55,6 +59,9 @@ class MessageProcessor:
         """
         メッセージが既に処理済みかチェックする
 
+        処理済みと確認したメッセージはメタデータのキャッシュに保持し、
+        再配信された場合にGCSへ問い合わせない。
+
         Args:
             message_id (str): チェックするメッセージID
 
@@ -62,8 +69,16 @@ class MessageProcessor:
             bool: 処理済みの場合True、未処理の場合False
         """
         try:
-            blob = self.bucket.blob(self._get_message_path(message_id))
-            return blob.exists()
+            with traced("pubsub.is_message_processed", message_id=message_id) as span:
+                path = self._get_message_path(message_id)
+                processed = (
+                    get_metadata_cache().get_or_fetch(
+                        blob_key(self.bucket_name, path), fetch_blob(self.bucket, path)
+                    )
+                    is not None
+                )
+                span.set_attribute("processed", processed)
+                return processed
         except Exception as e:
             logger.error(f"Error checking message status: {str(e)}")
             # エラーの場合は安全のためFalseを返す
@@ -80,17 +95,22 @@ class MessageProcessor:
             metadata (Optional[Dict[str, Any]], optional): 保存する追加のメタデータ
         """
         try:
-            blob = self.bucket.blob(self._get_message_path(message_id))
-
-            # 保存するデータの作成
-            data = {
-                "message_id": message_id,
-                "processed_at": datetime.utcnow().isoformat(),
-                "metadata": metadata or {},
-            }
-
-            # JSONとしてアップロード
-            blob.upload_from_string(json.dumps(data), content_type="application/json")
+            with traced("pubsub.mark_message_as_processed", message_id=message_id):
+                path = self._get_message_path(message_id)
+                blob = self.bucket.blob(path)
+
+                # 保存するデータの作成
+                data = {
+                    "message_id": message_id,
+                    "processed_at": datetime.utcnow().isoformat(),
+                    "metadata": metadata or {},
+                }
+
+                # JSONとしてアップロード
+                blob.upload_from_string(
+                    json.dumps(data), content_type="application/json"
+                )
+                get_metadata_cache().put(blob_key(self.bucket_name, path), blob)
 
             logger.info(f"Message {message_id} marked as processed")
 
@@ -0,0 +1,175 @@
+import importlib.util
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from opentelemetry import metrics, trace
+
+from .logger_config import setup_logger
+
+logger = setup_logger("shared.telemetry")
+
+# 計装名（スパンとメトリクスの発行元）
+INSTRUMENTATION_NAME = "tech_jobs_data_platform"
+# 環境変数TELEMETRY_EXPORTERで選べるエクスポーター
+EXPORTERS = ("console", "memory", "otlp")
+
+_tracer = trace.get_tracer(INSTRUMENTATION_NAME)
+_meter = metrics.get_meter(INSTRUMENTATION_NAME)
+_duration_histogram = _meter.create_histogram(
+    "operation.duration", unit="ms", description="処理ごとの所要時間"
+)
+_histograms: Dict[str, Any] = {}
+_histograms_lock = threading.Lock()
+
+# setup_telemetry で作成したプロバイダー（未設定の場合は何も記録しない）
+_tracer_provider: Any = None
+_meter_provider: Any = None
+_memory_exporter: Any = None
+_memory_reader: Any = None
+
+
+def _clean(attributes: Dict[str, Any]) -> Dict[str, Any]:
+    # OpenTelemetryの属性にNoneは使えないため除く
+    return {key: value for key, value in attributes.items() if value is not None}
+
+
+@contextmanager
+def traced(name: str, **attributes: Any) -> Iterator[Any]:
+    """スパンを開始し、終了時に所要時間をヒストグラムへ記録
+
+    例外はスパンに記録された上で再送出される。
+    処理中に分かった値（件数やジョブIDなど）は yield されたスパンの
+    set_attribute で追加する。
+
+    Args:
+        name (str): スパン名（例: http.get, bigquery.merge）
+        **attributes: スパンの属性（Noneの値は除く）
+    """
+    started_at = time.perf_counter()
+    error = False
+    with _tracer.start_as_current_span(name, attributes=_clean(attributes)) as span:
+        try:
+            yield span
+        except BaseException:
+            error = True
+            raise
+        finally:
+            _duration_histogram.record(
+                (time.perf_counter() - started_at) * 1000,
+                {"operation": name, "error": error},
+            )
+
+
+def record_value(name: str, value: float, unit: str = "", **attributes: Any) -> None:
+    """処理の計測値（バイト数や件数など）を名前ごとのヒストグラムへ記録"""
+    with _histograms_lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _meter.create_histogram(name, unit=unit)
+            _histograms[name] = histogram
+    histogram.record(value, _clean(attributes))
+
+
+def setup_telemetry(service_name: str, exporter: Optional[str] = None) -> bool:
+    """スパンとメトリクスのエクスポーターを設定
+
+    exporter を省略した場合は環境変数TELEMETRY_EXPORTERを使う。
+    - console: 標準出力へ出力（ローカルでの確認用）
+    - memory: メモリに保持し、get_finished_spans / get_metrics_data で取得
+    - otlp: OTLP/HTTPで送信（送信先は OTEL_EXPORTER_OTLP_ENDPOINT などで指定）
+    未設定の場合や opentelemetry-sdk がない場合は何も記録しない。
+
+    Returns:
+        bool: エクスポーターを設定したか
+    """
+    global _tracer_provider, _meter_provider, _memory_exporter, _memory_reader
+
+    exporter = exporter or os.environ.get("TELEMETRY_EXPORTER")
+    if not exporter or _tracer_provider is not None:
+        return False
+    if exporter not in EXPORTERS:
+        raise ValueError(
+            f"Unknown telemetry exporter: {exporter} (choose from {', '.join(EXPORTERS)})"
+        )
+    if importlib.util.find_spec("opentelemetry.sdk") is None:
+        logger.warning("opentelemetry-sdk is not installed, telemetry is disabled")
+        return False
+
+    from opentelemetry.sdk.metrics import MeterProvider
+    from opentelemetry.sdk.metrics.export import (
+        ConsoleMetricExporter,
+        InMemoryMetricReader,
+        MetricReader,
+        PeriodicExportingMetricReader,
+    )
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import (
+        BatchSpanProcessor,
+        ConsoleSpanExporter,
+        SimpleSpanProcessor,
+        SpanProcessor,
+    )
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+        InMemorySpanExporter,
+    )
+
+    span_processor: SpanProcessor
+    metric_reader: MetricReader
+    if exporter == "console":
+        span_processor = SimpleSpanProcessor(ConsoleSpanExporter())
+        metric_reader = PeriodicExportingMetricReader(ConsoleMetricExporter())
+    elif exporter == "memory":
+        _memory_exporter = InMemorySpanExporter()
+        _memory_reader = InMemoryMetricReader()
+        span_processor = SimpleSpanProcessor(_memory_exporter)
+        metric_reader = _memory_reader
+    else:
+        # OTLPのエクスポーターは本番でのみ使うため、ここで読み込む
+        from opentelemetry.exporter.otlp.proto.http.metric_exporter import (  # type: ignore
+            OTLPMetricExporter,
+        )
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import (  # type: ignore
+            OTLPSpanExporter,
+        )
+
+        span_processor = BatchSpanProcessor(OTLPSpanExporter())
+        metric_reader = PeriodicExportingMetricReader(OTLPMetricExporter())
+
+    resource = Resource.create({"service.name": service_name})
+    _tracer_provider = TracerProvider(resource=resource)
+    _tracer_provider.add_span_processor(span_processor)
+    _meter_provider = MeterProvider(resource=resource, metric_readers=[metric_reader])
+    trace.set_tracer_provider(_tracer_provider)
+    metrics.set_meter_provider(_meter_provider)
+    logger.info(f"Telemetry enabled with {exporter} exporter for {service_name}")
+    return True
+
+
+def flush_telemetry() -> None:
+    """記録済みのスパンとメトリクスを送信（リクエストの処理後に呼び出す）
+
+    Cloud Functionsではリクエストの処理後にCPUが割り当てられなくなるため、
+    バッチで送信するエクスポーターを使う場合も応答の前に送信しておく。
+    """
+    if _tracer_provider is not None:
+        _tracer_provider.force_flush()
+    if _meter_provider is not None:
+        _meter_provider.force_flush()
+
+
+def get_finished_spans() -> List[Any]:
+    """memory エクスポーターに記録されたスパンを取得"""
+    if _memory_exporter is None:
+        return []
+    return list(_memory_exporter.get_finished_spans())
+
+
+def get_metrics_data() -> Any:
+    """memory エクスポーターに記録されたメトリクスを取得"""
+    if _memory_reader is None:
+        return None
+    return _memory_reader.get_metrics_data()
@@ -63,7 +63,8 @@ resource "google_cloudfunctions2_function" "function" {
   }
 
   service_config {
-    max_instance_count = 1
+    # 一時テーブルは実行ごとに分かれるため、複数のパーティションを並行してロードできる
+    max_instance_count = var.max_instance_count
     available_memory   = "1024Mi"
     timeout_seconds    = 600
     environment_variables = {
@@ -102,8 +103,11 @@ resource "google_storage_notification" "notification" {
   # 新しいオブジェクトが作成されるか、既存のオブジェクトが上書きされ、そのオブジェクトの新しい世代が作成されると送信
   # ref: https://cloud.google.com/functions/docs/calling/storage?hl=ja
   event_types = ["OBJECT_FINALIZE"]
-  topic       = google_pubsub_topic.storage_trigger_topic.id
-  depends_on  = [google_pubsub_topic_iam_member.storage_publisher]
+  # スクレイパーの出力（raw/jobs/）以外の書き込み（取り込み済みの索引や
+  # レスポンスのキャッシュなど）ではローダーを起動しない
+  object_name_prefix = "raw/jobs/"
+  topic              = google_pubsub_topic.storage_trigger_topic.id
+  depends_on         = [google_pubsub_topic_iam_member.storage_publisher]
 }
 
 # Pub/Sub トピック
@@ -32,3 +32,9 @@ variable "data_bucket" {
   description = "スクレイピングデータを格納するGCSバケット名"
   type        = string
 }
+
+variable "max_instance_count" {
+  description = "同時に実行するインスタンスの最大数"
+  type        = number
+  default     = 3
+}
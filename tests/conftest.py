@@ -15,3 +15,18 @@ sys.path.insert(0, str(func_scraper_utils))
 # sharedディレクトリをPythonパスに追加
 shared_dir = functions_dir / "shared"
 sys.path.insert(0, str(shared_dir))
+
+import pytest  # noqa: E402
+from shared.gcp_clients import reset_clients  # noqa: E402
+from shared.metadata_cache import reset_metadata_cache  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _reset_gcp_clients():
+    """テストごとにクライアントのレジストリとメタデータのキャッシュを空にする
+
+    差し替えたモックや、モックから取得したメタデータを次のテストに残さない。
+    """
+    yield
+    reset_clients()
+    reset_metadata_cache()
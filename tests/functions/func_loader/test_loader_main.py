@@ -1,17 +1,23 @@
 import pytest
 from func_loader.main import JobDataLoader
+from shared.gcp_clients import BIGQUERY, BIGQUERY_WRITE, STORAGE, set_client
+from shared.listing_index import KnownListingIndex
 
 
 @pytest.fixture
 def mock_storage_client(mocker):
     """GCSクライアントのモック"""
-    return mocker.patch("func_loader.main.storage.Client")
+    client = mocker.MagicMock()
+    set_client(STORAGE, client)
+    return client
 
 
 @pytest.fixture
 def mock_bq_client(mocker):
     """BigQueryクライアントのモック"""
-    return mocker.patch("func_loader.main.bigquery.Client")
+    client = mocker.MagicMock()
+    set_client(BIGQUERY, client)
+    return client
 
 
 @pytest.fixture
@@ -37,6 +43,9 @@ def test_job_data_loader_execute_success(job_loader, mock_bq_client, mocker):
     # マージ処理をモック
     mocker.patch.object(job_loader, "_merge_data")
 
+    # 取り込み済みの索引の更新をモック
+    mock_refresh = mocker.patch.object(job_loader, "_refresh_known_listing_index")
+
     # テスト実行
     result = job_loader.execute()
 
@@ -44,12 +53,19 @@ def test_job_data_loader_execute_success(job_loader, mock_bq_client, mocker):
     assert result["status"] == "success"
     assert result["loaded_rows"] == 10
     assert "Data loaded to" in result["message"]
+    mock_refresh.assert_called_once()
 
 
 def test_job_data_loader_execute_no_data(job_loader, mock_bq_client, mocker):
-    """JobDataLoader.executeのデータなしテスト"""
+    """JobDataLoader.executeのデータなしテスト
+
+    検証内容:
+    1. ロードするデータがないことが返されること
+    2. ロード先のメタデータを取得しないこと
+    """
     # ソースファイルが存在しない場合
     mocker.patch.object(job_loader, "_check_source_file", return_value=False)
+    mock_prefetch = mocker.patch.object(job_loader, "_prefetch_target_metadata")
 
     # テスト実行
     result = job_loader.execute()
@@ -58,6 +74,9 @@ def test_job_data_loader_execute_no_data(job_loader, mock_bq_client, mocker):
     assert result["status"] == "success"
     assert result["message"] == "No data to load"
     assert result["loaded_rows"] == 0
+    mock_prefetch.assert_not_called()
+    mock_bq_client.get_dataset.assert_not_called()
+    mock_bq_client.get_table.assert_not_called()
 
 
 def test_job_data_loader_execute_error(job_loader, mock_bq_client, mocker):
@@ -73,3 +92,539 @@ def test_job_data_loader_execute_error(job_loader, mock_bq_client, mocker):
     # 結果の検証
     assert result["status"] == "error"
     assert "Test error" in result["message"]
+
+
+def test_merge_data_prunes_partitions(job_loader, mock_bq_client, mocker):
+    """MERGEで対象テーブルのパーティションを絞り込むことをテスト
+
+    検証内容:
+    1. 既存の行の掲載開始日は対象テーブルではなく索引から求めること
+    2. 範囲ではなく、求めた掲載開始日のパーティションのみがパラメータとして渡されること
+    3. ドライランを実行しないこと
+    4. MERGEの後に索引が更新されること
+    5. 処理したバイト数にパーティションを求めるクエリと索引の更新の分も含まれること
+    6. 追加・更新・変更なしの行数がDMLの統計から集計されること
+    """
+    from datetime import date
+
+    from google.cloud.bigquery import DmlStats
+
+    listing_dates = [date(2023, 11, 2), date(2024, 3, 14), date(2024, 3, 15)]
+    partitions_row = mocker.Mock(listing_dates=listing_dates, staged_rows=8)
+    partitions_job = mocker.MagicMock(total_bytes_processed=40)
+    partitions_job.result.return_value = [partitions_row]
+    merge_job = mocker.Mock(
+        job_id="merge-job",
+        num_dml_affected_rows=5,
+        total_bytes_processed=100,
+        total_bytes_billed=10485760,
+        dml_stats=DmlStats(inserted_row_count=3, updated_row_count=2),
+    )
+    index_job = mocker.Mock(total_bytes_processed=20)
+    mock_bq_client.query.side_effect = [partitions_job, merge_job, index_job]
+
+    temp_table = "test-project.bigdata_navi.lake__joblist_temp"
+    stats = job_loader._merge_data(temp_table)
+
+    partitions_call, merge_call, index_call = mock_bq_client.query.call_args_list
+    partitions_query = partitions_call.args[0]
+    assert f"from `{temp_table}`" in partitions_query
+    assert (
+        "from `test-project.bigdata_navi.lake__joblist__listing_dates` as I"
+        in partitions_query
+    )
+    assert "lake__joblist` as T" not in partitions_query
+    merge_query = merge_call.args[0]
+    assert "T.listing_start_date in unnest(@listing_dates)" in merge_query
+    (parameter,) = merge_call.kwargs["job_config"].query_parameters
+    assert (parameter.name, parameter.values) == ("listing_dates", listing_dates)
+    assert not any(
+        call.kwargs.get("job_config") is not None and call.kwargs["job_config"].dry_run
+        for call in mock_bq_client.query.call_args_list
+    )
+    index_query = index_call.args[0]
+    assert "delete from `test-project.bigdata_navi.lake__joblist__listing_dates`" in (
+        index_query
+    )
+    assert f"from `{temp_table}`;" in index_query
+    assert stats == {
+        "min_date": "2023-11-02",
+        "max_date": "2024-03-15",
+        "partitions": 3,
+        "staged_rows": 8,
+        "inserted_rows": 3,
+        "updated_rows": 2,
+        "unchanged_rows": 3,
+        "affected_rows": 5,
+        "bytes_processed": 100,
+        "bytes_billed": 10485760,
+        "lookup_bytes_processed": 40,
+        "index_bytes_processed": 20,
+        "total_bytes_processed": 160,
+    }
+
+
+def test_ensure_listing_date_index(job_loader, mock_bq_client):
+    """索引がない場合のみ対象テーブルから作成することをテスト"""
+    mock_bq_client.get_table.side_effect = Exception("Not found")
+
+    job_loader._ensure_listing_date_index()
+
+    create_query = mock_bq_client.query.call_args.args[0]
+    assert (
+        "create table if not exists "
+        "`test-project.bigdata_navi.lake__joblist__listing_dates`" in create_query
+    )
+    assert "from `test-project.bigdata_navi.lake__joblist`" in create_query
+
+    mock_bq_client.reset_mock()
+    mock_bq_client.get_table.side_effect = None
+    job_loader._ensure_listing_date_index()
+
+    mock_bq_client.query.assert_not_called()
+
+
+def test_execute_uses_isolated_temp_table(job_loader, mock_bq_client, mocker):
+    """実行ごとに別の一時テーブルを使い、失敗しても削除することをテスト
+
+    検証内容:
+    1. 実行ごとに一意な名前の一時テーブルが有効期限付きで作成されること
+    2. マージに失敗した場合も一時テーブルが削除されること
+    """
+    from datetime import datetime, timezone
+
+    mocker.patch.object(job_loader, "_check_source_file", return_value=True)
+    load_to_temp_table = mocker.patch.object(
+        job_loader, "_load_to_temp_table", return_value=10
+    )
+    mocker.patch.object(job_loader, "_merge_data", side_effect=Exception("Conflict"))
+
+    first = job_loader.execute()
+    second = job_loader.execute()
+
+    assert first["status"] == second["status"] == "error"
+    temp_tables = [call.args[1] for call in load_to_temp_table.call_args_list]
+    assert len(set(temp_tables)) == 2
+    for call in mock_bq_client.create_table.call_args_list:
+        assert call.args[0].expires > datetime.now(timezone.utc)
+    assert [
+        call.args[0] for call in mock_bq_client.delete_table.call_args_list
+    ] == temp_tables
+
+
+def test_merge_retries_on_concurrent_update(job_loader, mock_bq_client, mocker):
+    """並行したMERGEとの競合で失敗した場合に再実行することをテスト"""
+    conflicted = mocker.Mock()
+    conflicted.result.side_effect = Exception(
+        "Could not serialize access to table due to concurrent update"
+    )
+    succeeded = mocker.Mock()
+    mock_bq_client.query.side_effect = [conflicted, succeeded]
+
+    assert job_loader._run_merge_job("merge", None) is succeeded
+    assert mock_bq_client.query.call_count == 2
+
+
+def test_merge_does_not_retry_other_errors(job_loader, mock_bq_client, mocker):
+    """競合以外のエラーは再実行せずに送出することをテスト"""
+    mock_bq_client.query.return_value.result.side_effect = Exception("Syntax error")
+
+    with pytest.raises(Exception, match="Syntax error"):
+        job_loader._run_merge_job("merge", None)
+    assert mock_bq_client.query.call_count == 1
+
+
+def test_check_source_file_uses_listing_metadata(job_loader, mocker):
+    """ソースファイルの確認で一覧取得時のメタデータを使うことをテスト
+
+    検証内容:
+    1. 一覧に含まれるファイルは、存在確認でGCSへ問い合わせないこと
+    2. 一覧にないファイルは get_blob の1回で確認すること
+    """
+    prefix = "raw/jobs/partition_date=20240315/"
+    bucket = job_loader.storage_client.bucket.return_value
+    bucket.list_blobs.return_value = [_source_blob(mocker, f"{prefix}jobs.csv")]
+    bucket.get_blob.return_value = None
+
+    blob_name = job_loader._detect_source_file("test-bucket", prefix)
+
+    assert job_loader._check_source_file("test-bucket", blob_name) is True
+    bucket.get_blob.assert_not_called()
+    assert job_loader._check_source_file("test-bucket", f"{prefix}x.csv") is False
+    bucket.get_blob.assert_called_once_with(f"{prefix}x.csv")
+
+
+def test_refresh_known_listing_index(job_loader, mocker, monkeypatch):
+    """取り込み済みの索引の更新をテスト
+
+    検証内容:
+    1. 一時テーブルの detail_link のみが既存の索引に追加されること
+    2. テーブル全体は読まないこと
+    3. 索引がデータバケットへ保存されること
+    """
+    monkeypatch.setenv("SCRAPER_SKIP_KNOWN_LISTINGS", "true")
+    loader = JobDataLoader()
+    existing = KnownListingIndex.build(["/jobs/1"], capacity=100)
+    mocker.patch("func_loader.main.KnownListingIndex.load", return_value=existing)
+    loader.bq_client.query.return_value.result.return_value = [
+        mocker.Mock(detail_link="/jobs/1"),
+        mocker.Mock(detail_link="/jobs/2"),
+    ]
+    mock_save = mocker.patch("func_loader.main.KnownListingIndex.save", autospec=True)
+
+    loader._refresh_known_listing_index("test-bucket", "p.d.temp")
+
+    query = loader.bq_client.query.call_args.args[0]
+    assert "`p.d.temp`" in query
+    assert "lake__joblist" not in query
+    index = mock_save.call_args.args[0]
+    assert "/jobs/1" in index
+    assert "/jobs/2" in index
+    assert len(index) == 2
+    assert mock_save.call_args.args[1] == "test-bucket"
+
+
+def test_refresh_known_listing_index_rebuild(job_loader, mocker, monkeypatch):
+    """索引がない場合にテーブル全体から作成することをテスト"""
+    monkeypatch.setenv("SCRAPER_SKIP_KNOWN_LISTINGS", "true")
+    loader = JobDataLoader()
+    mocker.patch("func_loader.main.KnownListingIndex.load", return_value=None)
+    rows = mocker.MagicMock()
+    rows.total_rows = 2
+    rows.__iter__.return_value = iter(
+        [mocker.Mock(detail_link="/jobs/1"), mocker.Mock(detail_link="/jobs/2")]
+    )
+    loader.bq_client.query.return_value.result.return_value = rows
+    mock_save = mocker.patch("func_loader.main.KnownListingIndex.save", autospec=True)
+
+    loader._refresh_known_listing_index("test-bucket", "p.d.temp")
+
+    assert "lake__joblist" in loader.bq_client.query.call_args.args[0]
+    index = mock_save.call_args.args[0]
+    assert "/jobs/1" in index
+    assert "/jobs/2" in index
+
+
+def test_refresh_known_listing_index_disabled(job_loader, mocker):
+    """スクレイパーが索引を使わない場合は更新しないことをテスト"""
+    mock_load = mocker.patch("func_loader.main.KnownListingIndex.load")
+
+    job_loader._refresh_known_listing_index("test-bucket", "p.d.temp")
+
+    mock_load.assert_not_called()
+    job_loader.bq_client.query.assert_not_called()
+
+
+def test_refresh_known_listing_index_error(job_loader, mocker, monkeypatch):
+    """索引の更新に失敗してもロード処理が失敗しないことをテスト"""
+    monkeypatch.setenv("SCRAPER_SKIP_KNOWN_LISTINGS", "true")
+    loader = JobDataLoader()
+    mocker.patch("func_loader.main.KnownListingIndex.load", return_value=None)
+    loader.bq_client.query.side_effect = Exception("Query failed")
+
+    # 例外が発生しないこと
+    loader._refresh_known_listing_index("test-bucket", "p.d.temp")
+
+
+@pytest.mark.parametrize(
+    "blob_names, expected",
+    [
+        (["jobs.csv"], "jobs.csv"),
+        (["jobs.csv", "jobs.parquet"], "jobs.parquet"),
+        ([], "jobs.csv"),
+    ],
+)
+def test_detect_source_file(job_loader, mocker, blob_names, expected):
+    """ソースファイルの形式の判定をテスト
+
+    検証内容:
+    1. Parquetのファイルがあれば優先して使われること
+    2. どちらもない場合はCSVのパスが返されること
+    """
+    prefix = "raw/jobs/partition_date=20240315/"
+    blobs = [mocker.Mock() for _ in blob_names]
+    for blob, name in zip(blobs, blob_names):
+        blob.name = f"{prefix}{name}"
+    job_loader.storage_client.bucket.return_value.list_blobs.return_value = blobs
+
+    assert job_loader._detect_source_file("test-bucket", prefix) == (
+        f"{prefix}{expected}"
+    )
+
+
+@pytest.mark.parametrize(
+    "source_path, source_format",
+    [
+        ("gs://bucket/raw/jobs/partition_date=20240315/jobs.csv", "CSV"),
+        ("gs://bucket/raw/jobs/partition_date=20240315/jobs.parquet", "PARQUET"),
+    ],
+)
+def test_load_to_temp_table_source_format(job_loader, source_path, source_format):
+    """ファイルの形式に応じたロード設定をテスト
+
+    検証内容:
+    1. 拡張子に応じたソース形式でロードされること
+    """
+    job_loader.bq_client.load_table_from_uri.return_value.output_rows = 3
+
+    loaded_rows = job_loader._load_to_temp_table(source_path, "temp", [])
+
+    job_config = job_loader.bq_client.load_table_from_uri.call_args.kwargs["job_config"]
+    assert job_config.source_format == source_format
+    assert loaded_rows == 3
+
+
+def test_invalid_ingestion_mode(
+    mock_bq_client, mock_storage_client, mock_env_vars, mocker
+):
+    """未知の取り込み方法を指定した場合にエラーとなることをテスト"""
+    mocker.patch.dict("os.environ", {"LOADER_INGESTION_MODE": "streaming"})
+
+    with pytest.raises(ValueError, match="Unknown ingestion mode"):
+        JobDataLoader()
+
+
+def test_execute_with_storage_write(
+    mock_bq_client, mock_storage_client, mock_env_vars, mocker
+):
+    """Storage Write APIでの取り込みをテスト
+
+    検証内容:
+    1. ロードジョブを使わずに Storage Write API で一時テーブルへ書き込むこと
+    2. 実行ごとに作成した一時テーブルへ書き込み、最後に削除すること
+    3. ファイルの行がスキーマの型で書き込まれること
+    """
+    from func_loader.main import _job_schema
+
+    mocker.patch.dict("os.environ", {"LOADER_INGESTION_MODE": "storage_write"})
+    set_client(BIGQUERY_WRITE, mocker.Mock())
+    loader = JobDataLoader()
+    mocker.patch.object(loader, "_check_source_file", return_value=True)
+    mocker.patch.object(loader, "_merge_data")
+    mocker.patch.object(loader, "_refresh_known_listing_index")
+    load_to_temp_table = mocker.patch.object(loader, "_load_to_temp_table")
+    write = mocker.patch(
+        "shared.bigquery_write.BigQueryStorageWriter.write", return_value=1
+    )
+    names = [field.name for field in _job_schema()]
+    row = {"monthly_salary": "500000", "listing_start_date": "2024-03-01"}
+    row["detail_link"] = "/item/1/"
+    csv = ",".join(names) + "\n" + ",".join(row.get(name, "") for name in names)
+    blob = mock_storage_client.bucket.return_value.blob.return_value
+    blob.download_as_bytes.return_value = csv.encode("utf-8")
+
+    result = loader.execute()
+
+    assert result["status"] == "success"
+    assert result["loaded_rows"] == 1
+    load_to_temp_table.assert_not_called()
+    created_table = mock_bq_client.create_table.call_args.args[0]
+    assert created_table.table_id.startswith("lake__joblist_temp_")
+    written_ref, written_table = write.call_args.args
+    assert written_ref == (
+        f"{created_table.project}.{created_table.dataset_id}.{created_table.table_id}"
+    )
+    mock_bq_client.delete_table.assert_called_once_with(written_ref, not_found_ok=True)
+    assert written_table.column_names == names
+    (written_row,) = written_table.to_pylist()
+    assert written_row["monthly_salary"] == 500000
+    assert written_row["detail_link"] == "/item/1/"
+
+
+def _source_blob(mocker, name, size=1000, metadata=None):
+    blob = mocker.Mock(size=size, metadata=metadata)
+    blob.name = name
+    return blob
+
+
+def test_list_source_files(job_loader, mocker):
+    """バックフィルの期間内のソースファイルの取得をテスト
+
+    検証内容:
+    1. 期間内のパーティションのみが日付順に返されること
+    2. Parquetのファイルが優先され、空のファイルは除かれること
+    3. 一覧の取得範囲が開始日と終了日に共通する部分で絞られること
+    """
+    from datetime import date
+
+    prefix = "raw/jobs/partition_date="
+    bucket = job_loader.storage_client.bucket.return_value
+    bucket.list_blobs.return_value = [
+        _source_blob(mocker, f"{prefix}20240229/jobs.csv"),
+        _source_blob(mocker, f"{prefix}20240302/jobs.csv"),
+        _source_blob(mocker, f"{prefix}20240301/jobs.csv"),
+        _source_blob(mocker, f"{prefix}20240301/jobs.parquet"),
+        _source_blob(mocker, f"{prefix}20240303/jobs.csv", size=10),
+        _source_blob(mocker, f"{prefix}20240304/jobs.csv", metadata={"row_count": "0"}),
+        _source_blob(mocker, f"{prefix}20240302/_checkpoint.json"),
+    ]
+
+    sources = job_loader._list_source_files(
+        "test-bucket", date(2024, 3, 1), date(2024, 3, 31)
+    )
+
+    bucket.list_blobs.assert_called_once_with(prefix=f"{prefix}202403")
+    assert sources == {
+        "20240301": f"{prefix}20240301/jobs.parquet",
+        "20240302": f"{prefix}20240302/jobs.csv",
+    }
+
+
+def test_backfill(job_loader, mock_bq_client, mocker):
+    """複数日のバックフィルをテスト
+
+    検証内容:
+    1. 同じ形式のファイルは1回のロードジョブで partition_date 列を付けて読み込むこと
+    2. 重複を除いてから1回だけMERGEすること
+    3. パーティションごとの行数とファイルのない日付が返されること
+    4. 一時テーブルが削除されること
+    """
+    from datetime import date
+
+    mocker.patch("func_loader.main.get_data_bucket_name", return_value="test-bucket")
+    prefix = "raw/jobs/partition_date="
+    mocker.patch.object(
+        job_loader,
+        "_list_source_files",
+        return_value={
+            "20240301": f"{prefix}20240301/jobs.csv",
+            "20240303": f"{prefix}20240303/jobs.csv",
+        },
+    )
+    load_to_temp_table = mocker.patch.object(
+        job_loader, "_load_to_temp_table", return_value=7
+    )
+    daily_counts = {
+        "20240301": {"loaded_rows": 4, "merged_rows": 3},
+        "20240303": {"loaded_rows": 3, "merged_rows": 3},
+    }
+    dedupe = mocker.patch.object(
+        job_loader, "_dedupe_temp_table", return_value=daily_counts
+    )
+    merge_data = mocker.patch.object(job_loader, "_merge_data", return_value={})
+    mocker.patch.object(job_loader, "_refresh_known_listing_index")
+
+    result = job_loader.backfill(date(2024, 3, 1), date(2024, 3, 3))
+
+    assert result["status"] == "success"
+    assert result["loaded_rows"] == 7
+    assert result["daily_counts"] == daily_counts
+    assert result["missing_partitions"] == ["20240302"]
+    (load_call,) = load_to_temp_table.call_args_list
+    uris, temp_table, _ = load_call.args
+    assert uris == [
+        f"gs://test-bucket/{prefix}20240301/jobs.csv",
+        f"gs://test-bucket/{prefix}20240303/jobs.csv",
+    ]
+    assert load_call.kwargs["hive_partition_prefix"] == "gs://test-bucket/raw/jobs/"
+    created_table = mock_bq_client.create_table.call_args.args[0]
+    assert created_table.schema[-1].name == "partition_date"
+    dedupe.assert_called_once_with(temp_table)
+    merge_data.assert_called_once_with(temp_table)
+    mock_bq_client.delete_table.assert_called_once_with(temp_table, not_found_ok=True)
+
+
+def test_backfill_invalid_range(job_loader):
+    """開始日が終了日より後の場合にエラーとなることをテスト"""
+    from datetime import date
+
+    result = job_loader.backfill(date(2024, 3, 2), date(2024, 3, 1))
+
+    assert result["status"] == "error"
+    assert "must not be after" in result["message"]
+
+
+def test_load_to_temp_table_hive_partitioning(job_loader):
+    """バックフィルのロードでパスの日付が列として追加されることをテスト"""
+    uris = ["gs://bucket/raw/jobs/partition_date=20240301/jobs.parquet"]
+
+    job_loader._load_to_temp_table(
+        uris, "temp", [], hive_partition_prefix="gs://bucket/raw/jobs/"
+    )
+
+    source, _ = job_loader.bq_client.load_table_from_uri.call_args.args
+    job_config = job_loader.bq_client.load_table_from_uri.call_args.kwargs["job_config"]
+    assert source == uris
+    assert job_config.source_format == "PARQUET"
+    assert job_config.hive_partitioning.mode == "STRINGS"
+    assert job_config.hive_partitioning.source_uri_prefix == "gs://bucket/raw/jobs/"
+
+
+def test_backfill_entry_point_invalid_request(mocker):
+    """期間が指定されていないリクエストを拒否することをテスト"""
+    from func_loader.main import backfill_to_bigquery
+
+    request = mocker.Mock()
+    request.get_json.return_value = {"start_date": "2024-03-01"}
+    mocker.patch("func_loader.main.jsonify", side_effect=lambda body: body)
+
+    body, status = backfill_to_bigquery(request)
+
+    assert status == 400
+    assert body["status"] == "invalid"
+
+
+@pytest.mark.parametrize("output_format", ["csv", "parquet"])
+def test_empty_day_is_not_loaded(
+    job_loader, mock_storage_client, mock_bq_client, mocker, output_format
+):
+    """新着の求人がない日の出力がロードされないことをテスト（スクレイピングからロードまで）
+
+    検証内容:
+    1. スクレイパーは行のないファイル（ヘッダー・スキーマのみ）を行数0として保存すること
+    2. ファイルのサイズが MIN_SOURCE_FILE_SIZE 以上でも、ローダーは空とみなすこと
+    3. BigQueryのメタデータの取得やクエリを行わないこと
+    """
+    import base64
+    import io
+    from datetime import date
+
+    import google_crc32c
+    from func_loader.main import MIN_SOURCE_FILE_SIZE
+    from func_scraper.scraping_service import JobScrapingService
+    from func_scraper.utils.models import JOB_COLUMN_TYPES
+    from shared.gcs_utils import create_stream_writer
+
+    mocker.patch("func_loader.main.get_yesterday_jst", return_value=date(2024, 3, 14))
+    bucket = mock_storage_client.bucket.return_value
+    staging_blob = bucket.blob.return_value
+    buffer = io.BytesIO()
+    staging_blob.open.return_value = mocker.MagicMock(write=buffer.write)
+
+    def patch():
+        staging_blob.crc32c = base64.b64encode(
+            google_crc32c.Checksum(buffer.getvalue()).digest()
+        ).decode("utf-8")
+
+    staging_blob.patch.side_effect = patch
+
+    # 新着の求人がない日のスクレイピング
+    service = JobScrapingService("2024-03-13")
+    mocker.patch.object(service.list_scraper, "scrape_all_pages", return_value=[])
+    writer = create_stream_writer(
+        "test-project-scraping-data",
+        output_format=output_format,
+        column_types=JOB_COLUMN_TYPES,
+        partition_date="20240314",
+    )
+    with writer:
+        assert service.execute_to(writer) == 0
+        blob_name = writer.commit()
+
+    # 保存されたファイルをローダーから見える状態にする
+    saved_blob = mocker.Mock(
+        size=len(buffer.getvalue()), metadata=staging_blob.metadata
+    )
+    saved_blob.name = blob_name
+    bucket.list_blobs.return_value = [saved_blob]
+    assert saved_blob.size >= MIN_SOURCE_FILE_SIZE
+
+    result = job_loader.execute()
+
+    assert result == {
+        "status": "success",
+        "message": "No data to load",
+        "loaded_rows": 0,
+    }
+    mock_bq_client.get_table.assert_not_called()
+    mock_bq_client.query.assert_not_called()
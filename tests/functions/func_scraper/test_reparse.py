@@ -0,0 +1,80 @@
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from func_scraper.reparse import iter_fetch_dates, reparse
+from func_scraper.utils.html_archive import HtmlArchive
+from func_scraper.utils.http_client import LocalCacheStorage
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "html"
+
+
+@pytest.fixture
+def archive_dir(tmp_path):
+    """取得日 20240302 のアーカイブ"""
+    archive_dir = tmp_path / "archive"
+    archive = HtmlArchive(LocalCacheStorage(str(archive_dir)), fetch_date="20240302")
+    archive.store(
+        "/item/page/1/?sort=new",
+        "list",
+        (FIXTURES_DIR / "list_page.html").read_bytes(),
+    )
+    detail_page = (FIXTURES_DIR / "detail_page.html").read_bytes()
+    archive.store("/item/1003/?from=list", "detail", detail_page)
+    archive.store("/item/1001/", "detail", detail_page)
+    archive.flush()
+    return archive_dir
+
+
+def test_reparse_local_archive(archive_dir, tmp_path):
+    """ローカルのアーカイブからの再パースをテスト
+
+    検証内容:
+    1. 詳細ページを取得した求人だけが一覧ページの順にレコードになること
+    2. スクレイピング時と同じく、掲載開始日が取得日の前日より前の求人は除かれること
+    3. 取得日のパーティションにCSVが保存されること
+    4. アーカイブのない取得日は読み飛ばされること
+    """
+    output_dir = tmp_path / "output"
+
+    record_counts = reparse(
+        str(archive_dir),
+        str(output_dir),
+        ["20240302", "20240303"],
+        workers=2,
+    )
+
+    assert record_counts == {"20240302": 1}
+    df = pd.read_csv(output_dir / "raw/jobs/partition_date=20240302/jobs.csv")
+    assert list(df.detail_link) == ["/item/1001/"]
+    assert list(df.listing_start_date) == ["2024-03-02"]
+    assert not (output_dir / "raw/jobs/partition_date=20240303").exists()
+
+
+def test_reparse_local_archive_parquet(archive_dir, tmp_path):
+    """Parquetへの再パースで、GCSへの出力と同じ列の型になることをテスト"""
+    output_dir = tmp_path / "output"
+
+    reparse(
+        str(archive_dir),
+        str(output_dir),
+        ["20240302"],
+        workers=1,
+        output_format="parquet",
+    )
+
+    table = pq.read_table(output_dir / "raw/jobs/partition_date=20240302/jobs.parquet")
+    assert table.schema.field("listing_start_date").type == pa.date32()
+    assert table.column("listing_start_date").to_pylist() == [date(2024, 3, 2)]
+
+
+def test_iter_fetch_dates():
+    """取得日の範囲の展開をテスト（月をまたぐ場合）"""
+    assert list(iter_fetch_dates("20240228", "20240301")) == [
+        "20240228",
+        "20240229",
+        "20240301",
+    ]
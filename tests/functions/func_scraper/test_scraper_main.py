@@ -1,6 +1,40 @@
+import base64
+import json
+from concurrent.futures import Future
+from datetime import datetime
+
 import pandas as pd
 import pytest
-from func_scraper.main import JobScrapingService
+from func_scraper.scraping_service import JobScrapingService
+from func_scraper.utils.models import (
+    JobBasicData,
+    JobDetailData,
+    JobListData,
+    JobTableData,
+)
+
+
+def make_job(detail_link, job_title="Python開発者", listing_start_date="2024-03-02"):
+    """一覧ページの求人を作成"""
+    return JobListData(
+        job_title=job_title,
+        listing_start_date=datetime.fromisoformat(listing_start_date),
+        detail_link=detail_link,
+    )
+
+
+def make_detail(occupation="システムエンジニア", monthly_salary=500000):
+    """詳細ページのデータを作成"""
+    return JobDetailData(
+        basic=JobBasicData(
+            monthly_salary=monthly_salary,
+            occupation=occupation,
+            work_type="正社員",
+            work_location="東京都",
+            industry="IT・通信",
+        ),
+        table=JobTableData(job_content="Webアプリケーション開発"),
+    )
 
 
 @pytest.fixture
@@ -16,16 +50,25 @@ def mock_detail_scraper(mocker):
 
 
 @pytest.fixture
-def scraping_service(mocker, mock_list_scraper, mock_detail_scraper):
-    """JobScrapingServiceのインスタンスを提供するフィクスチャ
+def scraper_classes(mocker, mock_list_scraper, mock_detail_scraper):
+    """ListScraperとDetailScraperのコンストラクタをモック化するフィクスチャ
 
     HttpClientとParserはサービス内で生成されるため、
-    ListScraperとDetailScraperのコンストラクタをモック化
+    生成されたスクレイパーの代わりに mock_list_scraper・mock_detail_scraper を返す
     """
-    # スクレイパーのコンストラクタをモック化
-    mocker.patch("func_scraper.main.JobListScraper", return_value=mock_list_scraper)
-    mocker.patch("func_scraper.main.JobDetailScraper", return_value=mock_detail_scraper)
+    list_scraper_class = mocker.patch(
+        "func_scraper.scraping_service.JobListScraper", return_value=mock_list_scraper
+    )
+    detail_scraper_class = mocker.patch(
+        "func_scraper.scraping_service.JobDetailScraper",
+        return_value=mock_detail_scraper,
+    )
+    return list_scraper_class, detail_scraper_class
 
+
+@pytest.fixture
+def scraping_service(scraper_classes):
+    """JobScrapingServiceのインスタンスを提供するフィクスチャ"""
     return JobScrapingService("2024-03-01")
 
 
@@ -36,7 +79,7 @@ def test_execute_with_no_jobs(scraping_service, mock_list_scraper):
     2. 求人が見つからない場合、空のDataFrameが返されること
     """
     # 一覧ページのスクレイピング結果を空に設定
-    mock_list_scraper.scrape_all_pages.return_value = pd.DataFrame()
+    mock_list_scraper.scrape_all_pages.return_value = []
 
     # テスト実行
     result = scraping_service.execute()
@@ -55,16 +98,10 @@ def test_execute_with_jobs(scraping_service, mock_list_scraper, mock_detail_scra
     3. 一覧と詳細の情報が結合されて返されること
     """
     # 一覧ページのスクレイピング結果を設定
-    list_df = pd.DataFrame(
-        {"job_title": ["Python開発者"], "detail_link": ["/jobs/123"]}
-    )
-    mock_list_scraper.scrape_all_pages.return_value = list_df
+    mock_list_scraper.scrape_all_pages.return_value = [make_job("/jobs/123")]
 
     # 詳細ページのスクレイピング結果を設定
-    detail_df = pd.DataFrame(
-        {"monthly_salary": [500000], "occupation": ["システムエンジニア"]}
-    )
-    mock_detail_scraper.scrape_detail.return_value = detail_df
+    mock_detail_scraper.scrape_detail.return_value = make_detail()
 
     # テスト実行
     result = scraping_service.execute()
@@ -75,8 +112,17 @@ def test_execute_with_jobs(scraping_service, mock_list_scraper, mock_detail_scra
     mock_detail_scraper.scrape_detail.assert_called_once_with("/jobs/123")
 
     # 結果のDataFrameに一覧と詳細の情報が含まれていることを確認
-    assert "job_title" in result.columns
-    assert "monthly_salary" in result.columns
+    assert list(result.columns[:3]) == ["monthly_salary", "occupation", "work_type"]
+    assert list(result.columns[-4:]) == [
+        "job_title",
+        "listing_start_date",
+        "detail_link",
+        "content_hash",
+    ]
+    assert result.iloc[0]["monthly_salary"] == 500000
+    assert result.iloc[0]["job_title"] == "Python開発者"
+    assert result.iloc[0]["preferred_skills"] is None
+    assert result.listing_start_date.dtype == "datetime64[ns]"
 
 
 def test_execute_error_handling(scraping_service, mock_list_scraper):
@@ -94,3 +140,500 @@ def test_execute_error_handling(scraping_service, mock_list_scraper):
         scraping_service.execute()
 
     assert str(exc_info.value) == "Scraping failed"
+
+
+def test_execute_sequentially_isolates_failures(
+    scraping_service, mock_list_scraper, mock_detail_scraper
+):
+    """逐次取得モードで一部のURLが失敗した場合のテスト
+
+    検証内容:
+    1. 失敗したURLのみがスキップされ、残りの詳細ページも取得されること
+    """
+    mock_list_scraper.scrape_all_pages.return_value = [
+        make_job("/jobs/1"),
+        make_job("/jobs/2"),
+        make_job("/jobs/3"),
+    ]
+
+    def scrape_detail(url):
+        if url == "/jobs/2":
+            raise Exception("Not Found")
+        return make_detail()
+
+    mock_detail_scraper.scrape_detail.side_effect = scrape_detail
+
+    result = scraping_service.execute()
+
+    assert mock_detail_scraper.scrape_detail.call_count == 3
+    assert list(result.detail_link) == ["/jobs/1", "/jobs/3"]
+
+
+def test_default_request_rate(scraping_service):
+    """既定のリクエスト頻度が固定のスリープと同じ（約0.33回/秒）であることをテスト
+
+    検証内容:
+    1. RateLimiterの上限と初期値が3秒に1回であること
+    """
+    assert scraping_service.rate_limiter.max_rate == pytest.approx(1 / 3)
+    assert scraping_service.rate_limiter.initial_rate == pytest.approx(1 / 3)
+
+
+@pytest.fixture
+def concurrent_scraping_service(scraper_classes):
+    """並行取得モードのJobScrapingServiceを提供するフィクスチャ"""
+    return JobScrapingService("2024-03-01", max_workers=4, requests_per_second=100)
+
+
+def test_execute_concurrently_keeps_order(
+    concurrent_scraping_service, mock_list_scraper, mock_detail_scraper
+):
+    """並行取得モードのテスト
+
+    検証内容:
+    1. すべての詳細ページが取得されること
+    2. 結果が一覧ページの順序を維持していること
+    """
+    links = [f"/jobs/{i}" for i in range(10)]
+    mock_list_scraper.scrape_all_pages.return_value = [make_job(link) for link in links]
+    mock_detail_scraper.scrape_detail.side_effect = lambda url: make_detail(
+        f"occupation-{url}"
+    )
+
+    result = concurrent_scraping_service.execute()
+
+    assert mock_detail_scraper.scrape_detail.call_count == 10
+    assert list(result.detail_link) == links
+    assert list(result.occupation) == [f"occupation-{link}" for link in links]
+
+
+def test_execute_concurrently_isolates_failures(
+    concurrent_scraping_service, mock_list_scraper, mock_detail_scraper
+):
+    """並行取得モードで一部のURLが失敗した場合のテスト
+
+    検証内容:
+    1. 失敗したURLのみがスキップされ、処理全体は中断されないこと
+    """
+    mock_list_scraper.scrape_all_pages.return_value = [
+        make_job("/jobs/1"),
+        make_job("/jobs/2"),
+        make_job("/jobs/3"),
+    ]
+
+    def scrape_detail(url):
+        if url == "/jobs/2":
+            raise Exception("Not Found")
+        return make_detail()
+
+    mock_detail_scraper.scrape_detail.side_effect = scrape_detail
+
+    result = concurrent_scraping_service.execute()
+
+    assert list(result.detail_link) == ["/jobs/1", "/jobs/3"]
+
+
+@pytest.fixture
+def pipelined_scraping_service(scraper_classes):
+    """パイプラインモードのJobScrapingServiceを提供するフィクスチャ"""
+    return JobScrapingService(
+        "2024-03-01",
+        max_workers=3,
+        requests_per_second=100,
+        pipelined=True,
+        queue_size=2,
+    )
+
+
+def test_execute_pipelined(
+    pipelined_scraping_service, mock_list_scraper, mock_detail_scraper
+):
+    """パイプラインモードのテスト
+
+    検証内容:
+    1. 一覧ページごとの求人が詳細ページのワーカーへ渡されること
+    2. 失敗したURLのみがスキップされること
+    3. 結果が一覧ページの順序を維持していること
+    """
+    pages = [
+        [make_job("/jobs/1"), make_job("/jobs/2")],
+        [make_job("/jobs/3"), make_job("/jobs/4")],
+    ]
+    mock_list_scraper.iter_pages.return_value = iter(pages)
+
+    def scrape_detail(url):
+        if url == "/jobs/3":
+            raise Exception("Not Found")
+        return make_detail(f"occupation-{url}")
+
+    mock_detail_scraper.scrape_detail.side_effect = scrape_detail
+
+    result = pipelined_scraping_service.execute()
+
+    assert list(result.detail_link) == ["/jobs/1", "/jobs/2", "/jobs/4"]
+    assert list(result.occupation) == [
+        "occupation-/jobs/1",
+        "occupation-/jobs/2",
+        "occupation-/jobs/4",
+    ]
+    mock_list_scraper.scrape_all_pages.assert_not_called()
+
+
+def test_execute_pipelined_list_error(
+    pipelined_scraping_service, mock_list_scraper, mock_detail_scraper
+):
+    """パイプラインモードで一覧ページの取得に失敗した場合のテスト
+
+    検証内容:
+    1. 例外が伝播し、ワーカーが停止すること
+    """
+
+    def iter_pages(limit_date):
+        yield [make_job("/jobs/1")]
+        raise Exception("List page failed")
+
+    mock_list_scraper.iter_pages.side_effect = iter_pages
+    mock_detail_scraper.scrape_detail.return_value = make_detail()
+
+    with pytest.raises(Exception) as exc_info:
+        pipelined_scraping_service.execute()
+
+    assert str(exc_info.value) == "List page failed"
+
+
+def test_execute_pipelined_writer_error(
+    pipelined_scraping_service, mock_list_scraper, mock_detail_scraper, mocker
+):
+    """パイプラインモードで書き込みに失敗した場合のテスト
+
+    検証内容:
+    1. 待ち行列が満杯のまま一覧ページの取得が待ち続けないこと
+    2. 書き込みの例外が呼び出し元へ伝播すること
+    """
+    import threading
+
+    pages = [[make_job(f"/jobs/{page}-{i}") for i in range(3)] for page in range(10)]
+    mock_list_scraper.iter_pages.return_value = iter(pages)
+    mock_detail_scraper.scrape_detail.return_value = make_detail()
+    writer = mocker.Mock()
+    writer.write_frame.side_effect = Exception("Upload failed")
+    errors = []
+
+    def run():
+        try:
+            pipelined_scraping_service.execute_to(writer, batch_size=1)
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+
+    assert not thread.is_alive()
+    assert [str(error) for error in errors] == ["Upload failed"]
+
+
+@pytest.mark.usefixtures("scraper_classes")
+def test_execute_skips_known_listings(mock_list_scraper, mock_detail_scraper):
+    """取り込み済みの求人をスキップするテスト
+
+    検証内容:
+    1. 索引に含まれる求人の詳細ページは取得されないこと
+    2. スキップした件数が記録されること
+    """
+    service = JobScrapingService("2024-03-01", known_listing_index={"/jobs/1"})
+
+    mock_list_scraper.scrape_all_pages.return_value = [
+        make_job("/jobs/1"),
+        make_job("/jobs/2"),
+    ]
+    mock_detail_scraper.scrape_detail.return_value = make_detail()
+
+    result = service.execute()
+
+    mock_detail_scraper.scrape_detail.assert_called_once_with("/jobs/2")
+    assert list(result.detail_link) == ["/jobs/2"]
+    assert service.skipped_known_count == 1
+
+
+@pytest.mark.usefixtures("scraper_classes")
+def test_execute_refetches_recent_known_listings(
+    mocker, mock_list_scraper, mock_detail_scraper
+):
+    """取り込み済みでも掲載開始日が新しい求人は再取得するテスト"""
+    mocker.patch(
+        "func_scraper.scraping_service.get_jst_now",
+        return_value=pd.Timestamp("2024-03-10"),
+    )
+    service = JobScrapingService(
+        "2024-03-01",
+        known_listing_index={"/jobs/1", "/jobs/2"},
+        refetch_known_within_days=1,
+    )
+
+    mock_list_scraper.scrape_all_pages.return_value = [
+        make_job("/jobs/1", listing_start_date="2024-03-09"),
+        make_job("/jobs/2", listing_start_date="2024-03-02"),
+    ]
+    mock_detail_scraper.scrape_detail.return_value = make_detail()
+
+    result = service.execute()
+
+    assert list(result.detail_link) == ["/jobs/1"]
+
+
+@pytest.mark.usefixtures("scraper_classes")
+def test_execute_resumes_from_checkpoint(
+    mocker, mock_list_scraper, mock_detail_scraper
+):
+    """チェックポイントからの再開をテスト
+
+    検証内容:
+    1. 一覧ページの取得が完了している場合は一覧ページを再取得しないこと
+    2. 取得済みの詳細ページは再取得せずに結果を再利用すること
+    """
+    checkpoint = mocker.Mock(list_complete=True)
+    checkpoint.get_list_jobs.return_value = [make_job("/jobs/1"), make_job("/jobs/2")]
+    checkpoint.get_detail.side_effect = lambda url: (
+        make_detail("保存済み") if url == "/jobs/1" else None
+    )
+    mock_detail_scraper.scrape_detail.return_value = make_detail("新規")
+    service = JobScrapingService("2024-03-01", checkpoint=checkpoint)
+
+    result = service.execute()
+
+    mock_list_scraper.scrape_all_pages.assert_not_called()
+    mock_detail_scraper.scrape_detail.assert_called_once_with("/jobs/2")
+    assert list(result.occupation) == ["保存済み", "新規"]
+    checkpoint.record_detail.assert_called_once()
+
+
+@pytest.mark.usefixtures("scraper_classes")
+def test_execute_saves_checkpoint_on_error(
+    mocker, mock_list_scraper, mock_detail_scraper
+):
+    """書き出し中にエラーが発生した場合に進捗が保存されることをテスト"""
+    checkpoint = mocker.Mock(list_complete=False)
+    checkpoint.get_detail.return_value = None
+    mock_list_scraper.scrape_all_pages.return_value = [make_job("/jobs/1")]
+    mock_detail_scraper.scrape_detail.return_value = make_detail()
+    writer = mocker.Mock()
+    writer.write_frame.side_effect = Exception("Upload failed")
+    service = JobScrapingService("2024-03-01", checkpoint=checkpoint)
+
+    with pytest.raises(Exception):
+        service.execute_to(writer)
+
+    checkpoint.record_list.assert_called_once()
+    checkpoint.save.assert_called_once()
+
+
+@pytest.mark.usefixtures("scraper_classes")
+def test_execute_pipelined_resumes_from_checkpoint(
+    mocker, mock_list_scraper, mock_detail_scraper
+):
+    """パイプラインモードでのチェックポイントからの再開をテスト
+
+    検証内容:
+    1. 取得済みの一覧ページの次のページから取得を再開すること
+    2. 新たに取得した一覧ページが記録されること
+    """
+    checkpoint = mocker.Mock(list_complete=False, completed_pages=2)
+    checkpoint.list_jobs = [make_job("/jobs/1")]
+    checkpoint.get_list_jobs.return_value = checkpoint.list_jobs
+    checkpoint.get_detail.return_value = None
+    next_page = [make_job("/jobs/2")]
+    mock_list_scraper.iter_pages.return_value = iter([next_page])
+    mock_detail_scraper.scrape_detail.return_value = make_detail()
+    service = JobScrapingService(
+        "2024-03-01", max_workers=2, pipelined=True, checkpoint=checkpoint
+    )
+
+    result = service.execute()
+
+    assert list(result.detail_link) == ["/jobs/1", "/jobs/2"]
+    assert mock_list_scraper.iter_pages.call_args.kwargs["start_page"] == 3
+    checkpoint.record_list_page.assert_called_once_with(3, next_page)
+    checkpoint.mark_list_complete.assert_called_once()
+
+
+def test_execute_with_parse_pool(mocker, scraper_classes, mock_list_scraper):
+    """パースのワーカーを使う場合のテスト
+
+    検証内容:
+    1. ParsePoolがスクレイパーのパーサーとして渡されること
+    2. 実行後にParsePoolが終了されること
+    """
+    list_scraper_class, _ = scraper_classes
+    parse_pool_class = mocker.patch("func_scraper.scraping_service.ParsePool")
+    mock_list_scraper.scrape_all_pages.return_value = []
+
+    service = JobScrapingService("2024-03-01", parse_workers=2, parser_backend="bs4")
+    service.execute()
+
+    parse_pool_class.assert_called_once_with(2, "bs4")
+    assert list_scraper_class.call_args.args[1] is parse_pool_class.return_value
+    parse_pool_class.return_value.close.assert_called_once()
+
+
+@pytest.mark.usefixtures("scraper_classes")
+def test_native_backend_parses_inline(mocker):
+    """GILを解放するパーサーではワーカーを使わないことをテスト
+
+    検証内容:
+    1. lxmlではパースのワーカー数を指定してもParsePoolが作成されないこと
+    """
+    parse_pool_class = mocker.patch("func_scraper.scraping_service.ParsePool")
+
+    service = JobScrapingService("2024-03-01", parse_workers=2, parser_backend="lxml")
+
+    parse_pool_class.assert_not_called()
+    assert service.parse_pool is None
+
+
+@pytest.mark.usefixtures("scraper_classes")
+def test_sequential_parse_overlaps_fetch(
+    mocker, mock_list_scraper, mock_detail_scraper
+):
+    """逐次取得でパースの完了を待たずに次のページを取得することをテスト
+
+    検証内容:
+    1. 先に取得したページのパースが終わる前に次のページを取得すること
+    2. パースが完了した後、一覧の順にレコードが返されること
+    """
+    mocker.patch("func_scraper.scraping_service.ParsePool")
+    jobs = [make_job(f"/jobs/{i}") for i in range(3)]
+    mock_list_scraper.scrape_all_pages.return_value = jobs
+    futures = [Future() for _ in jobs]
+    pending_at_submit = []
+
+    def submit_detail(url):
+        index = len(pending_at_submit)
+        pending_at_submit.append(sum(not f.done() for f in futures[:index]))
+        if index == len(jobs) - 1:
+            for i, future in enumerate(futures):
+                future.set_result(make_detail(occupation=f"職種{i}"))
+        return futures[index]
+
+    mock_detail_scraper.submit_detail.side_effect = submit_detail
+    service = JobScrapingService("2024-03-01", parse_workers=1, parser_backend="bs4")
+
+    result = service.execute()
+
+    assert pending_at_submit == [0, 1, 2]
+    assert list(result.detail_link) == [job.detail_link for job in jobs]
+    assert list(result.occupation) == ["職種0", "職種1", "職種2"]
+
+
+def test_execute_to_writes_in_batches(
+    concurrent_scraping_service, mock_list_scraper, mock_detail_scraper, mocker
+):
+    """取得したレコードを順に書き出す場合のテスト
+
+    検証内容:
+    1. batch_size 件ごとに writer へ書き出されること
+    2. 書き出した件数が返されること
+    """
+    links = [f"/jobs/{i}" for i in range(5)]
+    mock_list_scraper.scrape_all_pages.return_value = [make_job(link) for link in links]
+    mock_detail_scraper.scrape_detail.return_value = make_detail()
+    writer = mocker.Mock()
+
+    record_count = concurrent_scraping_service.execute_to(writer, batch_size=2)
+
+    assert record_count == 5
+    frames = [call.args[0] for call in writer.write_frame.call_args_list]
+    assert [len(frame) for frame in frames] == [2, 2, 1]
+    assert [link for frame in frames for link in frame.detail_link] == links
+
+
+@pytest.fixture
+def entry_point(mocker, mock_list_scraper, mock_detail_scraper):
+    """scraping() の依存をモック化するフィクスチャ
+
+    メッセージの処理状況・チェックポイント・書き出し先をモックに置き換え、
+    スクレイピングは mock_list_scraper・mock_detail_scraper で行う。
+    """
+    from flask import Flask
+    from func_scraper import main
+
+    # エントリーポイントはデプロイ時と同じく scraping_service として読み込む
+    mocker.patch("scraping_service.JobListScraper", return_value=mock_list_scraper)
+    mocker.patch("scraping_service.JobDetailScraper", return_value=mock_detail_scraper)
+    mocker.patch.object(main, "get_data_bucket_name", return_value="test-bucket")
+    processor = mocker.patch.object(main, "MessageProcessor").return_value
+    processor.is_message_processed.return_value = False
+    checkpoint = mocker.patch("utils.checkpoint.ScrapeCheckpoint.load").return_value
+    checkpoint.get_detail.return_value = None
+    checkpoint.list_complete = False
+    writer = mocker.MagicMock()
+    writer.commit.return_value = "raw/2024-03-01.csv"
+    mocker.patch("shared.gcs_utils.create_stream_writer", return_value=writer)
+
+    request = mocker.Mock(is_json=True)
+    request.get_json.return_value = {
+        "message": {
+            "messageId": "message-1",
+            "data": base64.b64encode(
+                json.dumps({"type": "daily_scraping"}).encode()
+            ).decode(),
+        },
+        "subscription": "projects/test-project/subscriptions/scraping",
+    }
+    with Flask(__name__).app_context():
+        yield main.scraping, request, processor, checkpoint, writer
+
+
+def test_scraping_streams_to_writer(
+    entry_point, mock_list_scraper, mock_detail_scraper
+):
+    """エントリーポイントから取得した求人を書き出す場合のテスト
+
+    検証内容:
+    1. 取得した求人が writer へ書き出され、書き出し後に commit されること
+    2. 成功した場合はチェックポイントが削除されること
+    3. 書き出した件数と保存先がメッセージの処理結果として記録されること
+    """
+    scraping, request, processor, checkpoint, writer = entry_point
+    mock_list_scraper.scrape_all_pages.return_value = [
+        make_job("/jobs/1"),
+        make_job("/jobs/2"),
+    ]
+    mock_detail_scraper.scrape_detail.return_value = make_detail()
+
+    response, status = scraping(request)
+
+    assert status == 200
+    assert response.get_json()["status"] == "success"
+    assert response.get_json()["record_count"] == 2
+    frames = [call.args[0] for call in writer.write_frame.call_args_list]
+    assert [link for frame in frames for link in frame.detail_link] == [
+        "/jobs/1",
+        "/jobs/2",
+    ]
+    writer.commit.assert_called_once()
+    checkpoint.clear.assert_called_once()
+    result = processor.mark_message_as_processed.call_args.args[1]
+    assert result["record_count"] == 2
+    assert result["saved_path"] == "raw/2024-03-01.csv"
+
+
+def test_scraping_keeps_checkpoint_on_error(entry_point, mock_list_scraper):
+    """エントリーポイントでスクレイピングに失敗した場合のテスト
+
+    検証内容:
+    1. 書き出し途中のファイルが commit されないこと
+    2. 再実行で再開できるようチェックポイントが削除されないこと
+    3. メッセージが処理済みとして記録されず、エラーが200で返されること
+    """
+    scraping, request, processor, checkpoint, writer = entry_point
+    mock_list_scraper.scrape_all_pages.side_effect = Exception("Scraping failed")
+
+    response, status = scraping(request)
+
+    assert status == 200
+    assert response.get_json() == {"status": "error", "message": "Scraping failed"}
+    writer.commit.assert_not_called()
+    checkpoint.clear.assert_not_called()
+    checkpoint.save.assert_called_once()
+    processor.mark_message_as_processed.assert_not_called()
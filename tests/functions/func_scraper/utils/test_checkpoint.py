@@ -0,0 +1,187 @@
+import json
+from dataclasses import asdict
+from datetime import datetime
+
+import pytest
+from func_scraper.utils.checkpoint import ScrapeCheckpoint
+from func_scraper.utils.models import (
+    JobBasicData,
+    JobDetailData,
+    JobListData,
+    JobTableData,
+)
+from google.api_core.exceptions import NotFound, PreconditionFailed
+from shared.gcp_clients import STORAGE, set_client
+
+
+def make_detail(monthly_salary):
+    """詳細ページのデータを作成"""
+    return JobDetailData(
+        basic=JobBasicData(
+            monthly_salary, "データエンジニア", "業務委託", "東京都", "IT"
+        ),
+        table=JobTableData(required_skills="Python"),
+    )
+
+
+class FakeBlob:
+    """メモリ上のバケットに保存するGCSブロブ"""
+
+    def __init__(self, objects, name):
+        self._objects = objects
+        self.name = name
+
+    def upload_from_string(self, data, content_type=None, if_generation_match=None):
+        if if_generation_match == 0 and self.name in self._objects:
+            raise PreconditionFailed(self.name)
+        self._objects[self.name] = data.encode("utf-8")
+
+    def download_as_bytes(self):
+        if self.name not in self._objects:
+            raise NotFound(self.name)
+        return self._objects[self.name]
+
+    def delete(self):
+        if self._objects.pop(self.name, None) is None:
+            raise NotFound(self.name)
+
+
+class FakeBucket:
+    """オブジェクト名と内容を辞書で保持するGCSバケット"""
+
+    def __init__(self):
+        self.objects = {}
+
+    def blob(self, name):
+        return FakeBlob(self.objects, name)
+
+    def list_blobs(self, prefix=""):
+        return [
+            FakeBlob(self.objects, name)
+            for name in sorted(self.objects)
+            if name.startswith(prefix)
+        ]
+
+
+@pytest.fixture
+def bucket(mocker):
+    """チェックポイントを保存するバケット"""
+    bucket = FakeBucket()
+    mock_client = mocker.MagicMock()
+    mock_client.bucket.return_value = bucket
+    set_client(STORAGE, mock_client)
+    return bucket
+
+
+def test_load_without_checkpoint(bucket):
+    """チェックポイントが存在しない場合に空の状態で開始することをテスト"""
+    checkpoint = ScrapeCheckpoint.load("test-bucket", "2025-01-01")
+
+    assert checkpoint.completed_pages == 0
+    assert checkpoint.list_complete is False
+    assert checkpoint.records == {}
+
+
+def test_save_and_resume(bucket):
+    """進捗の保存と再開をテスト
+
+    検証内容:
+    1. 一覧ページごとに、そのページの求人のみを新しいオブジェクトとして保存すること
+    2. 詳細ページは interval 件ごとに、未保存の結果のみを保存してメモリから破棄すること
+    3. 保存した内容から一覧ページと詳細ページの結果が復元されること
+    4. 再開後の保存は既存のオブジェクトを上書きしないこと
+    """
+    prefix = "checkpoints/scraper/limit_date=2025-01-01/"
+    checkpoint = ScrapeCheckpoint("test-bucket", "2025-01-01", interval=2)
+    jobs = [
+        JobListData("a", datetime(2025, 1, 2), "/jobs/1"),
+        JobListData("b", datetime(2025, 1, 1), "/jobs/2"),
+    ]
+    checkpoint.record_list_page(1, jobs[:1])
+    checkpoint.record_list_page(2, jobs[1:])
+    checkpoint.record_detail("/jobs/1", make_detail(500000))
+    assert len(bucket.objects) == 2
+    checkpoint.record_detail("/jobs/2", make_detail(600000))
+    checkpoint.record_detail("/jobs/3", make_detail(700000))
+    checkpoint.save()
+
+    assert sorted(bucket.objects) == [
+        f"{prefix}details/000003.json",
+        f"{prefix}details/000004.json",
+        f"{prefix}list/000001.json",
+        f"{prefix}list/000002.json",
+    ]
+    assert list(json.loads(bucket.objects[f"{prefix}details/000004.json"])) == [
+        "/jobs/3"
+    ]
+    assert checkpoint._unsaved == {}
+    assert checkpoint.done_links == {"/jobs/1", "/jobs/2", "/jobs/3"}
+
+    resumed = ScrapeCheckpoint.load("test-bucket", "2025-01-01", interval=1)
+
+    assert resumed.completed_pages == 2
+    assert resumed.list_complete is False
+    # チェックポイントのモジュールは utils.models を読み込むため、値で比較する
+    assert [asdict(job) for job in resumed.get_list_jobs()] == [
+        asdict(job) for job in jobs
+    ]
+    assert asdict(resumed.get_detail("/jobs/2")) == asdict(make_detail(600000))
+    # 取り出した結果は破棄される
+    assert resumed.get_detail("/jobs/2") is None
+    assert resumed.get_detail("/jobs/4") is None
+
+    resumed.mark_list_complete()
+    resumed.record_detail("/jobs/4", make_detail(800000))
+    assert f"{prefix}list/000005.json" in bucket.objects
+    assert f"{prefix}details/000006.json" in bucket.objects
+    assert ScrapeCheckpoint.load("test-bucket", "2025-01-01").list_complete is True
+
+
+def test_record_list_replaces_pages(bucket):
+    """一覧ページをまとめて記録した場合に、それまでのページと置き換えることをテスト"""
+    checkpoint = ScrapeCheckpoint("test-bucket", "2025-01-01")
+    checkpoint.record_list_page(1, [JobListData("a", datetime(2025, 1, 2), "/jobs/1")])
+    jobs = [
+        JobListData("a", datetime(2025, 1, 2), "/jobs/1"),
+        JobListData("b", datetime(2025, 1, 1), "/jobs/2"),
+    ]
+    checkpoint.record_list(jobs)
+
+    resumed = ScrapeCheckpoint.load("test-bucket", "2025-01-01")
+
+    assert resumed.list_complete is True
+    assert [job.detail_link for job in resumed.get_list_jobs()] == [
+        "/jobs/1",
+        "/jobs/2",
+    ]
+
+
+def test_load_incompatible_checkpoint(bucket):
+    """形式の異なるチェックポイントは使わずに最初から開始することをテスト"""
+    prefix = "checkpoints/scraper/limit_date=2025-01-01/"
+    bucket.objects[f"{prefix}list/000001.json"] = json.dumps(
+        {"completed_pages": 3, "list_complete": True, "list_rows": []}
+    ).encode("utf-8")
+
+    checkpoint = ScrapeCheckpoint.load("test-bucket", "2025-01-01")
+
+    assert checkpoint.completed_pages == 0
+    assert checkpoint.list_complete is False
+    assert bucket.objects == {}
+
+
+def test_clear(bucket):
+    """完了後にこの制限日と過去の制限日のチェックポイントが削除されることをテスト"""
+    for name in [
+        "checkpoints/scraper/limit_date=2024-12-30.json",
+        "checkpoints/scraper/limit_date=2024-12-31/list/000001.json",
+        "checkpoints/scraper/limit_date=2025-01-01/details/000001.json",
+        "checkpoints/scraper/limit_date=2025-01-02/list/000001.json",
+    ]:
+        bucket.objects[name] = b"{}"
+
+    ScrapeCheckpoint("test-bucket", "2025-01-01").clear()
+
+    assert list(bucket.objects) == [
+        "checkpoints/scraper/limit_date=2025-01-02/list/000001.json"
+    ]
@@ -0,0 +1,65 @@
+import pytest
+from func_scraper.utils.html_archive import HtmlArchive, HtmlArchiveReader
+from func_scraper.utils.http_client import LocalCacheStorage
+
+
+def test_store_and_read(tmp_path):
+    """HTMLの保存と読み込みをテスト
+
+    検証内容:
+    1. 同じ内容のページは1つのオブジェクトとして保存されること
+    2. マニフェストにURLとページの種類が取得した順に記録されること
+    3. 保存した本文を展開して読み込めること
+    """
+    storage = LocalCacheStorage(str(tmp_path))
+    archive = HtmlArchive(storage, fetch_date="20240302")
+
+    sha256 = archive.store(
+        "/item/page/1/?sort=new", "list", "<html>一覧</html>".encode()
+    )
+    archive.store("/item/1001/", "detail", b"<html>detail</html>")
+    archive.store("/item/1002/", "detail", b"<html>detail</html>")
+    archive.flush()
+
+    assert archive.get_stats() == {"stored": 2, "deduplicated": 1, "entries": 3}
+    assert len(list((tmp_path / "objects").rglob("*.html.gz"))) == 2
+
+    reader = HtmlArchiveReader(storage)
+    entries = reader.read_manifest("20240302")
+    assert [(entry.url, entry.page_type) for entry in entries] == [
+        ("/item/page/1/?sort=new", "list"),
+        ("/item/1001/", "detail"),
+        ("/item/1002/", "detail"),
+    ]
+    assert reader.read(sha256).decode() == "<html>一覧</html>"
+    assert reader.read_manifest("20240303") == []
+
+
+def test_rerun_on_same_date(tmp_path):
+    """同じ取得日に再実行した場合のテスト
+
+    検証内容:
+    1. 既存のマニフェストに追記されること
+    2. 同じURLは新しい取得で置き換えられること
+    """
+    storage = LocalCacheStorage(str(tmp_path))
+    first = HtmlArchive(storage, fetch_date="20240302")
+    first.store("/item/1001/", "detail", b"old")
+    first.flush()
+
+    second = HtmlArchive(storage, fetch_date="20240302")
+    new_sha256 = second.store("/item/1001/", "detail", b"new")
+    second.store("/item/1002/", "detail", b"other")
+    second.flush()
+
+    entries = HtmlArchiveReader(storage).read_manifest("20240302")
+    assert [entry.url for entry in entries] == ["/item/1001/", "/item/1002/"]
+    assert entries[0].sha256 == new_sha256
+
+
+def test_store_unknown_page_type(tmp_path):
+    """未知のページの種類を指定した場合にエラーとなることをテスト"""
+    archive = HtmlArchive(LocalCacheStorage(str(tmp_path)), fetch_date="20240302")
+
+    with pytest.raises(ValueError, match="Unknown page type"):
+        archive.store("/item/1001/", "unknown", b"")
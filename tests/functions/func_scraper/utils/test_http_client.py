@@ -1,5 +1,16 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
 import pytest
-from func_scraper.utils.http_client import HttpClient
+from func_scraper.utils.http_client import (
+    AsyncHttpClient,
+    HttpClient,
+    LocalCacheStorage,
+    ResponseCache,
+)
 from requests.exceptions import RequestException
 
 
@@ -8,16 +19,18 @@ def test_get_with_absolute_url(mocker):
     # google-cloud-logging の初期化をモック化
     mocker.patch("google.cloud.logging.Client")
 
-    mock_response = mocker.Mock()
+    mock_response = mocker.Mock(content=b"")
     mock_response.encoding = None
-    mock_get = mocker.patch("requests.get", return_value=mock_response)
+    mock_get = mocker.patch("requests.Session.get", return_value=mock_response)
 
     client = HttpClient("https://example.com")
     url = "https://another-example.com/path"
     client.get(url)
 
     # 最後のコールのみを検証
-    assert mock_get.call_args_list[-1] == mocker.call(url)
+    assert mock_get.call_args_list[-1] == mocker.call(
+        url, timeout=client.timeout, headers={}
+    )
 
 
 def test_get_with_relative_url(mocker):
@@ -25,9 +38,9 @@ def test_get_with_relative_url(mocker):
     # google-cloud-logging の初期化をモック化
     mocker.patch("google.cloud.logging.Client")
 
-    mock_response = mocker.Mock()
+    mock_response = mocker.Mock(content=b"")
     mock_response.encoding = None
-    mock_get = mocker.patch("requests.get", return_value=mock_response)
+    mock_get = mocker.patch("requests.Session.get", return_value=mock_response)
 
     base_url = "https://example.com"
     path = "/api/data"
@@ -36,12 +49,14 @@ def test_get_with_relative_url(mocker):
 
     expected_url = f"{base_url}{path}"
     # 最後のコールのみを検証
-    assert mock_get.call_args_list[-1] == mocker.call(expected_url)
+    assert mock_get.call_args_list[-1] == mocker.call(
+        expected_url, timeout=client.timeout, headers={}
+    )
 
 
 def test_get_request_error(mocker):
     """リクエストエラーのハンドリングをテスト"""
-    mocker.patch("requests.get", side_effect=RequestException("Network error"))
+    mocker.patch("requests.Session.get", side_effect=RequestException("Network error"))
 
     client = HttpClient("https://example.com")
 
@@ -49,3 +64,202 @@ def test_get_request_error(mocker):
         client.get("/test")
 
     assert "Network error" in str(exc_info.value)
+
+
+def test_session_configuration(mocker):
+    """コネクションプールとタイムアウトの設定をテスト
+
+    検証内容:
+    1. 同一クライアントのリクエストでSessionが再利用されること
+    2. 指定したプールサイズとタイムアウトが設定されること
+    3. 圧縮転送を受け付けるヘッダーが付与されること
+    """
+    mocker.patch("google.cloud.logging.Client")
+
+    client = HttpClient(
+        "https://example.com", pool_size=20, connect_timeout=3, read_timeout=10
+    )
+
+    adapter = client.session.get_adapter("https://example.com/")
+    assert adapter._pool_maxsize == 20
+    assert client.timeout == (3, 10)
+    assert "gzip" in client.session.headers["Accept-Encoding"]
+
+
+def test_async_get_with_relative_url(mocker):
+    """非同期クライアントでのGETリクエストをテスト"""
+    mocker.patch("google.cloud.logging.Client")
+
+    requested_urls = []
+
+    def handler(request):
+        requested_urls.append(str(request.url))
+        return httpx.Response(200, content="求人一覧".encode("utf-8"))
+
+    async def run():
+        async with AsyncHttpClient("https://example.com", http2=False) as client:
+            client.client._transport = httpx.MockTransport(handler)
+            return await client.get("/item/page/1/")
+
+    response = asyncio.run(run())
+
+    assert requested_urls == ["https://example.com/item/page/1/"]
+    assert response.text == "求人一覧"
+
+
+def test_get_retries_on_429_with_rate_limiter(mocker):
+    """RateLimiter設定時に429を受けた場合の再試行をテスト
+
+    検証内容:
+    1. 429の後に再試行され、成功したレスポンスが返されること
+    2. 各レスポンスの結果がRateLimiterに通知されること
+    """
+    mocker.patch("google.cloud.logging.Client")
+
+    throttled = mocker.Mock(status_code=429, headers={"Retry-After": "1"})
+    ok = mocker.Mock(status_code=200, headers={}, content=b"")
+    mocker.patch("requests.Session.get", side_effect=[throttled, ok])
+    rate_limiter = mocker.Mock()
+
+    client = HttpClient(
+        "https://example.com", rate_limiter=rate_limiter, respect_robots_txt=False
+    )
+    response = client.get("/item/1")
+
+    assert response is ok
+    assert rate_limiter.acquire.call_count == 2
+    first_call = rate_limiter.record_response.call_args_list[0]
+    assert first_call.args[1] == 429
+    assert first_call.args[3] == "1"
+
+
+def test_get_applies_robots_crawl_delay(mocker):
+    """robots.txtのCrawl-delayがRateLimiterに反映されることをテスト"""
+    mocker.patch("google.cloud.logging.Client")
+
+    robots = mocker.Mock(status_code=200, text="User-agent: *\nCrawl-delay: 7\n")
+    page = mocker.Mock(status_code=200, headers={}, content=b"")
+    mock_get = mocker.patch("requests.Session.get", side_effect=[robots, page, page])
+    rate_limiter = mocker.Mock()
+
+    client = HttpClient("https://example.com", rate_limiter=rate_limiter)
+    client.get("/item/1")
+    client.get("/item/2")
+
+    # robots.txtはホストごとに一度だけ取得されること
+    assert mock_get.call_args_list[0].args[0] == "https://example.com/robots.txt"
+    assert mock_get.call_count == 3
+    rate_limiter.set_crawl_delay.assert_called_once_with(
+        "https://example.com/item/1", 7.0
+    )
+
+
+def test_get_fetches_robots_once_concurrently(mocker):
+    """並行するリクエストでもrobots.txtを一度だけ取得し、反映後に本体を取得することをテスト"""
+    mocker.patch("google.cloud.logging.Client")
+
+    robots_applied = threading.Event()
+    fetched_before_robots = []
+
+    def session_get(url, **kwargs):
+        if url.endswith("/robots.txt"):
+            # 他のスレッドが追い越せるよう、取得に時間をかける
+            time.sleep(0.05)
+            return mocker.Mock(status_code=200, text="User-agent: *\nCrawl-delay: 7\n")
+        if not robots_applied.is_set():
+            fetched_before_robots.append(url)
+        return mocker.Mock(status_code=200, headers={}, content=b"")
+
+    mock_get = mocker.patch("requests.Session.get", side_effect=session_get)
+    rate_limiter = mocker.Mock()
+    rate_limiter.set_crawl_delay.side_effect = lambda *args: robots_applied.set()
+
+    client = HttpClient("https://example.com", rate_limiter=rate_limiter)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(client.get, [f"/item/{i}" for i in range(8)]))
+
+    robots_calls = [
+        call for call in mock_get.call_args_list if call.args[0].endswith("/robots.txt")
+    ]
+    assert len(robots_calls) == 1
+    assert fetched_before_robots == []
+    rate_limiter.set_crawl_delay.assert_called_once()
+
+
+def make_response(mocker, status_code, content=b"", headers=None):
+    """requests.Responseのモックを作成"""
+    response = mocker.Mock(status_code=status_code, content=content)
+    response.headers = headers or {}
+    return response
+
+
+def test_conditional_get_served_from_cache(mocker, tmp_path):
+    """条件付きGETのキャッシュをテスト
+
+    検証内容:
+    1. 初回はバリデータ付きのレスポンスが保存されること
+    2. 2回目はIf-None-Match/If-Modified-Sinceが送信されること
+    3. 304の場合はキャッシュ済みの本文が200として返されること
+    4. ヒット・ミスの件数が記録されること
+    """
+    mocker.patch("google.cloud.logging.Client")
+
+    validators = {"ETag": '"abc"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"}
+    fresh = make_response(mocker, 200, "求人詳細".encode("utf-8"), validators)
+    not_modified = make_response(mocker, 304, headers=validators)
+    mock_get = mocker.patch("requests.Session.get", side_effect=[fresh, not_modified])
+
+    cache = ResponseCache(LocalCacheStorage(str(tmp_path)))
+    client = HttpClient("https://example.com", cache=cache)
+    client.get("/item/1")
+    response = client.get("/item/1")
+
+    assert mock_get.call_args_list[1].kwargs["headers"] == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT",
+    }
+    assert response.status_code == 200
+    assert response.text == "求人詳細"
+    stats = cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_response_cache_lru_eviction(mocker, tmp_path):
+    """サイズ上限を超えた場合のLRU削除をテスト"""
+    mocker.patch("google.cloud.logging.Client")
+
+    storage = LocalCacheStorage(str(tmp_path))
+    cache = ResponseCache(storage, max_bytes=10)
+    headers = {"ETag": '"v1"'}
+    cache.store("https://example.com/a", make_response(mocker, 200, b"aaaa", headers))
+    cache.store("https://example.com/b", make_response(mocker, 200, b"bbbb", headers))
+    # aを参照して最近使われたエントリにする
+    assert cache.load("https://example.com/a") == b"aaaa"
+    cache.store("https://example.com/c", make_response(mocker, 200, b"cccc", headers))
+
+    assert cache.conditional_headers("https://example.com/b") == {}
+    assert cache.conditional_headers("https://example.com/a") == {
+        "If-None-Match": '"v1"'
+    }
+    assert cache.get_stats()["evictions"] == 1
+    assert cache.get_stats()["size_bytes"] == 8
+
+
+def test_response_cache_index_persisted(mocker, tmp_path):
+    """flushしたエントリの一覧が次回の実行で読み込まれることをテスト"""
+    mocker.patch("google.cloud.logging.Client")
+
+    storage = LocalCacheStorage(str(tmp_path))
+    cache = ResponseCache(storage)
+    cache.store(
+        "https://example.com/a",
+        make_response(mocker, 200, b"body", {"Last-Modified": "yesterday"}),
+    )
+    cache.flush()
+
+    reloaded = ResponseCache(storage)
+    assert reloaded.conditional_headers("https://example.com/a") == {
+        "If-Modified-Since": "yesterday"
+    }
+    assert reloaded.load("https://example.com/a") == b"body"
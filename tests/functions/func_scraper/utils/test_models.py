@@ -1,4 +1,14 @@
-from func_scraper.utils.models import JobBasicData, JobListData, JobTableData
+from datetime import datetime
+
+from func_scraper.utils.models import (
+    JobBasicData,
+    JobDetailData,
+    JobListData,
+    JobRecord,
+    JobTableData,
+    build_job_dataframe,
+    compute_content_hash,
+)
 
 
 def test_job_list_data_creation():
@@ -10,12 +20,12 @@ def test_job_list_data_creation():
     """
     data = JobListData(
         job_title="Python開発者",
-        listing_start_date="2024年3月1日",
+        listing_start_date=datetime(2024, 3, 1),
         detail_link="/jobs/123",
     )
 
     assert data.job_title == "Python開発者"
-    assert data.listing_start_date == "2024年3月1日"
+    assert data.listing_start_date == datetime(2024, 3, 1)
     assert data.detail_link == "/jobs/123"
 
 
@@ -77,3 +87,85 @@ def test_job_table_data_creation():
     )
     assert data3.framework == "Django"
     assert data3.rate_of_work == "100%"
+
+
+def test_build_job_dataframe():
+    """レコードからのDataFrame作成をテスト
+
+    検証内容:
+    1. 基本情報・テーブルデータ・一覧ページのデータ・内容のハッシュの順に列が並ぶこと
+    2. レコードごとに1行が作成され、型が変換されること
+    """
+    records = [
+        JobRecord(
+            detail=JobDetailData(
+                basic=JobBasicData(
+                    monthly_salary=500000 + i,
+                    occupation="システムエンジニア",
+                    work_type="正社員",
+                    work_location="東京都",
+                    industry="IT・通信",
+                ),
+                table=JobTableData(job_content="Webアプリケーション開発"),
+            ),
+            listing=JobListData(
+                job_title=f"求人{i}",
+                listing_start_date=datetime(2024, 3, 1 + i),
+                detail_link=f"/jobs/{i}",
+            ),
+        )
+        for i in range(2)
+    ]
+
+    df = build_job_dataframe(records)
+
+    assert list(df.columns[:2]) == ["monthly_salary", "occupation"]
+    assert list(df.columns[5:7]) == ["job_content", "required_skills"]
+    assert list(df.columns[-4:]) == [
+        "job_title",
+        "listing_start_date",
+        "detail_link",
+        "content_hash",
+    ]
+    assert list(df.detail_link) == ["/jobs/0", "/jobs/1"]
+    assert df.monthly_salary.dtype == "int64"
+    assert df.listing_start_date.dtype == "datetime64[ns]"
+    assert df.iloc[1]["required_skills"] is None
+
+
+def test_compute_content_hash():
+    """求人の内容のハッシュをテスト
+
+    検証内容:
+    1. 同じ内容であれば同じ値になること（掲載開始日の時刻は含まない）
+    2. 内容が変わると値が変わること
+    """
+
+    def make_record(monthly_salary=500000, listing_start_date=datetime(2024, 3, 1)):
+        return JobRecord(
+            detail=JobDetailData(
+                basic=JobBasicData(
+                    monthly_salary=monthly_salary,
+                    occupation="システムエンジニア",
+                    work_type="正社員",
+                    work_location="東京都",
+                    industry="IT・通信",
+                ),
+                table=JobTableData(job_content="Webアプリケーション開発"),
+            ),
+            listing=JobListData(
+                job_title="求人",
+                listing_start_date=listing_start_date,
+                detail_link="/jobs/1",
+            ),
+        )
+
+    content_hash = compute_content_hash(make_record())
+
+    assert len(content_hash) == 64
+    assert compute_content_hash(make_record()) == content_hash
+    assert (
+        compute_content_hash(make_record(listing_start_date=datetime(2024, 3, 1, 9)))
+        == content_hash
+    )
+    assert compute_content_hash(make_record(monthly_salary=510000)) != content_hash
@@ -0,0 +1,93 @@
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict
+from pathlib import Path
+
+import pytest
+from func_scraper.utils.parse_pool import (
+    ParsePool,
+    available_cpu_count,
+    resolve_parse_workers,
+    uses_parse_pool,
+)
+from func_scraper.utils.parsers import JobDataParser
+
+FIXTURES_DIR = Path(__file__).parents[1] / "fixtures" / "html"
+
+
+def make_response(mocker, name):
+    """フィクスチャのHTMLを本文に持つレスポンスを作成"""
+    return mocker.Mock(content=(FIXTURES_DIR / name).read_bytes())
+
+
+def test_parse_pool_matches_parser(mocker):
+    """ワーカーでのパース結果が同じスレッドでのパース結果と一致することをテスト
+
+    検証内容:
+    1. fork を使わずにワーカープロセスが起動されること
+    2. 一覧ページ・詳細ページのパース結果が JobDataParser と一致すること
+    3. submit_detail_page が完了を待たずに Future を返し、同じ結果になること
+    """
+    parser = JobDataParser("bs4")
+    list_page = make_response(mocker, "list_page.html")
+    detail_page = make_response(mocker, "detail_page.html")
+
+    with ParsePool(2, "bs4") as pool:
+        assert isinstance(pool._executor, ProcessPoolExecutor)
+        assert pool._executor._mp_context.get_start_method() in (
+            "forkserver",
+            "spawn",
+        )
+        jobs = pool.parse_list_page(list_page)
+        detail = pool.parse_detail_page(detail_page)
+        submitted = pool.submit_detail_page(detail_page)
+        assert isinstance(submitted, Future)
+        submitted_detail = submitted.result()
+
+    expected = asdict(parser.parse_detail_page(detail_page))
+    assert [asdict(job) for job in jobs] == [
+        asdict(job) for job in parser.parse_list_page(list_page)
+    ]
+    assert asdict(detail) == expected
+    assert asdict(submitted_detail) == expected
+
+
+@pytest.mark.parametrize(
+    "backend, workers, expected",
+    [("bs4", 2, True), ("lxml", 2, False), ("selectolax", 2, False), ("bs4", 0, False)],
+)
+def test_uses_parse_pool(backend, workers, expected):
+    """ワーカーでパースするかの判定をテスト（GILを解放する実装ではその場でパースする）"""
+    assert uses_parse_pool(backend, workers) is expected
+
+
+def test_parse_pool_back_pressure(mocker):
+    """パース待ちの本文が上限に達すると取得側が待たされることをテスト"""
+    pool = ParsePool(1, "bs4", max_pending=1)
+    # パースが終わらない状態を作るため、ワーカーを待機するだけの処理に置き換える
+    release = threading.Event()
+    pool._parse_detail = lambda content: release.wait(5)
+    pool._executor.shutdown()
+    pool._executor = ThreadPoolExecutor(max_workers=1)
+
+    first = threading.Thread(
+        target=pool.parse_detail_page, args=(mocker.Mock(content=b""),)
+    )
+    first.start()
+    while pool._pending._value != 0:
+        time.sleep(0.01)
+
+    # 上限に達している間は新たな本文を受け付けない
+    assert pool._pending.acquire(blocking=False) is False
+    release.set()
+    first.join()
+    assert pool._pending.acquire(blocking=False) is True
+    pool.close()
+
+
+def test_resolve_parse_workers():
+    """パースのワーカー数の設定値の解釈をテスト"""
+    assert resolve_parse_workers(None) == 0
+    assert resolve_parse_workers("3") == 3
+    assert resolve_parse_workers("auto") == available_cpu_count()
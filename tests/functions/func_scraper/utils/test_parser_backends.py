@@ -0,0 +1,72 @@
+from pathlib import Path
+
+import pytest
+from func_scraper.utils.parser_backends import (
+    Bs4Backend,
+    available_backends,
+    get_parser_backend,
+)
+from func_scraper.utils.parsers import JobDataParser
+
+FIXTURES_DIR = Path(__file__).parents[1] / "fixtures" / "html"
+LIST_PAGES = sorted(FIXTURES_DIR.glob("list_page*.html"))
+DETAIL_PAGES = sorted(FIXTURES_DIR.glob("detail_page*.html"))
+
+# bs4は部分木に制限したパース
+BACKENDS = ["bs4", "lxml", "selectolax"]
+
+
+def parse(backend, method, path, as_bytes):
+    """フィクスチャを指定の実装でパース（reference はbs4で文書全体をパース）"""
+    parser = JobDataParser("bs4")
+    if backend == "reference":
+        parser.backend = Bs4Backend(restricted=False)
+    else:
+        parser.backend = get_parser_backend(backend)
+    response = type("Response", (), {})()
+    response.content = path.read_bytes() if as_bytes else path.read_text("utf-8")
+    return getattr(parser, method)(response)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("as_bytes", [True, False])
+@pytest.mark.parametrize("path", LIST_PAGES, ids=lambda path: path.name)
+def test_list_page_matches_reference(backend, path, as_bytes):
+    """一覧ページのパース結果が文書全体をパースした場合と一致することをテスト"""
+    expected = parse("reference", "parse_list_page", path, as_bytes)
+    actual = parse(backend, "parse_list_page", path, as_bytes)
+
+    assert len(expected) > 0
+    assert actual == expected
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("as_bytes", [True, False])
+@pytest.mark.parametrize("path", DETAIL_PAGES, ids=lambda path: path.name)
+def test_detail_page_matches_reference(backend, path, as_bytes):
+    """詳細ページのパース結果が文書全体をパースした場合と一致することをテスト"""
+    expected = parse("reference", "parse_detail_page", path, as_bytes)
+    actual = parse(backend, "parse_detail_page", path, as_bytes)
+
+    assert actual == expected
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_detail_page_without_job_box(backend):
+    """基本情報がない詳細ページはどの実装でもエラーになることをテスト"""
+    response = type("Response", (), {"content": "<html><table></table></html>"})()
+
+    with pytest.raises(Exception):
+        JobDataParser(backend).parse_detail_page(response)
+
+
+def test_unknown_backend():
+    """未知の実装を指定した場合にエラーになることをテスト"""
+    with pytest.raises(ValueError):
+        get_parser_backend("html5lib")
+
+
+def test_auto_backend_prefers_fastest():
+    """autoの場合にインストール済みの最も高速な実装が選ばれることをテスト"""
+    assert available_backends() == ["selectolax", "lxml", "bs4"]
+    assert get_parser_backend("auto").name == "selectolax"
@@ -1,4 +1,5 @@
-import pandas as pd
+from datetime import datetime
+
 import pytest
 from func_scraper.utils.parsers import JobDataParser
 
@@ -44,15 +45,12 @@ def test_parse_list_page(mocker, list_page_html):  # フィクスチャを引数
     mock_response = mocker.Mock()
     mock_response.content = list_page_html  # 直接呼び出さない
 
-    df = parser.parse_list_page(mock_response)
+    jobs = parser.parse_list_page(mock_response)
 
-    assert len(df) == 1
-    assert df.iloc[0]["job_title"] == "Python開発者募集"
-    assert df.iloc[0]["detail_link"] == "/jobs/123"
-    assert (
-        pd.to_datetime(df.iloc[0]["listing_start_date"]).strftime("%Y-%m-%d")
-        == "2024-03-01"
-    )
+    assert len(jobs) == 1
+    assert jobs[0].job_title == "Python開発者募集"
+    assert jobs[0].detail_link == "/jobs/123"
+    assert jobs[0].listing_start_date == datetime(2024, 3, 1)
 
 
 def test_parse_detail_page(
@@ -63,13 +61,14 @@ def test_parse_detail_page(
     mock_response = mocker.Mock()
     mock_response.content = detail_page_html  # 直接呼び出さない
 
-    df = parser.parse_detail_page(mock_response)
+    detail = parser.parse_detail_page(mock_response)
 
-    assert df.iloc[0]["monthly_salary"] == 500000
-    assert df.iloc[0]["occupation"] == "システムエンジニア"
-    assert df.iloc[0]["work_type"] == "正社員"
-    assert df.iloc[0]["work_location"] == "東京都"
-    assert df.iloc[0]["industry"] == "IT・通信"
-    assert df.iloc[0]["job_content"] == "Webアプリケーション開発"
-    assert df.iloc[0]["required_skills"] == "Python, SQL"
-    assert df.iloc[0]["programming_language"] == "Python"
+    assert detail.basic.monthly_salary == 500000
+    assert detail.basic.occupation == "システムエンジニア"
+    assert detail.basic.work_type == "正社員"
+    assert detail.basic.work_location == "東京都"
+    assert detail.basic.industry == "IT・通信"
+    assert detail.table.job_content == "Webアプリケーション開発"
+    assert detail.table.required_skills == "Python, SQL"
+    assert detail.table.programming_language == "Python"
+    assert detail.table.preferred_skills is None
@@ -0,0 +1,113 @@
+import pytest
+from func_scraper.utils.rate_limiter import RateLimiter, parse_retry_after
+
+
+def test_acquire_waits_for_interval(mocker):
+    """リクエスト間隔の制御をテスト
+
+    検証内容:
+    1. 最初のリクエストは待機しないこと
+    2. 連続したリクエストは間隔分だけ待機すること
+    """
+    mocker.patch("func_scraper.utils.rate_limiter.time.monotonic", return_value=100.0)
+    mock_sleep = mocker.patch("func_scraper.utils.rate_limiter.time.sleep")
+
+    limiter = RateLimiter(requests_per_second=2)
+    limiter.acquire()
+    mock_sleep.assert_not_called()
+
+    limiter.acquire()
+    limiter.acquire()
+    assert mock_sleep.call_args_list == [mocker.call(0.5), mocker.call(1.0)]
+
+
+def test_invalid_rate():
+    """不正なリクエスト頻度の指定をテスト"""
+    with pytest.raises(ValueError):
+        RateLimiter(requests_per_second=0)
+
+
+def test_rate_increases_on_fast_success():
+    """高速な2xxレスポンスでレートが加算的に上がることをテスト"""
+    limiter = RateLimiter(
+        requests_per_second=2, initial_rate=1, increase_step=0.5, latency_factor=2
+    )
+
+    limiter.record_response("https://example.com/a", 200, latency=0.1)
+    limiter.record_response("https://example.com/b", 200, latency=0.1)
+    limiter.record_response("https://example.com/c", 200, latency=0.1)
+
+    metrics = limiter.get_metrics()
+    # 上限を超えないこと
+    assert metrics["hosts"]["example.com"]["rate"] == 2
+    assert metrics["backoff_events"] == []
+
+
+def test_back_off_on_429_with_retry_after(mocker):
+    """429レスポンスでのバックオフをテスト
+
+    検証内容:
+    1. レートが乗算的に下がること
+    2. Retry-Afterの秒数だけ次のリクエストが待機すること
+    3. バックオフイベントがメトリクスに記録されること
+    """
+    mocker.patch("func_scraper.utils.rate_limiter.time.monotonic", return_value=100.0)
+    mock_sleep = mocker.patch("func_scraper.utils.rate_limiter.time.sleep")
+
+    limiter = RateLimiter(requests_per_second=1, decrease_factor=0.5)
+    limiter.record_response("https://example.com/a", 429, latency=0.1, retry_after="30")
+    limiter.acquire("https://example.com/b")
+
+    mock_sleep.assert_called_once_with(30.0)
+    metrics = limiter.get_metrics()
+    assert metrics["hosts"]["example.com"]["rate"] == 0.5
+    assert metrics["hosts"]["example.com"]["backoff_count"] == 1
+    assert metrics["backoff_events"][0]["reason"] == "status 429"
+
+
+def test_back_off_on_rising_latency():
+    """レイテンシの悪化でバックオフすることをテスト"""
+    limiter = RateLimiter(
+        requests_per_second=1, latency_factor=2, decrease_factor=0.5, increase_step=0.1
+    )
+
+    limiter.record_response("https://example.com/a", 200, latency=0.2)
+    limiter.record_response("https://example.com/b", 200, latency=1.0)
+
+    metrics = limiter.get_metrics()
+    assert metrics["hosts"]["example.com"]["rate"] == 0.5
+    assert metrics["backoff_events"][0]["reason"] == "latency"
+
+
+def test_hosts_are_limited_independently(mocker):
+    """ホストごとに独立してレートが制御されることをテスト"""
+    mocker.patch("func_scraper.utils.rate_limiter.time.monotonic", return_value=100.0)
+    mock_sleep = mocker.patch("func_scraper.utils.rate_limiter.time.sleep")
+
+    limiter = RateLimiter(requests_per_second=1)
+    limiter.acquire("https://a.example.com/")
+    limiter.acquire("https://b.example.com/")
+
+    mock_sleep.assert_not_called()
+
+
+def test_crawl_delay_caps_rate(mocker):
+    """robots.txtのCrawl-delayがレートの上限になることをテスト"""
+    mocker.patch("func_scraper.utils.rate_limiter.time.monotonic", return_value=100.0)
+    mock_sleep = mocker.patch("func_scraper.utils.rate_limiter.time.sleep")
+
+    limiter = RateLimiter(requests_per_second=10, burst=5)
+    limiter.set_crawl_delay("https://example.com/", 4)
+    limiter.acquire("https://example.com/a")
+    limiter.acquire("https://example.com/b")
+
+    mock_sleep.assert_called_once_with(4.0)
+    assert limiter.get_metrics()["hosts"]["example.com"]["rate"] == 0.25
+
+
+def test_parse_retry_after():
+    """Retry-Afterヘッダーの変換をテスト"""
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("invalid") is None
+    assert parse_retry_after(None) is None
@@ -0,0 +1,76 @@
+from datetime import datetime
+
+from func_scraper.utils.models import (
+    JobBasicData,
+    JobDetailData,
+    JobListData,
+    JobRecord,
+    JobTableData,
+)
+from func_scraper.utils.record_batcher import OrderedRecordBatcher
+
+
+def make_record(detail_link):
+    """求人のレコードを作成"""
+    return JobRecord(
+        detail=JobDetailData(
+            basic=JobBasicData(
+                monthly_salary=500000,
+                occupation="システムエンジニア",
+                work_type="正社員",
+                work_location="東京都",
+                industry="IT・通信",
+            ),
+            table=JobTableData(job_content="Webアプリケーション開発"),
+        ),
+        listing=JobListData(
+            job_title="Python開発者",
+            listing_start_date=datetime(2024, 3, 2),
+            detail_link=detail_link,
+        ),
+    )
+
+
+def test_add_out_of_order():
+    """取得が終わった順にレコードを追加した場合のテスト
+
+    検証内容:
+    1. 一覧ページの順（インデックス順）に書き出されること
+    2. None を渡した求人は読み飛ばされること
+    3. batch_size 件ごとに書き出されること
+    """
+    frames = []
+    batcher = OrderedRecordBatcher(frames.append, batch_size=2)
+
+    batcher.add(2, make_record("/jobs/2"))
+    batcher.add(1, None)
+    assert frames == []
+
+    batcher.add(0, make_record("/jobs/0"))
+    batcher.add(3, make_record("/jobs/3"))
+    batcher.add(4, make_record("/jobs/4"))
+    batcher.close()
+
+    assert [list(frame.detail_link) for frame in frames] == [
+        ["/jobs/0", "/jobs/2"],
+        ["/jobs/3", "/jobs/4"],
+    ]
+    assert batcher.row_count == 4
+
+
+def test_close_without_records():
+    """レコードが1件もない場合のテスト
+
+    検証内容:
+    1. close 時にヘッダーのみのDataFrameが1度だけ書き出されること
+    """
+    frames = []
+    batcher = OrderedRecordBatcher(frames.append, batch_size=2)
+
+    batcher.add(0, None)
+    batcher.close()
+
+    assert len(frames) == 1
+    assert len(frames[0]) == 0
+    assert "detail_link" in frames[0].columns
+    assert batcher.row_count == 0
@@ -1,8 +1,25 @@
+from datetime import datetime
+
 import pandas as pd
 import pytest
+from func_scraper.utils.models import (
+    JobBasicData,
+    JobDetailData,
+    JobListData,
+    JobTableData,
+)
 from func_scraper.utils.scraper import JobDetailScraper, JobListScraper
 
 
+def make_job(listing_start_date):
+    """掲載開始日を指定して一覧ページの求人を作成"""
+    return JobListData(
+        job_title="Python開発者",
+        listing_start_date=datetime.fromisoformat(listing_start_date),
+        detail_link="/jobs/123",
+    )
+
+
 @pytest.fixture
 def mock_http_client(mocker):
     return mocker.Mock()
@@ -32,8 +49,8 @@ def test_scrape_page(list_scraper, mock_http_client, mock_parser):
     # モックの戻り値を設定
     mock_response = "dummy_response"
     mock_http_client.get.return_value = mock_response
-    expected_df = pd.DataFrame({"job_title": ["Python開発者"]})
-    mock_parser.parse_list_page.return_value = expected_df
+    expected = [make_job("2025-01-05")]
+    mock_parser.parse_list_page.return_value = expected
 
     # テスト実行
     result = list_scraper.scrape_page(1)
@@ -41,7 +58,7 @@ def test_scrape_page(list_scraper, mock_http_client, mock_parser):
     # 検証
     mock_http_client.get.assert_called_once_with("/item/page/1/?sort=new")
     mock_parser.parse_list_page.assert_called_once_with(mock_response)
-    pd.testing.assert_frame_equal(result, expected_df)
+    assert result == expected
 
 
 def test_scrape_all_pages(list_scraper, mock_http_client, mock_parser):
@@ -50,13 +67,13 @@ def test_scrape_all_pages(list_scraper, mock_http_client, mock_parser):
        - limit_date以降のデータのみが含まれること
     2. 古いデータを検出した時点でスクレイピングが終了すること
        - 1ページ目で古いデータを検出した場合、2ページ目以降は取得しないこと
-    3. DataFrameの結合と日付フィルタリングが正しく行われること
+    3. 各ページの求人の結合と日付フィルタリングが正しく行われること
     """
     # モックの戻り値を設定
-    mock_df = pd.DataFrame(
-        {"listing_start_date": [pd.Timestamp("2025-01-05"), pd.Timestamp("2024-12-28")]}
-    )
-    mock_parser.parse_list_page.return_value = mock_df
+    mock_parser.parse_list_page.return_value = [
+        make_job("2025-01-05"),
+        make_job("2024-12-28"),
+    ]
 
     # テスト実行
     limit_date = pd.Timestamp("2025-01-01")
@@ -76,8 +93,13 @@ def test_scrape_detail(detail_scraper, mock_http_client, mock_parser):
     # モックの戻り値を設定
     mock_response = "dummy_response"
     mock_http_client.get.return_value = mock_response
-    expected_df = pd.DataFrame({"monthly_salary": [500000]})
-    mock_parser.parse_detail_page.return_value = expected_df
+    expected = JobDetailData(
+        basic=JobBasicData(
+            500000, "システムエンジニア", "正社員", "東京都", "IT・通信"
+        ),
+        table=JobTableData(),
+    )
+    mock_parser.parse_detail_page.return_value = expected
 
     # テスト実行
     result = detail_scraper.scrape_detail("https://example.com/job/1", sleep_time=0)
@@ -85,4 +107,53 @@ def test_scrape_detail(detail_scraper, mock_http_client, mock_parser):
     # 検証
     mock_http_client.get.assert_called_once_with("https://example.com/job/1")
     mock_parser.parse_detail_page.assert_called_once_with(mock_response)
-    pd.testing.assert_frame_equal(result, expected_df)
+    assert result == expected
+
+
+def test_iter_pages_stops_at_limit_date(list_scraper, mock_http_client, mock_parser):
+    """一覧ページの逐次取得をテスト
+    1. 各ページの制限日以降の求人がページごとに返されること
+    2. 古いデータを検出したページの後は次のページを取得しないこと
+    """
+    mock_parser.parse_list_page.side_effect = [
+        [make_job("2025-01-05")],
+        [make_job("2025-01-02"), make_job("2024-12-28")],
+        [make_job("2024-12-27")],
+    ]
+
+    pages = list(list_scraper.iter_pages(pd.Timestamp("2025-01-01"), sleep_time=0))
+
+    assert [len(page) for page in pages] == [1, 1]
+    assert mock_http_client.get.call_count == 2
+
+
+def test_iter_pages_is_lazy(list_scraper, mock_http_client, mock_parser):
+    """呼び出し側が反復をやめると以降のページを取得しないことをテスト"""
+    mock_parser.parse_list_page.return_value = [make_job("2025-01-05")]
+
+    pages = list_scraper.iter_pages(pd.Timestamp("2025-01-01"), sleep_time=0)
+    next(pages)
+    pages.close()
+
+    assert mock_http_client.get.call_count == 1
+
+
+def test_scrape_stores_archive(mock_http_client, mock_parser, mocker):
+    """アーカイブを指定した場合のテスト
+
+    検証内容:
+    1. 一覧・詳細ページの本文がページの種類とともにアーカイブに保存されること
+    """
+    archive = mocker.Mock()
+    mock_http_client.get.return_value.content = b"<html></html>"
+    mock_parser.parse_list_page.return_value = []
+
+    JobListScraper(mock_http_client, mock_parser, archive).scrape_page(2)
+    JobDetailScraper(mock_http_client, mock_parser, archive).scrape_detail(
+        "/item/1001/", sleep_time=0
+    )
+
+    assert archive.store.call_args_list == [
+        mocker.call("/item/page/2/?sort=new", "list", b"<html></html>"),
+        mocker.call("/item/1001/", "detail", b"<html></html>"),
+    ]
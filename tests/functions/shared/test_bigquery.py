@@ -1,6 +1,13 @@
 import pytest
 from google.cloud import bigquery
-from shared.bigquery_utils import ensure_dataset_exists, ensure_table_exists
+from shared.bigquery_utils import (
+    CLUSTERING_FIELDS,
+    ensure_dataset_exists,
+    ensure_table_clustering,
+    ensure_table_columns,
+    ensure_table_exists,
+)
+from shared.metadata_cache import get_metadata_cache, table_key
 
 
 @pytest.fixture
@@ -18,7 +25,7 @@ def test_ensure_dataset_exists_when_exists(mock_bq_client):
     """
     # データセットが存在する場合のモック設定
     dataset_ref = "project.dataset"
-    mock_bq_client.get_dataset.return_value = None
+    mock_bq_client.get_dataset.return_value = bigquery.Dataset(dataset_ref)
 
     # テスト実行
     ensure_dataset_exists(mock_bq_client, dataset_ref)
@@ -65,7 +72,9 @@ def test_ensure_table_exists_when_exists(mock_bq_client):
         bigquery.SchemaField("detail_link", "STRING"),
         bigquery.SchemaField("listing_start_date", "DATE"),
     ]
-    mock_bq_client.get_table.return_value = None
+    existing_table = bigquery.Table(table_ref, schema=schema)
+    existing_table.clustering_fields = CLUSTERING_FIELDS
+    mock_bq_client.get_table.return_value = existing_table
 
     # テスト実行
     ensure_table_exists(mock_bq_client, table_ref, schema)
@@ -73,6 +82,43 @@ def test_ensure_table_exists_when_exists(mock_bq_client):
     # 検証
     mock_bq_client.get_table.assert_called_once_with(table_ref)
     mock_bq_client.create_table.assert_not_called()
+    mock_bq_client.update_table.assert_not_called()
+    mock_bq_client.query.assert_not_called()
+
+
+def test_ensure_table_exists_skips_clustering_migration(mock_bq_client):
+    """ロード処理ではクラスタ化されていないテーブルを書き直さないことをテスト"""
+    table_ref = "project.dataset.table"
+    schema = [bigquery.SchemaField("detail_link", "STRING")]
+    mock_bq_client.get_table.return_value = bigquery.Table(table_ref, schema=schema)
+
+    ensure_table_exists(mock_bq_client, table_ref, schema)
+
+    mock_bq_client.update_table.assert_not_called()
+    mock_bq_client.query.assert_not_called()
+
+
+def test_ensure_table_clustering(mock_bq_client):
+    """クラスタ化されていない既存のテーブルを移行するテスト
+
+    検証内容:
+    1. クラスタリングの設定が detail_link に更新されること
+    2. 既存の行を書き直して新しい設定でクラスタ化すること
+    3. クラスタ化済みのテーブルは移行しないこと
+    """
+    table_ref = "project.dataset.table"
+    table = bigquery.Table(table_ref)
+
+    assert ensure_table_clustering(mock_bq_client, table) is True
+
+    updated_table, fields = mock_bq_client.update_table.call_args.args
+    assert updated_table.clustering_fields == ["detail_link"]
+    assert fields == ["clustering_fields"]
+    mock_bq_client.query.assert_called_once_with(
+        f"update `{table_ref}` set detail_link = detail_link where true"
+    )
+    assert ensure_table_clustering(mock_bq_client, updated_table) is False
+    mock_bq_client.update_table.assert_called_once()
 
 
 def test_ensure_table_exists_when_not_exists(mock_bq_client):
@@ -80,7 +126,7 @@ def test_ensure_table_exists_when_not_exists(mock_bq_client):
 
     検証内容:
     1. テーブルが存在しない場合、新規作成されること
-    2. パーティション設定が正しく行われること
+    2. パーティションとクラスタリングの設定が正しく行われること
     3. Primary Key制約が追加されること
     4. 適切なログメッセージが出力されること
     """
@@ -103,6 +149,7 @@ def test_ensure_table_exists_when_not_exists(mock_bq_client):
     created_table = mock_bq_client.create_table.call_args[0][0]
     assert created_table.schema == schema
     assert created_table.time_partitioning.field == "listing_start_date"
+    assert created_table.clustering_fields == ["detail_link"]
 
     # Primary Key制約の追加を検証
     expected_ddl = f"""
@@ -110,3 +157,76 @@ def test_ensure_table_exists_when_not_exists(mock_bq_client):
         ADD PRIMARY KEY (detail_link) NOT ENFORCED
         """
     mock_bq_client.query.assert_called_once_with(expected_ddl)
+
+
+def test_ensure_table_exists_uses_metadata_cache(mock_bq_client):
+    """2回目以降の存在確認でメタデータのキャッシュが使われることをテスト
+
+    検証内容:
+    1. 存在を確認したデータセットとテーブルは再取得しないこと
+    """
+    table_ref = "project.dataset.table"
+    existing_table = bigquery.Table(table_ref)
+    existing_table.clustering_fields = CLUSTERING_FIELDS
+    mock_bq_client.get_dataset.return_value = bigquery.Dataset("project.dataset")
+    mock_bq_client.get_table.return_value = existing_table
+
+    for _ in range(2):
+        ensure_dataset_exists(mock_bq_client, "project.dataset")
+        ensure_table_exists(mock_bq_client, table_ref, [])
+
+    mock_bq_client.get_dataset.assert_called_once()
+    mock_bq_client.get_table.assert_called_once()
+
+
+def test_ensure_table_columns_adds_missing_fields(mock_bq_client):
+    """既存のテーブルにない列を追加するテスト
+
+    検証内容:
+    1. スキーマに追加した列のみが既存の列の後に追加されること
+    2. 更新後のテーブルが返されること
+    3. 列がそろっている場合はテーブルを更新しないこと
+    """
+    table = bigquery.Table(
+        "project.dataset.table",
+        schema=[bigquery.SchemaField("detail_link", "STRING", mode="REQUIRED")],
+    )
+    schema = [
+        bigquery.SchemaField("detail_link", "STRING", mode="REQUIRED"),
+        bigquery.SchemaField("content_hash", "STRING"),
+    ]
+
+    updated = ensure_table_columns(mock_bq_client, table, schema)
+    assert updated is mock_bq_client.update_table.return_value
+    assert ensure_table_columns(mock_bq_client, table, schema) is None
+
+    updated_table, fields = mock_bq_client.update_table.call_args.args
+    assert [field.name for field in updated_table.schema] == [
+        "detail_link",
+        "content_hash",
+    ]
+    assert fields == ["schema"]
+    mock_bq_client.update_table.assert_called_once()
+
+
+def test_ensure_table_exists_caches_updated_table(mock_bq_client):
+    """列を追加した場合に更新後のテーブルをキャッシュに保持することをテスト
+
+    検証内容:
+    1. キャッシュのテーブルが update_table の戻り値（新しいetag）に置き換わること
+    """
+    table_ref = "project.dataset.table"
+    schema = [
+        bigquery.SchemaField("detail_link", "STRING"),
+        bigquery.SchemaField("content_hash", "STRING"),
+    ]
+    existing_table = bigquery.Table(table_ref, schema=schema[:1])
+    existing_table.clustering_fields = CLUSTERING_FIELDS
+    updated_table = bigquery.Table(table_ref, schema=schema)
+    updated_table.clustering_fields = CLUSTERING_FIELDS
+    mock_bq_client.get_table.return_value = existing_table
+    mock_bq_client.update_table.return_value = updated_table
+
+    ensure_table_exists(mock_bq_client, table_ref, schema)
+
+    assert get_metadata_cache().get(table_key(table_ref)) is updated_table
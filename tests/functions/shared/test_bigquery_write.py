@@ -0,0 +1,195 @@
+import io
+from datetime import date
+
+import pyarrow as pa
+import pytest
+from google.cloud.bigquery_storage_v1 import types
+from shared.bigquery_write import BigQueryStorageWriter, read_source_table
+
+COLUMN_TYPES = {
+    "monthly_salary": "INTEGER",
+    "listing_start_date": "DATE",
+    "detail_link": "STRING",
+}
+
+
+class FakeWriteClient:
+    """BigQueryWriteClient のフェイク（受け取ったリクエストを記録する）"""
+
+    def __init__(self, append_error=None, commit_errors=()):
+        self.append_error = append_error
+        self.commit_errors = list(commit_errors)
+        self.appended = []
+        self.rows = []
+        self.metadata = None
+        self.finalized = []
+        self.committed = []
+
+    def create_write_stream(self, parent, write_stream):
+        assert write_stream.type_ == types.WriteStream.Type.PENDING
+        return types.WriteStream(name=f"{parent}/streams/s1")
+
+    def append_rows(self, requests, metadata=()):
+        self.metadata = metadata
+        for request in requests:
+            self.appended.append(request)
+            schema = pa.ipc.read_schema(
+                pa.py_buffer(
+                    self.appended[0].arrow_rows.writer_schema.serialized_schema
+                )
+            )
+            batch = pa.ipc.read_record_batch(
+                pa.py_buffer(request.arrow_rows.rows.serialized_record_batch), schema
+            )
+            self.rows.extend(batch.to_pylist())
+            if self.append_error:
+                yield types.AppendRowsResponse(
+                    error={"code": 3, "message": self.append_error}
+                )
+            else:
+                yield types.AppendRowsResponse(append_result={"offset": request.offset})
+
+    def finalize_write_stream(self, name):
+        self.finalized.append(name)
+        return types.FinalizeWriteStreamResponse(row_count=len(self.rows))
+
+    def batch_commit_write_streams(self, request):
+        self.committed.append(request)
+        return types.BatchCommitWriteStreamsResponse(
+            stream_errors=[
+                types.StorageError(error_message=message)
+                for message in self.commit_errors
+            ]
+        )
+
+
+@pytest.fixture
+def arrow_table():
+    return pa.table(
+        {
+            "monthly_salary": pa.array([500000, None, 700000], pa.int64()),
+            "listing_start_date": pa.array(
+                [date(2024, 3, 1), date(2024, 3, 2), date(2024, 3, 3)], pa.date32()
+            ),
+            "detail_link": ["/item/1/", "/item/2/", "/item/3/"],
+        }
+    )
+
+
+def test_write_appends_batches_and_commits(arrow_table):
+    """保留モードのストリームへの書き込みをテスト
+
+    検証内容:
+    1. batch_rows 行ごとに追加リクエストが送られ、offset が行の位置になること
+    2. 最初のリクエストのみストリーム名とスキーマを含むこと
+    3. すべての行が書き込まれ、ストリームの確定とコミットが行われること
+    4. 書き込んだ行数が返されること
+    """
+    client = FakeWriteClient()
+
+    written = BigQueryStorageWriter(client, batch_rows=2).write(
+        "project.dataset.table_temp", arrow_table
+    )
+
+    stream_name = "projects/project/datasets/dataset/tables/table_temp/streams/s1"
+    assert [request.offset for request in client.appended] == [0, 2]
+    assert client.appended[0].write_stream == stream_name
+    assert client.appended[1].write_stream == ""
+    assert not client.appended[1].arrow_rows.writer_schema.serialized_schema
+    assert client.metadata == (
+        ("x-goog-request-params", f"write_stream={stream_name}"),
+    )
+    assert client.rows == arrow_table.to_pylist()
+    assert client.finalized == [stream_name]
+    assert list(client.committed[0].write_streams) == [stream_name]
+    assert written == 3
+
+
+def test_write_raises_on_append_error(arrow_table):
+    """追加に失敗した場合にコミットせずにエラーとなることをテスト"""
+    client = FakeWriteClient(append_error="invalid row")
+
+    with pytest.raises(RuntimeError, match="invalid row"):
+        BigQueryStorageWriter(client).write("project.dataset.table_temp", arrow_table)
+
+    assert client.committed == []
+
+
+def test_write_raises_on_commit_error(arrow_table):
+    """コミットに失敗した場合にエラーとなることをテスト"""
+    client = FakeWriteClient(commit_errors=["stream not finalized"])
+
+    with pytest.raises(RuntimeError, match="stream not finalized"):
+        BigQueryStorageWriter(client).write("project.dataset.table_temp", arrow_table)
+
+
+def test_write_empty_table():
+    """行がない場合は追加せずにコミットすることをテスト"""
+    client = FakeWriteClient()
+    empty = pa.schema([("detail_link", pa.string())]).empty_table()
+
+    assert BigQueryStorageWriter(client).write("p.d.t", empty) == 0
+    assert client.appended == []
+    assert len(client.committed) == 1
+
+
+def test_read_source_table_csv():
+    """CSVの出力ファイルをスキーマの型で読み込むことをテスト
+
+    検証内容:
+    1. 列がスキーマの順序と型になること
+    2. 改行を含む値と空の値（NULL）が扱えること
+    3. REQUIRED の列はNULLを許容しないスキーマになること
+    """
+    data = (
+        "detail_link,monthly_salary,listing_start_date\n"
+        '"/item/1/",500000,2024-03-01\n'
+        '"/item/2/\n2",,2024-03-02\n'
+    ).encode("utf-8")
+
+    table = read_source_table(data, "jobs.csv", COLUMN_TYPES, required=["detail_link"])
+
+    assert table.column_names == list(COLUMN_TYPES)
+    assert table.schema.field("monthly_salary").type == pa.int64()
+    assert table.schema.field("detail_link").nullable is False
+    assert table.to_pylist() == [
+        {
+            "monthly_salary": 500000,
+            "listing_start_date": date(2024, 3, 1),
+            "detail_link": "/item/1/",
+        },
+        {
+            "monthly_salary": None,
+            "listing_start_date": date(2024, 3, 2),
+            "detail_link": "/item/2/\n2",
+        },
+    ]
+
+
+def test_read_source_table_fills_missing_nullable_columns():
+    """後から追加した列がない以前のファイルをNULLの列として読み込むことをテスト"""
+    data = "detail_link,monthly_salary,listing_start_date\n/item/1/,1,2024-03-01\n"
+    column_types = {**COLUMN_TYPES, "content_hash": "STRING"}
+
+    table = read_source_table(
+        data.encode("utf-8"), "jobs.csv", column_types, required=["detail_link"]
+    )
+
+    assert table.column_names == list(column_types)
+    assert table.to_pylist()[0]["content_hash"] is None
+
+
+def test_read_source_table_parquet(arrow_table):
+    """Parquetの出力ファイルをスキーマの型で読み込むことをテスト"""
+    import pyarrow.parquet as pq
+
+    buffer = io.BytesIO()
+    pq.write_table(
+        arrow_table.select(["detail_link", "monthly_salary", "listing_start_date"]),
+        buffer,
+    )
+
+    table = read_source_table(buffer.getvalue(), "jobs.parquet", COLUMN_TYPES)
+
+    assert table.column_names == list(COLUMN_TYPES)
+    assert table.to_pylist() == arrow_table.to_pylist()
@@ -0,0 +1,81 @@
+import threading
+import time
+
+import pytest
+from google.auth.credentials import AnonymousCredentials
+from shared import gcp_clients
+from shared.gcp_clients import (
+    STORAGE,
+    get_storage_client,
+    reset_clients,
+    set_client,
+)
+
+
+def test_get_client_creates_once_across_threads(monkeypatch):
+    """複数のスレッドから同時に取得した場合に1つだけ作成されることをテスト
+
+    検証内容:
+    1. クライアントが1回だけ作成されること
+    2. すべてのスレッドが同じクライアントを受け取ること
+    3. reset_clients の後は作り直されること
+    """
+    created = []
+
+    def factory():
+        time.sleep(0.01)
+        created.append(object())
+        return created[-1]
+
+    monkeypatch.setitem(gcp_clients._FACTORIES, STORAGE, factory)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(get_storage_client()))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1
+    assert all(client is created[0] for client in results)
+
+    reset_clients()
+    assert get_storage_client() is not created[0]
+
+
+def test_set_client(mocker):
+    """クライアントの差し替えをテスト"""
+    fake = mocker.Mock()
+
+    set_client(STORAGE, fake)
+
+    assert get_storage_client() is fake
+    with pytest.raises(ValueError, match="Unknown client"):
+        set_client("pubsub", fake)
+
+
+def test_storage_client_pool_size(mocker, monkeypatch):
+    """HTTPコネクションプールの大きさが環境変数から設定されることをテスト
+
+    検証内容:
+    1. クライアントのHTTPセッションのプールの大きさが GCP_HTTP_POOL_SIZE になること
+    2. 認証情報から取得したプロジェクトIDが使われること
+    """
+    monkeypatch.setenv("GCP_HTTP_POOL_SIZE", "32")
+    mocker.patch(
+        "google.auth.default", return_value=(AnonymousCredentials(), "test-project")
+    )
+
+    client = get_storage_client()
+
+    adapter = client._http.adapters["https://"]
+    assert adapter._pool_maxsize == 32
+    assert client.project == "test-project"
+
+
+def test_set_pool_size_validation():
+    """プールの大きさに1未満を指定した場合にエラーとなることをテスト"""
+    with pytest.raises(ValueError):
+        gcp_clients.set_pool_size(0)
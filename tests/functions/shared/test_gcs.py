@@ -1,14 +1,26 @@
-from datetime import datetime, timedelta, timezone
+import base64
+import io
+from datetime import date, datetime, timedelta, timezone
 
+import google_crc32c
 import pandas as pd
+import pyarrow.parquet as pq
 import pytest
-from shared.gcs_utils import get_data_bucket_name, save_to_gcs
+from shared.gcp_clients import STORAGE, set_client
+from shared.gcs_utils import (
+    GcsCsvStreamWriter,
+    GcsParquetStreamWriter,
+    create_stream_writer,
+    get_data_bucket_name,
+)
 
 
 @pytest.fixture
 def mock_storage_client(mocker):
-    """GCSクライアントのモックを提供するフィクスチャ"""
-    return mocker.patch("shared.gcs_utils.storage.Client")
+    """GCSクライアントのモックをクライアントのレジストリに登録するフィクスチャ"""
+    client = mocker.MagicMock()
+    set_client(STORAGE, client)
+    return client
 
 
 @pytest.fixture
@@ -41,39 +53,155 @@ def test_get_data_bucket_name(mock_env_vars, mocker):
     assert "Environment variable PROJECT_ID is not set" in str(exc_info.value)
 
 
-def test_save_to_gcs(mock_storage_client, sample_dataframe, mocker):
-    """GCSへのデータ保存をテスト
-    検証内容:
-    1. 正しいパスでファイルが保存されること（JSTタイムゾーンを考慮）
-    2. 同じ日付の古いファイルが削除されること
-    3. DataFrameが正しくCSVとして保存されること
-    """
-    # モックの設定
-    mock_bucket = mocker.Mock()
-    mock_blob = mocker.Mock()
-    mock_storage_client.return_value.bucket.return_value = mock_bucket
-    mock_bucket.blob.return_value = mock_blob
-    mock_blob.open.return_value = mocker.MagicMock()
-
-    # 既存ブロブのモック
-    existing_blob = mocker.Mock()
-    mock_bucket.list_blobs.return_value = [existing_blob]
-
-    # JSTタイムゾーンを考慮した日付を固定
+@pytest.fixture
+def fixed_date(mocker):
+    """当日（JST）の日付を固定するフィクスチャ"""
     jst = timezone(timedelta(hours=9))
-    current_date = datetime(2024, 3, 15, tzinfo=jst)
     mocker.patch("shared.gcs_utils.datetime")
-    mocker.patch("shared.gcs_utils.datetime.now", return_value=current_date)
+    mocker.patch(
+        "shared.gcs_utils.datetime.now", return_value=datetime(2024, 3, 15, tzinfo=jst)
+    )
+
+
+@pytest.fixture
+def stream_writer(mock_storage_client, fixed_date, mocker):
+    """日付を固定したGcsCsvStreamWriterを提供するフィクスチャ"""
+    mock_bucket = mock_storage_client.bucket.return_value
+    staging_blob = mock_bucket.blob.return_value
+    staging_blob.open.return_value = mocker.MagicMock()
+    return GcsCsvStreamWriter("test-bucket")
 
-    # テスト実行
-    bucket_name = "test-bucket"
-    result = save_to_gcs(sample_dataframe, bucket_name)
 
-    # 検証
+def test_stream_writer_commit(stream_writer, sample_dataframe, mocker):
+    """GCSへのストリーミング書き込みをテスト
+
+    検証内容:
+    1. ヘッダーは最初の書き込みのみに含まれること
+    2. crc32cが一致した場合、一時オブジェクトが当日のパスへコピーされること
+    3. 同じ日付の古いファイルと一時オブジェクトが削除されること
+    """
+    staging_blob = stream_writer.staging_blob
+    stream_file = staging_blob.open.return_value
+
+    stream_writer.write_frame(sample_dataframe)
+    stream_writer.write_frame(sample_dataframe)
+
+    written = b"".join(call.args[0] for call in stream_file.write.call_args_list)
+    assert written.decode("utf-8").splitlines() == [
+        "job_title,monthly_salary",
+        "Python開発者,500000",
+        "Python開発者,500000",
+    ]
+    assert stream_writer.row_count == 2
+
+    staging_blob.crc32c = base64.b64encode(
+        google_crc32c.Checksum(written).digest()
+    ).decode("utf-8")
     expected_path = "raw/jobs/partition_date=20240315/jobs.csv"
+    old_blob = mocker.Mock()
+    old_blob.name = "raw/jobs/partition_date=20240315/old.csv"
+    new_blob = mocker.Mock()
+    new_blob.name = expected_path
+    stream_writer.bucket.list_blobs.return_value = [old_blob, new_blob]
+
+    result = stream_writer.commit()
+
     assert result == expected_path
+    stream_file.close.assert_called_once()
+    stream_writer.bucket.copy_blob.assert_called_once_with(
+        staging_blob, stream_writer.bucket, expected_path
+    )
+    old_blob.delete.assert_called_once()
+    new_blob.delete.assert_not_called()
+    staging_blob.delete.assert_called_once()
+    assert staging_blob.metadata == {"row_count": "2"}
+
+
+def test_stream_writer_checksum_mismatch(stream_writer, sample_dataframe):
+    """crc32cが一致しない場合のテスト
+
+    検証内容:
+    1. エラーが発生し、当日のファイルは置き換えられないこと
+    2. 一時オブジェクトが削除されること
+    """
+    stream_writer.write_frame(sample_dataframe)
+    stream_writer.staging_blob.crc32c = "AAAAAA=="
 
-    # メソッドが正しく呼び出されたことを確認
-    mock_bucket.blob.assert_called_once_with(expected_path)
-    mock_blob.open.assert_called_once_with("w", encoding="utf-8")
-    existing_blob.delete.assert_called_once()
+    with pytest.raises(ValueError, match="crc32c mismatch"):
+        stream_writer.commit()
+
+    stream_writer.bucket.copy_blob.assert_not_called()
+    stream_writer.staging_blob.delete.assert_called_once()
+
+
+def test_stream_writer_abort_on_error(stream_writer, sample_dataframe):
+    """書き込み中にエラーが発生した場合のテスト
+
+    検証内容:
+    1. 一時オブジェクトが削除され、当日のファイルは変更されないこと
+    """
+    with pytest.raises(RuntimeError):
+        with stream_writer as writer:
+            writer.write_frame(sample_dataframe)
+            raise RuntimeError("scraping failed")
+
+    stream_writer.staging_blob.delete.assert_called_once()
+    stream_writer.bucket.copy_blob.assert_not_called()
+
+
+def test_parquet_stream_writer(mock_storage_client, fixed_date, mocker):
+    """Parquetでのストリーミング書き込みをテスト
+
+    検証内容:
+    1. 当日のパスの jobs.parquet へ保存されること
+    2. 書き込みごとの行がすべて指定した型で読み込めること
+    3. 行のないDataFrameでもスキーマを持つファイルを書き込めること
+    """
+    staging_blob = mock_storage_client.bucket.return_value.blob.return_value
+    buffer = io.BytesIO()
+    stream_file = mocker.MagicMock()
+    stream_file.write.side_effect = buffer.write
+    staging_blob.open.return_value = stream_file
+
+    writer = GcsParquetStreamWriter(
+        "test-bucket",
+        compression="snappy",
+        column_types={"monthly_salary": "INTEGER", "listing_start_date": "DATE"},
+    )
+    assert writer.blob_name == "raw/jobs/partition_date=20240315/jobs.parquet"
+
+    frame = pd.DataFrame(
+        {"monthly_salary": [500000], "listing_start_date": [datetime(2024, 3, 2)]}
+    )
+    writer.write_frame(frame)
+    writer.write_frame(frame.iloc[0:0])
+    writer.write_frame(frame)
+
+    # フッターは commit で書き込まれるため、アップロード完了後の内容からcrc32cを求める
+    def patch():
+        staging_blob.crc32c = base64.b64encode(
+            google_crc32c.Checksum(buffer.getvalue()).digest()
+        ).decode("utf-8")
+
+    staging_blob.patch.side_effect = patch
+    writer.commit()
+
+    table = pq.read_table(io.BytesIO(buffer.getvalue()))
+    assert str(table.schema.field("monthly_salary").type) == "int64"
+    assert table.column("listing_start_date").to_pylist() == [
+        date(2024, 3, 2),
+        date(2024, 3, 2),
+    ]
+    writer.bucket.copy_blob.assert_called_once()
+
+
+def test_create_stream_writer(mock_storage_client):
+    """出力形式に応じた書き込みの作成をテスト
+
+    検証内容:
+    1. csv の場合はCSVの書き込みが作成されること
+    2. 未対応の形式はエラーになること
+    """
+    assert isinstance(create_stream_writer("test-bucket"), GcsCsvStreamWriter)
+    with pytest.raises(ValueError, match="Unsupported output format"):
+        create_stream_writer("test-bucket", output_format="json")
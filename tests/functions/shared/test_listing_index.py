@@ -0,0 +1,90 @@
+import pytest
+from google.api_core.exceptions import NotFound
+from shared.gcp_clients import STORAGE, set_client
+from shared.listing_index import BloomFilter, KnownListingIndex
+
+
+@pytest.fixture
+def mock_storage_client(mocker):
+    """GCSクライアントのモックをクライアントのレジストリに登録するフィクスチャ"""
+    client = mocker.MagicMock()
+    set_client(STORAGE, client)
+    return client
+
+
+def test_bloom_filter_membership():
+    """Bloomフィルタの判定をテスト
+
+    検証内容:
+    1. 登録した要素はすべて含まれると判定されること
+    2. 未登録の要素の誤検出率が指定値の範囲に収まること
+    """
+    bloom = BloomFilter.with_capacity(10_000, error_rate=0.01)
+    for i in range(10_000):
+        bloom.add(f"/item/{i}")
+
+    assert all(f"/item/{i}" in bloom for i in range(10_000))
+    false_positives = sum(f"/other/{i}" in bloom for i in range(10_000))
+    assert false_positives < 200
+
+
+def test_bloom_filter_round_trip():
+    """バイト列への変換と復元をテスト"""
+    bloom = BloomFilter.with_capacity(100)
+    bloom.add("/item/1")
+
+    restored = BloomFilter.from_bytes(bloom.to_bytes())
+
+    assert "/item/1" in restored
+    assert restored.count == 1
+    assert restored.num_bits == bloom.num_bits
+    assert restored.num_hashes == bloom.num_hashes
+
+
+def test_bloom_filter_invalid_data():
+    """不正なデータの読み込みでエラーとなることをテスト"""
+    with pytest.raises(ValueError):
+        BloomFilter.from_bytes(b"XXXX" + bytes(32))
+
+
+def test_known_listing_index_add_all():
+    """索引への追加をテスト
+
+    検証内容:
+    1. 未登録の detail_link のみが追加され、その件数が返されること
+    2. 容量を超えると作り直しが必要と判定されること
+    """
+    index = KnownListingIndex.build(["/item/1"], capacity=10)
+
+    assert index.add_all(["/item/1", "/item/2", "/item/2"]) == 1
+    assert len(index) == 2
+    assert "/item/2" in index
+    assert not index.is_full
+
+    index.add_all(f"/other/{i}" for i in range(20))
+    assert index.is_full
+
+
+def test_known_listing_index_save_and_load(mock_storage_client, mocker):
+    """索引の保存と読み込みをテスト"""
+    mock_blob = mocker.Mock()
+    mock_storage_client.bucket.return_value.blob.return_value = mock_blob
+
+    index = KnownListingIndex.build(["/item/1", "/item/2"], capacity=100)
+    index.save("test-bucket")
+    saved = mock_blob.upload_from_string.call_args.args[0]
+
+    mock_blob.download_as_bytes.return_value = saved
+    loaded = KnownListingIndex.load("test-bucket")
+
+    assert len(loaded) == 2
+    assert "/item/1" in loaded
+    assert "/item/3" not in loaded
+
+
+def test_known_listing_index_not_found(mock_storage_client):
+    """索引が存在しない場合にNoneが返されることをテスト"""
+    mock_blob = mock_storage_client.bucket.return_value.blob.return_value
+    mock_blob.download_as_bytes.side_effect = NotFound("not found")
+
+    assert KnownListingIndex.load("test-bucket") is None
@@ -0,0 +1,94 @@
+import logging
+from logging.handlers import QueueHandler
+
+from shared import logger_config
+from shared.logger_config import (
+    SamplingFilter,
+    _CloudLoggingHandler,
+    _create_handlers,
+    flush_logs,
+    setup_logger,
+)
+
+
+def _record(lineno, sampled=True):
+    record = logging.makeLogRecord(
+        {"name": "test", "msg": "Scraping detail page", "lineno": lineno}
+    )
+    if sampled:
+        record.sampled = True
+    return record
+
+
+def test_setup_logger_returns_cached_logger(mocker):
+    """2回目以降の呼び出しで作成済みのロガーを返すことをテスト
+
+    検証内容:
+    1. 同じ名前では同じロガーが返されること
+    2. ハンドラーはキューへ入れる1つだけで、ルートロガーへ伝播しないこと
+    3. 2回目の呼び出しではCloud Loggingのクライアントを作成しないこと
+    """
+    logger = setup_logger("test_cached_logger")
+    client = mocker.patch("google.cloud.logging.Client")
+
+    assert setup_logger("test_cached_logger") is logger
+    assert len(logger.handlers) == 1
+    assert isinstance(logger.handlers[0], QueueHandler)
+    assert logger.propagate is False
+    client.assert_not_called()
+
+
+def test_logs_are_written_by_listener(tmp_path):
+    """キューを経由してロガー名ごとのファイルへ出力されることをテスト"""
+    logger = setup_logger("test_queue_logger", log_dir=str(tmp_path))
+
+    logger.info("queued message")
+    flush_logs()
+
+    log_text = (tmp_path / "test_queue_logger.log").read_text("utf-8")
+    assert "test_queue_logger - INFO" in log_text
+    assert "queued message" in log_text
+
+
+def test_cloud_logging_can_be_disabled(monkeypatch):
+    """環境変数LOG_CLOUD_LOGGINGでCloud Loggingへの送信を切り替えるテスト
+
+    検証内容:
+    1. 既定ではCloud Loggingのハンドラーが含まれること
+    2. falseの場合は標準出力とファイルのハンドラーのみになること
+    """
+    # _create_handlers が置き換えるファイルのハンドラーをテスト後に元に戻す
+    monkeypatch.setattr(logger_config, "_file_handler", logger_config._file_handler)
+    formatter = logging.Formatter()
+    monkeypatch.delenv("LOG_CLOUD_LOGGING", raising=False)
+    assert any(isinstance(h, _CloudLoggingHandler) for h in _create_handlers(formatter))
+
+    monkeypatch.setenv("LOG_CLOUD_LOGGING", "false")
+    handlers = _create_handlers(formatter)
+    assert len(handlers) == 2
+    assert not any(isinstance(h, _CloudLoggingHandler) for h in handlers)
+
+
+def test_sampling_filter():
+    """呼び出し箇所ごとのサンプリングをテスト
+
+    検証内容:
+    1. extra=SAMPLED を付けたログは最初の1件と every 件ごとに1件だけ通ること
+    2. 呼び出し箇所（行）ごとに数えること
+    3. SAMPLED のないログはすべて通ること
+    4. every が0の場合は SAMPLED のログをすべて捨てること
+    """
+    sampling = SamplingFilter(every=3)
+
+    assert [sampling.filter(_record(10)) for _ in range(7)] == [
+        True,
+        False,
+        False,
+        True,
+        False,
+        False,
+        True,
+    ]
+    assert sampling.filter(_record(20)) is True
+    assert all(sampling.filter(_record(10, sampled=False)) for _ in range(5))
+    assert SamplingFilter(every=0).filter(_record(10)) is False
@@ -0,0 +1,105 @@
+import threading
+
+from shared.metadata_cache import MetadataCache, blob_key, fetch_blob
+from shared.pubsub_utils import MessageProcessor
+
+
+class FakeClock:
+    """進める秒数を指定できる時計"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_or_fetch_caches_positive_results(mocker):
+    """存在した結果のみが保持されることをテスト
+
+    検証内容:
+    1. 2回目の取得ではキャッシュが使われること
+    2. 存在しなかった結果は保持されず、次回も取得されること
+    3. ヒット・ミスの件数が集計されること
+    """
+    cache = MetadataCache(ttl_seconds=60)
+    found = mocker.Mock(return_value="metadata")
+    missing = mocker.Mock(return_value=None)
+
+    assert cache.get_or_fetch("found", found) == "metadata"
+    assert cache.get_or_fetch("found", found) == "metadata"
+    assert cache.get_or_fetch("missing", missing) is None
+    assert cache.get_or_fetch("missing", missing) is None
+
+    assert found.call_count == 1
+    assert missing.call_count == 2
+    assert cache.get_stats() == {"hits": 1, "misses": 3, "entries": 1}
+
+
+def test_entries_expire_after_ttl(mocker):
+    """保持する秒数を過ぎたメタデータが再取得されることをテスト"""
+    clock = FakeClock()
+    cache = MetadataCache(ttl_seconds=60, clock=clock)
+    fetch = mocker.Mock(return_value="metadata")
+
+    cache.get_or_fetch("key", fetch)
+    clock.now = 59
+    cache.get_or_fetch("key", fetch)
+    clock.now = 61
+    cache.get_or_fetch("key", fetch)
+
+    assert fetch.call_count == 2
+
+
+def test_fetch_all_runs_concurrently():
+    """複数のメタデータが並行して取得されることをテスト
+
+    検証内容:
+    1. 一方の取得の完了を待たずに、もう一方の取得が始まること
+    """
+    cache = MetadataCache()
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fetch(value):
+        def run():
+            # 並行して実行されていなければタイムアウトする
+            barrier.wait()
+            return value
+
+        return run
+
+    result = cache.fetch_all({"a": fetch(1), "b": fetch(2)})
+
+    assert result == {"a": 1, "b": 2}
+
+
+def test_fetch_blob_uses_single_request(mocker):
+    """オブジェクトのメタデータを get_blob の1回で取得することをテスト"""
+    bucket = mocker.Mock()
+    cache = MetadataCache()
+
+    blob = cache.get_or_fetch(blob_key("bucket", "a.csv"), fetch_blob(bucket, "a.csv"))
+
+    assert blob is bucket.get_blob.return_value
+    bucket.get_blob.assert_called_once_with("a.csv")
+    bucket.blob.assert_not_called()
+
+
+def test_processed_message_is_cached(mocker):
+    """処理済みのメッセージの確認でGCSへ再度問い合わせないことをテスト
+
+    検証内容:
+    1. 未処理のメッセージは毎回確認されること
+    2. 処理済みとしてマークしたメッセージはキャッシュから判定されること
+    """
+    client = mocker.MagicMock()
+    mocker.patch("shared.pubsub_utils.get_storage_client", return_value=client)
+    bucket = client.bucket.return_value
+    bucket.get_blob.return_value = None
+    processor = MessageProcessor("test-bucket")
+
+    assert processor.is_message_processed("message-1") is False
+    processor.mark_message_as_processed("message-1")
+    assert processor.is_message_processed("message-1") is True
+
+    bucket.get_blob.assert_called_once_with("processed_messages/message-1.json")
@@ -0,0 +1,90 @@
+import pytest
+from shared import telemetry
+from shared.telemetry import get_finished_spans, record_value, setup_telemetry, traced
+
+
+@pytest.fixture
+def memory_exporter():
+    """memory エクスポーターを設定し、テストごとに記録済みのスパンを消去するフィクスチャ"""
+    # プロバイダーはプロセスで1度しか設定できないため、設定済みの場合はそのまま使う
+    setup_telemetry("test", "memory")
+    telemetry._memory_exporter.clear()
+    return telemetry._memory_exporter
+
+
+def _histogram_points(name):
+    points = []
+    for resource_metrics in telemetry.get_metrics_data().resource_metrics:
+        for scope_metrics in resource_metrics.scope_metrics:
+            for metric in scope_metrics.metrics:
+                if metric.name == name:
+                    points.extend(metric.data.data_points)
+    return points
+
+
+def test_traced_records_span_and_duration(memory_exporter):
+    """スパンと所要時間の記録をテスト
+
+    検証内容:
+    1. 指定した属性と処理中に追加した属性がスパンに記録されること
+    2. Noneの属性は記録されないこと
+    3. 所要時間が処理名ごとのヒストグラムに記録されること
+    """
+    with traced("test.operation", url="https://example.com", job_id=None) as span:
+        span.set_attribute("row_count", 3)
+
+    (finished,) = get_finished_spans()
+    assert finished.name == "test.operation"
+    assert dict(finished.attributes) == {"url": "https://example.com", "row_count": 3}
+    assert any(
+        point.attributes == {"operation": "test.operation", "error": False}
+        for point in _histogram_points("operation.duration")
+    )
+
+
+def test_traced_records_error(memory_exporter):
+    """例外が発生した場合の記録をテスト
+
+    検証内容:
+    1. 例外が再送出されること
+    2. スパンのステータスがエラーになり、例外がイベントとして記録されること
+    3. 所要時間がエラーとして記録されること
+    """
+    with pytest.raises(ValueError):
+        with traced("test.failure"):
+            raise ValueError("boom")
+
+    (finished,) = get_finished_spans()
+    assert not finished.status.is_ok
+    assert finished.events[0].name == "exception"
+    assert any(
+        point.attributes == {"operation": "test.failure", "error": True}
+        for point in _histogram_points("operation.duration")
+    )
+
+
+def test_record_value(memory_exporter):
+    """計測値のヒストグラムへの記録をテスト"""
+    record_value("test.size", 1024, unit="By", kind="detail")
+    record_value("test.size", 2048, unit="By", kind="detail")
+
+    (point,) = _histogram_points("test.size")
+    assert point.count == 2
+    assert point.sum == 3072
+    assert point.attributes == {"kind": "detail"}
+
+
+def test_setup_telemetry_rejects_unknown_exporter(monkeypatch):
+    """未知のエクスポーターを指定した場合にエラーとなることをテスト"""
+    monkeypatch.setattr(telemetry, "_tracer_provider", None)
+
+    with pytest.raises(ValueError, match="Unknown telemetry exporter"):
+        setup_telemetry("test", "stdout")
+
+
+def test_setup_telemetry_disabled_without_exporter(monkeypatch):
+    """エクスポーターが未設定の場合は何も設定しないことをテスト"""
+    monkeypatch.delenv("TELEMETRY_EXPORTER", raising=False)
+    monkeypatch.setattr(telemetry, "_tracer_provider", None)
+
+    assert setup_telemetry("test") is False
@@ -0,0 +1,70 @@
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+FUNCTIONS_DIR = Path(__file__).resolve().parents[2] / "functions"
+
+# エントリーポイントの読み込み時間の上限（ミリ秒）
+# 計測環境が遅い場合は環境変数IMPORT_TIME_BUDGET_MSで上書きする
+IMPORT_TIME_BUDGET_MS = {"func_scraper": 800, "func_loader": 800}
+# エントリーポイントの読み込み時には読み込まないモジュール（処理が必要になった時点で読み込む）
+DEFERRED_MODULES = (
+    "pandas",
+    "bs4",
+    "pyarrow",
+    "google.cloud.bigquery",
+    "google.cloud.logging",
+    "opentelemetry.sdk",
+)
+
+
+def _import_entry_point(function_name):
+    """新しいプロセスでエントリーポイントを読み込み、読み込み時間と読み込まれたモジュールを取得"""
+    code = (
+        "import sys, time; "
+        f"sys.path[:0] = [{str(FUNCTIONS_DIR / function_name)!r}, "
+        f"{str(FUNCTIONS_DIR)!r}]; "
+        "started_at = time.perf_counter(); import main; "
+        "print((time.perf_counter() - started_at) * 1000); "
+        "print(' '.join(sys.modules))"
+    )
+    env = {key: value for key, value in os.environ.items() if key != "PYTHONPATH"}
+    env.pop("TELEMETRY_EXPORTER", None)
+    with tempfile.TemporaryDirectory() as work_dir:
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=work_dir,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    elapsed_ms, modules = result.stdout.splitlines()[-2:]
+    return float(elapsed_ms), set(modules.split())
+
+
+@pytest.mark.parametrize("function_name", sorted(IMPORT_TIME_BUDGET_MS))
+def test_entry_point_import_budget(function_name):
+    """エントリーポイントのコールドスタート時の読み込みをテスト
+
+    検証内容:
+    1. 重いモジュールがエントリーポイントの読み込み時に読み込まれないこと
+    2. 読み込み時間（3回の最小値）が上限以内であること
+    """
+    budget_ms = float(
+        os.environ.get("IMPORT_TIME_BUDGET_MS", IMPORT_TIME_BUDGET_MS[function_name])
+    )
+
+    measurements = [_import_entry_point(function_name) for _ in range(3)]
+
+    modules = measurements[0][1]
+    assert [name for name in DEFERRED_MODULES if name in modules] == []
+    elapsed_ms = min(elapsed for elapsed, _ in measurements)
+    assert elapsed_ms <= budget_ms, (
+        f"{function_name} took {elapsed_ms:.0f}ms to import (budget {budget_ms:.0f}ms), "
+        "see `make profile-imports`"
+    )